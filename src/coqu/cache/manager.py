@@ -2,54 +2,308 @@
 """
 Manages cached AST files using MessagePack serialization.
 """
+from __future__ import annotations
+
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+import atexit
+import contextlib
+import hashlib
+import heapq
+import os
+import shutil
+import threading
 import time
+import weakref
+
+import msgpack
 
-from coqu.parser.ast import CobolProgram
 from coqu.cache.serializer import ASTSerializer
 
+if TYPE_CHECKING:
+    from coqu.parser.ast import CobolProgram
+
+
+# Per-file errors expected when another process races us on the cache
+# directory. Anything else (EIO, a broken directory) should surface.
+_RACE_ERRORS = (FileNotFoundError, PermissionError)
+
+# Managers whose bookkeeping is flushed at exit. Held weakly, so a manager
+# that is no longer used can still be collected before then.
+_live_managers: weakref.WeakSet[CacheManager] = weakref.WeakSet()
+
+
+def _flush_live_managers() -> None:
+    """Persist the bookkeeping of every manager still alive at exit."""
+    for manager in list(_live_managers):
+        manager.flush_stats()
+
+
+atexit.register(_flush_live_managers)
+
 
 class CacheManager:
     """
     Manages AST cache files.
 
     Cache files are stored as:
-    - {cache_dir}/{source_hash}.coqu
+    - {cache_dir}/{source_hash[:2]}/{source_hash}.coqu
+    - {cache_dir}/.stats.msgpack (file count/size bookkeeping)
+    - {cache_dir}/.access.msgpack (last access time per hash)
+
+    Sharding by hash prefix keeps individual directories small; files
+    from the older flat layout are moved into shards on startup.
 
     Features:
     - Hash-based cache keys (SHA256 of source)
     - Automatic cache invalidation via hash
+    - In-memory LRU of recently used programs in front of the disk cache
     - Cache statistics
-    - Cache cleanup
+    - Cache cleanup (least recently used first)
+
+    get/put/remove may be called from several threads at once; the
+    in-memory LRU and counters are guarded by a lock, file I/O is not.
     """
 
     # Cache file extension
     EXTENSION = ".coqu"
+    _EXTENSION_LEN = len(EXTENSION)
+
+    # Default number of programs kept in the in-memory LRU
+    MEMORY_CACHE_SIZE = 32
+
+    # Sidecar holding file count/total size between runs
+    STATS_FILE = ".stats.msgpack"
+
+    # Sidecar holding the last access time of each cache entry
+    ACCESS_FILE = ".access.msgpack"
+
+    # Cache hits between writes of the access index
+    ACCESS_FLUSH_INTERVAL = 64
+
+    # Number of leading hash characters naming the shard directory
+    SHARD_WIDTH = 2
 
-    def __init__(self, cache_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        memory_cache_size: int = MEMORY_CACHE_SIZE,
+    ):
         """
         Initialize cache manager.
 
         Args:
             cache_dir: Directory for cache files. Defaults to ~/.cache/coqu
+            memory_cache_size: Programs kept in memory (0 disables the LRU)
         """
         if cache_dir is None:
             cache_dir = Path.home() / ".cache" / "coqu"
 
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Prefix for building cache paths by string concatenation
+        self._dir_str = str(self.cache_dir) + os.sep
 
         self.serializer = ASTSerializer()
+        self._mem: OrderedDict[str, CobolProgram] = OrderedDict()
+        self._mem_cap = memory_cache_size
+        self._lock = threading.Lock()
         self._stats = {
             "hits": 0,
             "misses": 0,
             "saves": 0,
         }
 
+        # File count/size are maintained incrementally so get_stats
+        # doesn't have to walk the cache directory
+        self._file_count = 0
+        self._total_size = 0
+        self._size_stats_dirty = False
+
+        # Last access time per hash. File mtimes only change on writes
+        # (and atime is often disabled), so hits are recorded here to
+        # make size-based eviction least recently used
+        self._access: dict[str, float] = {}
+        self._access_pending = 0
+
+        self._migrate_flat_layout()
+        self._load_size_stats()
+        self._load_access_index()
+        _live_managers.add(self)
+
+    @staticmethod
+    def hash_source(path: Path) -> str:
+        """
+        Compute the cache key for a source file.
+
+        This is the canonical way to produce ``source_hash`` values: a
+        SHA256 of the file bytes, streamed through hashlib.file_digest
+        (Python 3.11+) or read in 1 MiB chunks on older versions.
+
+        Args:
+            path: Path to source file
+
+        Returns:
+            Hex digest of the file contents
+        """
+        with open(path, "rb") as f:
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+            return digest.hexdigest()
+
     def _get_cache_path(self, source_hash: str) -> Path:
         """Get cache file path for a source hash."""
-        return self.cache_dir / f"{source_hash}{self.EXTENSION}"
+        return Path(self._get_cache_path_str(source_hash))
+
+    def _get_cache_path_str(self, source_hash: str) -> str:
+        """
+        Get cache file path for a source hash as a plain string.
+
+        Used on the get/put/remove hot paths, where building a Path per
+        access costs more than the syscalls it is passed to.
+        """
+        return (
+            self._dir_str + source_hash[:self.SHARD_WIDTH] + os.sep
+            + source_hash + self.EXTENSION
+        )
+
+    def _iter_shard_dirs(self) -> Iterator[os.DirEntry]:
+        """Iterate the shard subdirectories of the cache directory."""
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if len(entry.name) == self.SHARD_WIDTH and entry.is_dir():
+                    yield entry
+
+    def _iter_cache_entries(self) -> Iterator[os.DirEntry]:
+        """Iterate directory entries of cache files (stat comes with readdir)."""
+        extension = self.EXTENSION
+        for shard in self._iter_shard_dirs():
+            with os.scandir(shard.path) as it:
+                for entry in it:
+                    if entry.name.endswith(extension):
+                        yield entry
+
+    def _migrate_flat_layout(self) -> None:
+        """Move cache files from the old flat layout into shard directories."""
+        with os.scandir(self.cache_dir) as it:
+            flat = [
+                entry.name for entry in it
+                if entry.name.endswith(self.EXTENSION) and entry.is_file()
+            ]
+
+        for name in flat:
+            target = self._get_cache_path(name[:-self._EXTENSION_LEN])
+            target.parent.mkdir(exist_ok=True)
+            with contextlib.suppress(*_RACE_ERRORS):
+                os.replace(self.cache_dir / name, target)
+
+    def _load_size_stats(self) -> None:
+        """Load file count/size from the sidecar, or rebuild them by one walk."""
+        stats_path = self.cache_dir / self.STATS_FILE
+        try:
+            # Adding or removing files touches the mtime of their shard
+            # directory, so a sidecar older than any shard may be out of date
+            layout_mtime = max(
+                [self.cache_dir.stat().st_mtime]
+                + [shard.stat().st_mtime for shard in self._iter_shard_dirs()]
+            )
+            if stats_path.stat().st_mtime >= layout_mtime:
+                data = msgpack.unpackb(stats_path.read_bytes(), raw=False)
+                self._file_count = int(data["file_count"])
+                self._total_size = int(data["total_size"])
+                return
+        except Exception:
+            pass
+
+        file_count = 0
+        total_size = 0
+        for entry in self._iter_cache_entries():
+            with contextlib.suppress(*_RACE_ERRORS):
+                total_size += entry.stat().st_size
+                file_count += 1
+
+        self._file_count = file_count
+        self._total_size = total_size
+        self._size_stats_dirty = True
+
+    def _load_access_index(self) -> None:
+        """Load per-hash access times from the sidecar, if present."""
+        try:
+            data = msgpack.unpackb(
+                (self.cache_dir / self.ACCESS_FILE).read_bytes(), raw=False
+            )
+            self._access = {str(h): float(t) for h, t in data.items()}
+        except Exception:
+            self._access = {}
+
+    def _touch(self, source_hash: str) -> None:
+        """Record an access, writing the index every ACCESS_FLUSH_INTERVAL hits."""
+        with self._lock:
+            self._access[source_hash] = time.time()
+            self._access_pending += 1
+            if self._access_pending < self.ACCESS_FLUSH_INTERVAL:
+                return
+        self._flush_access()
+
+    def _flush_access(self) -> None:
+        """Persist the access index to its sidecar."""
+        with self._lock:
+            packed = msgpack.packb(self._access)
+            self._access_pending = 0
+        try:
+            # Rewrite in place, like the stats sidecar
+            with open(self.cache_dir / self.ACCESS_FILE, "wb") as f:
+                f.write(packed)
+        except OSError:
+            pass
+
+    def _track(self, count_delta: int, size_delta: int) -> None:
+        """Record a change in cached file count/size."""
+        with self._lock:
+            self._file_count += count_delta
+            self._total_size += size_delta
+            self._size_stats_dirty = True
+
+    def _count(self, stat: str) -> None:
+        """Increment a hit/miss/save counter."""
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _discard(self, path, size: int) -> bool:
+        """Delete a cache file of known size, updating the bookkeeping."""
+        with contextlib.suppress(*_RACE_ERRORS):
+            os.unlink(path)
+            self._track(-1, -size)
+            with self._lock:
+                self._access.pop(
+                    os.path.basename(path)[:-self._EXTENSION_LEN], None
+                )
+            return True
+        return False
+
+    def flush_stats(self) -> None:
+        """Persist access times and file count/size (also run at exit)."""
+        # Access index first: creating it touches the directory mtime,
+        # which must not make the stats sidecar written below look stale
+        if self._access_pending:
+            self._flush_access()
+        if not self._size_stats_dirty:
+            return
+        try:
+            # Rewrite in place: replacing the file would touch the
+            # directory mtime and make the sidecar look stale
+            with open(self.cache_dir / self.STATS_FILE, "wb") as f:
+                f.write(msgpack.packb({
+                    "file_count": self._file_count,
+                    "total_size": self._total_size,
+                }))
+            self._size_stats_dirty = False
+        except OSError:
+            pass
 
     def get(self, source_hash: str) -> Optional[CobolProgram]:
         """
@@ -61,25 +315,105 @@ class CacheManager:
         Returns:
             CobolProgram or None if not cached
         """
-        cache_path = self._get_cache_path(source_hash)
-
-        if not cache_path.exists():
-            self._stats["misses"] += 1
+        # Check the in-memory LRU first
+        with self._lock:
+            program = self._mem.get(source_hash)
+            if program is not None:
+                self._mem.move_to_end(source_hash)
+                self._stats["hits"] += 1
+        if program is not None:
+            self._touch(source_hash)
+            return program
+
+        cache_path = self._get_cache_path_str(source_hash)
+
+        if not os.path.exists(cache_path):
+            self._count("misses")
             return None
 
         program = self.serializer.load(cache_path)
         if program:
-            self._stats["hits"] += 1
+            self._count("hits")
+            self._touch(source_hash)
+            self._remember(source_hash, program)
         else:
-            self._stats["misses"] += 1
+            self._count("misses")
             # Invalid cache file, remove it
-            try:
-                cache_path.unlink()
-            except Exception:
-                pass
+            self._discard(cache_path, self.serializer.get_cache_size(cache_path))
 
         return program
 
+    def get_many(self, source_hashes: Iterable[str]) -> dict[str, CobolProgram]:
+        """
+        Get several cached programs at once.
+
+        Hashes are grouped by shard and each shard directory is listed
+        once, so hashes that aren't cached cost no per-file stat.
+
+        Args:
+            source_hashes: SHA256 hashes of source code
+
+        Returns:
+            Dictionary mapping each cached hash to its program; hashes
+            that aren't cached are left out
+        """
+        found: dict[str, CobolProgram] = {}
+        by_shard: dict[str, set[str]] = {}
+
+        with self._lock:
+            for source_hash in dict.fromkeys(source_hashes):
+                program = self._mem.get(source_hash)
+                if program is not None:
+                    self._mem.move_to_end(source_hash)
+                    self._stats["hits"] += 1
+                    found[source_hash] = program
+                else:
+                    shard = source_hash[:self.SHARD_WIDTH]
+                    by_shard.setdefault(shard, set()).add(source_hash)
+
+        for source_hash in found:
+            self._touch(source_hash)
+
+        for shard, wanted in by_shard.items():
+            entries = []
+            with contextlib.suppress(FileNotFoundError):
+                with os.scandir(self._dir_str + shard) as it:
+                    entries = [
+                        entry for entry in it
+                        if entry.name.endswith(self.EXTENSION)
+                        and entry.name[:-self._EXTENSION_LEN] in wanted
+                    ]
+
+            for entry in entries:
+                source_hash = entry.name[:-self._EXTENSION_LEN]
+                program = self.serializer.load(entry.path)
+                if program:
+                    found[source_hash] = program
+                    wanted.discard(source_hash)
+                    self._count("hits")
+                    self._touch(source_hash)
+                    self._remember(source_hash, program)
+                else:
+                    # Invalid cache file, remove it
+                    self._discard(
+                        entry.path, self.serializer.get_cache_size(entry.path)
+                    )
+
+            with self._lock:
+                self._stats["misses"] += len(wanted)
+
+        return found
+
+    def _remember(self, source_hash: str, program: CobolProgram) -> None:
+        """Add a program to the in-memory LRU, evicting the oldest entry."""
+        if self._mem_cap <= 0:
+            return
+        with self._lock:
+            self._mem[source_hash] = program
+            self._mem.move_to_end(source_hash)
+            if len(self._mem) > self._mem_cap:
+                self._mem.popitem(last=False)
+
     def put(self, source_hash: str, program: CobolProgram) -> bool:
         """
         Store program in cache.
@@ -91,11 +425,21 @@ class CacheManager:
         Returns:
             True if successful
         """
-        cache_path = self._get_cache_path(source_hash)
+        cache_path = self._get_cache_path_str(source_hash)
+        with self._lock:
+            self._mem.pop(source_hash, None)
+
+        # Cache files are never empty, so size 0 means no existing entry
+        old_size = self.serializer.get_cache_size(cache_path)
+        if not old_size:
+            with contextlib.suppress(FileExistsError):
+                os.mkdir(os.path.dirname(cache_path))
 
         success = self.serializer.save(program, cache_path)
         if success:
-            self._stats["saves"] += 1
+            self._count("saves")
+            new_size = self.serializer.get_cache_size(cache_path)
+            self._track(0 if old_size else 1, new_size - old_size)
 
         return success
 
@@ -109,29 +453,66 @@ class CacheManager:
         Returns:
             True if removed
         """
-        cache_path = self._get_cache_path(source_hash)
-        try:
-            if cache_path.exists():
-                cache_path.unlink()
-                return True
-        except Exception:
-            pass
+        cache_path = self._get_cache_path_str(source_hash)
+        with self._lock:
+            self._mem.pop(source_hash, None)
+        size = self.serializer.get_cache_size(cache_path)
+        if size:
+            return self._discard(cache_path, size)
         return False
 
     def clear(self) -> int:
         """
         Clear all cache files.
 
+        If the cache directory holds nothing but cache files it is removed
+        and recreated in one go; otherwise files are deleted one by one.
+
         Returns:
             Number of files removed
         """
+        with self._lock:
+            self._mem.clear()
+
         count = 0
-        for path in self.cache_dir.glob(f"*{self.EXTENSION}"):
+        foreign = False
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if len(entry.name) == self.SHARD_WIDTH and entry.is_dir():
+                    with os.scandir(entry.path) as shard:
+                        for cached in shard:
+                            if cached.name.endswith(self.EXTENSION):
+                                count += 1
+                            else:
+                                foreign = True
+                elif entry.name not in (self.STATS_FILE, self.ACCESS_FILE):
+                    foreign = True
+
+        if not foreign:
             try:
-                path.unlink()
-                count += 1
-            except Exception:
+                shutil.rmtree(self.cache_dir)
+            except OSError:
                 pass
+            else:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                with self._lock:
+                    self._file_count = 0
+                    self._total_size = 0
+                    self._size_stats_dirty = True
+                    self._access.clear()
+                    self._access_pending = 0
+                return count
+
+        # Shared directory (or rmtree failed): only delete our files
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        count = 0
+        for entry in self._iter_cache_entries():
+            try:
+                size = entry.stat().st_size
+            except _RACE_ERRORS:
+                continue
+            if self._discard(entry.path, size):
+                count += 1
         return count
 
     def get_stats(self) -> dict:
@@ -141,15 +522,8 @@ class CacheManager:
         Returns:
             Dictionary with hit/miss/save counts and size info
         """
-        total_size = 0
-        file_count = 0
-
-        for path in self.cache_dir.glob(f"*{self.EXTENSION}"):
-            try:
-                total_size += path.stat().st_size
-                file_count += 1
-            except Exception:
-                pass
+        total_size = self._total_size
+        file_count = self._file_count
 
         return {
             "hits": self._stats["hits"],
@@ -176,16 +550,14 @@ class CacheManager:
             List of cache file info
         """
         results = []
-        for path in self.cache_dir.glob(f"*{self.EXTENSION}"):
-            try:
-                stat = path.stat()
+        for entry in self._iter_cache_entries():
+            with contextlib.suppress(*_RACE_ERRORS):
+                stat = entry.stat()
                 results.append({
-                    "hash": path.stem,
+                    "hash": entry.name[:-self._EXTENSION_LEN],
                     "size_bytes": stat.st_size,
                     "modified": stat.st_mtime,
                 })
-            except Exception:
-                pass
 
         return sorted(results, key=lambda x: x["modified"], reverse=True)
 
@@ -202,19 +574,22 @@ class CacheManager:
         cutoff = time.time() - (max_age_days * 24 * 60 * 60)
         count = 0
 
-        for path in self.cache_dir.glob(f"*{self.EXTENSION}"):
+        for entry in self._iter_cache_entries():
             try:
-                if path.stat().st_mtime < cutoff:
-                    path.unlink()
-                    count += 1
-            except Exception:
-                pass
+                stat = entry.stat()
+            except _RACE_ERRORS:
+                continue
+            if stat.st_mtime < cutoff and self._discard(entry.path, stat.st_size):
+                count += 1
 
         return count
 
     def cleanup_by_size(self, max_size_mb: int = 500) -> int:
         """
-        Remove oldest cache files to stay under size limit.
+        Remove least recently used cache files to stay under size limit.
+
+        A file's last use is its most recent recorded access, or its
+        modification time if it hasn't been read since it was written.
 
         Args:
             max_size_mb: Maximum total cache size in MB
@@ -224,34 +599,43 @@ class CacheManager:
         """
         max_bytes = max_size_mb * 1024 * 1024
 
-        # Get all cache files with stats
+        # Get all cache files as (last_used, size, path) in a single scan
         files = []
-        for path in self.cache_dir.glob(f"*{self.EXTENSION}"):
+        total_size = 0
+        present = set()
+        for entry in self._iter_cache_entries():
             try:
-                stat = path.stat()
-                files.append({
-                    "path": path,
-                    "size": stat.st_size,
-                    "mtime": stat.st_mtime,
-                })
-            except Exception:
-                pass
-
-        # Sort by modification time (oldest first)
-        files.sort(key=lambda x: x["mtime"])
-
-        # Calculate total size
-        total_size = sum(f["size"] for f in files)
-
-        # Remove oldest files until under limit
+                stat = entry.stat()
+            except _RACE_ERRORS:
+                continue
+            source_hash = entry.name[:-self._EXTENSION_LEN]
+            last_used = max(self._access.get(source_hash, 0.0), stat.st_mtime)
+            files.append((last_used, stat.st_size, entry.path))
+            total_size += stat.st_size
+            present.add(source_hash)
+
+        # The walk gives exact figures; resync the bookkeeping with them
+        # and drop access times of files that are gone
+        self._file_count = len(files)
+        self._total_size = total_size
+        self._size_stats_dirty = True
+        with self._lock:
+            self._access = {
+                h: t for h, t in self._access.items() if h in present
+            }
+
+        if total_size <= max_bytes:
+            return 0
+
+        # Min-heap by last use: only the evicted files get ordered
+        heapq.heapify(files)
+
+        # Remove least recently used files until under limit
         count = 0
         while total_size > max_bytes and files:
-            oldest = files.pop(0)
-            try:
-                oldest["path"].unlink()
-                total_size -= oldest["size"]
+            _, size, path = heapq.heappop(files)
+            if self._discard(path, size):
+                total_size -= size
                 count += 1
-            except Exception:
-                pass
 
         return count
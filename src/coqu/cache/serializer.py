@@ -4,10 +4,231 @@ Serializes and deserializes COBOL AST using MessagePack.
 Provides efficient binary format for large ASTs.
 """
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
+import mmap
+import os
+import sys
+import tempfile
+import zlib
+
 import msgpack
 
-from coqu.parser.ast import CobolProgram
+# zstandard is optional; fall back to zlib from the standard library
+try:
+    import zstandard as zstd
+except ImportError:  # pragma: no cover - depends on environment
+    zstd = None
+
+# ormsgpack (Rust) is optional and only used for packing, where it is
+# several times faster and emits the same bytes. Unpacking stays with
+# msgpack, whose object_hook builds AST nodes in a single pass.
+try:
+    import ormsgpack
+except ImportError:  # pragma: no cover - depends on environment
+    ormsgpack = None
+
+from coqu.parser.ast import (
+    CobolProgram,
+    Division,
+    Section,
+    Paragraph,
+    DataItem,
+    Statement,
+    Comment,
+    CopybookRef,
+)
+
+
+# Node encoders used as the packer's default hook. Each returns the node's
+# map with child nodes left in place, so the packer reaches them in its
+# own walk of the tree and no nested dict copy of the AST is built.
+# Encoders mirror the to_dict() methods in coqu.parser.ast; the bytes
+# written are the same.
+
+def _encode_program(n: CobolProgram) -> dict:
+    return {
+        "program_id": n.program_id,
+        "source_path": str(n.source_path) if n.source_path else None,
+        "source_hash": n.source_hash,
+        "lines": n.lines,
+        "divisions": n.divisions,
+        "copybook_refs": n.copybook_refs,
+        "comments": n.comments,
+    }
+
+
+def _encode_division(n: Division) -> dict:
+    return {
+        "name": n.name,
+        "line_start": n.line_start,
+        "line_end": n.line_end,
+        "sections": n.sections,
+        "paragraphs": n.paragraphs,
+    }
+
+
+def _encode_section(n: Section) -> dict:
+    return {
+        "name": n.name,
+        "line_start": n.line_start,
+        "line_end": n.line_end,
+        "paragraphs": n.paragraphs,
+        "data_items": n.data_items,
+    }
+
+
+def _encode_paragraph(n: Paragraph) -> dict:
+    return {
+        "name": n.name,
+        "line_start": n.line_start,
+        "line_end": n.line_end,
+        "statements": n.statements,
+        "performs": n.performs,
+        "calls": n.calls,
+    }
+
+
+def _encode_statement(n: Statement) -> dict:
+    return {
+        "type": n.type,
+        "line_start": n.line_start,
+        "line_end": n.line_end,
+        "target": n.target,
+        "arguments": n.arguments,
+    }
+
+
+def _encode_data_item(n: DataItem) -> dict:
+    return {
+        "name": n.name,
+        "level": n.level,
+        "line_start": n.line_start,
+        "line_end": n.line_end,
+        "pic": n.pic,
+        "usage": n.usage,
+        "value": n.value,
+        "occurs": n.occurs,
+        "redefines": n.redefines,
+        "children": n.children,
+    }
+
+
+_NODE_ENCODERS = {
+    CobolProgram: _encode_program,
+    Division: _encode_division,
+    Section: _encode_section,
+    Paragraph: _encode_paragraph,
+    Statement: _encode_statement,
+    DataItem: _encode_data_item,
+    Comment: Comment.to_dict,
+    CopybookRef: CopybookRef.to_dict,
+}
+
+
+def _node_to_map(node) -> dict:
+    """Packer default hook: turn an AST node into its map."""
+    encode = _NODE_ENCODERS.get(type(node))
+    if encode is None:
+        raise TypeError(f"Cannot serialize {type(node).__name__}")
+    return encode(node)
+
+
+# Node builders used as the msgpack object_hook. MessagePack decodes maps
+# bottom-up, so child lists already hold nodes when a parent is built and
+# the AST is constructed in a single pass without an intermediate dict tree.
+# Builders mirror the from_dict() classmethods in coqu.parser.ast,
+# including interning of names and statement targets/arguments.
+
+def _build_program(m: dict) -> CobolProgram:
+    source_path = m.get("source_path")
+    return CobolProgram(
+        program_id=m["program_id"],
+        source_path=Path(source_path) if source_path else None,
+        source_hash=m["source_hash"],
+        lines=m["lines"],
+        divisions=m.get("divisions", []),
+        copybook_refs=m.get("copybook_refs", []),
+        comments=m.get("comments", []),
+    )
+
+
+def _build_division(m: dict) -> Division:
+    return Division(
+        name=m["name"],
+        line_start=m["line_start"],
+        line_end=m["line_end"],
+        sections=m.get("sections", []),
+        paragraphs=m.get("paragraphs", []),
+    )
+
+
+def _build_section(m: dict) -> Section:
+    return Section(
+        name=m["name"],
+        line_start=m["line_start"],
+        line_end=m["line_end"],
+        paragraphs=m.get("paragraphs", []),
+        data_items=m.get("data_items", []),
+    )
+
+
+def _build_paragraph(m: dict) -> Paragraph:
+    return Paragraph(
+        name=sys.intern(m["name"]),
+        line_start=m["line_start"],
+        line_end=m["line_end"],
+        statements=m.get("statements", []),
+        performs=list(map(sys.intern, m.get("performs", []))),
+        calls=list(map(sys.intern, m.get("calls", []))),
+    )
+
+
+def _build_statement(m: dict) -> Statement:
+    target = m.get("target")
+    return Statement(
+        type=sys.intern(m["type"]),
+        line_start=m["line_start"],
+        line_end=m["line_end"],
+        target=sys.intern(target) if target is not None else None,
+        arguments=list(map(sys.intern, m.get("arguments", []))),
+    )
+
+
+def _build_data_item(m: dict) -> DataItem:
+    return DataItem(
+        name=sys.intern(m["name"]),
+        level=m["level"],
+        line_start=m["line_start"],
+        line_end=m["line_end"],
+        pic=m.get("pic"),
+        usage=m.get("usage"),
+        value=m.get("value"),
+        occurs=m.get("occurs"),
+        redefines=m.get("redefines"),
+        children=m.get("children", []),
+    )
+
+
+# (key, builder) pairs: the first key present in a map identifies its node
+# type. Order matters - e.g. Section maps also carry "paragraphs".
+_NODE_KEYS = (
+    ("program_id", _build_program),
+    ("sections", _build_division),
+    ("data_items", _build_section),
+    ("statements", _build_paragraph),
+    ("arguments", _build_statement),
+    ("level", _build_data_item),
+    ("is_inline", Comment.from_dict),
+    ("status", CopybookRef.from_dict),
+)
+
+
+def _node_from_map(m: dict):
+    """msgpack object_hook: turn a decoded map into its AST node."""
+    for key, build in _NODE_KEYS:
+        if key in m:
+            return build(m)
+    return m
 
 
 class ASTSerializer:
@@ -19,11 +240,40 @@ class ASTSerializer:
     - Compact binary format
     - Cross-platform compatibility
     - Safe (no arbitrary code execution unlike pickle)
+
+    File layout (version 3):
+    - 4 bytes: magic "COQU"
+    - 1 byte: format version
+    - 1 byte: compression codec (see CODEC_*)
+    - rest: compressed MessagePack array [version, data]
+
+    Older files are still readable: version 2 uses the same header with a
+    {"version", "data"} map payload, version 1 is that map uncompressed
+    directly after the magic.
     """
 
     # Magic bytes to identify coqu cache files
     MAGIC = b"COQU"
-    VERSION = 1
+    VERSION = 3
+
+    # Versions sharing the version/codec header layout
+    HEADER_VERSIONS = (2, 3)
+
+    # Compression codecs
+    CODEC_NONE = 0
+    CODEC_ZLIB = 1
+    CODEC_ZSTD = 2
+
+    # Fast compression levels - cache reads dominate, so favour speed
+    ZSTD_LEVEL = 3
+    ZLIB_LEVEL = 1
+
+    # Size of the header preceding the payload
+    HEADER_SIZE = len(MAGIC) + 2
+
+    def __init__(self):
+        """Initialize serializer, preferring zstd when it is installed."""
+        self.codec = self.CODEC_ZSTD if zstd is not None else self.CODEC_ZLIB
 
     def serialize(self, program: CobolProgram) -> bytes:
         """
@@ -33,61 +283,103 @@ class ASTSerializer:
             program: The program AST to serialize
 
         Returns:
-            MessagePack encoded bytes
+            Header followed by compressed MessagePack bytes
         """
-        # Convert to dict
-        data = program.to_dict()
+        header, payload = self._encode(program)
+        return header + payload
 
-        # Add metadata
-        envelope = {
-            "version": self.VERSION,
-            "data": data,
-        }
+    def _encode(self, program: CobolProgram) -> tuple[bytes, bytes]:
+        """Encode a program into separate header and payload buffers."""
+        # Encode with a positional [version, data] envelope; nodes are
+        # converted one at a time by the default hook as they are packed
+        envelope = [self.VERSION, program]
+        if ormsgpack is not None:
+            packed = ormsgpack.packb(
+                envelope,
+                default=_node_to_map,
+                option=ormsgpack.OPT_PASSTHROUGH_DATACLASS,
+            )
+        else:
+            packed = msgpack.packb(
+                envelope, use_bin_type=True, default=_node_to_map,
+            )
 
-        # Encode
-        packed = msgpack.packb(envelope, use_bin_type=True)
+        # Magic header, version and codec
+        header = self.MAGIC + bytes([self.VERSION, self.codec])
+        return header, self._compress(packed)
 
-        # Add magic header
-        return self.MAGIC + packed
-
-    def deserialize(self, data: bytes) -> Optional[CobolProgram]:
+    def deserialize(self, data: Union[bytes, memoryview]) -> Optional[CobolProgram]:
         """
         Deserialize bytes to a CobolProgram.
 
         Args:
-            data: MessagePack encoded bytes
+            data: Bytes (or a memoryview over them) produced by serialize()
 
         Returns:
             CobolProgram or None if invalid
         """
         # Check magic header
-        if not data.startswith(self.MAGIC):
+        if data[:len(self.MAGIC)] != self.MAGIC:
             return None
 
         try:
-            # Decode
-            packed = data[len(self.MAGIC):]
-            envelope = msgpack.unpackb(packed, raw=False)
+            if data[len(self.MAGIC)] in self.HEADER_VERSIONS:
+                codec = data[len(self.MAGIC) + 1]
+                packed = self._decompress(data[self.HEADER_SIZE:], codec)
+            else:
+                # Version 1: uncompressed MessagePack envelope
+                packed = data[len(self.MAGIC):]
+
+            # Decode straight into AST nodes - a fixarray type byte marks
+            # the positional envelope
+            unpacked = msgpack.unpackb(
+                packed, raw=False, object_hook=_node_from_map,
+            )
+            if packed[0] & 0xF0 == 0x90:
+                version, program = unpacked
+            else:
+                version = unpacked.get("version", 0)
+                program = unpacked.get("data")
 
             # Check version
-            version = envelope.get("version", 0)
-            if version != self.VERSION:
+            if version not in (1, 2, self.VERSION):
                 return None
 
-            # Reconstruct program
-            program_data = envelope.get("data")
-            if not program_data:
+            if not isinstance(program, CobolProgram):
                 return None
 
-            return CobolProgram.from_dict(program_data)
+            return program
 
         except Exception:
             return None
 
-    def save(self, program: CobolProgram, path: Path) -> bool:
+    def _compress(self, packed: bytes) -> bytes:
+        """Compress a packed payload with the configured codec."""
+        if self.codec == self.CODEC_ZSTD:
+            return zstd.ZstdCompressor(level=self.ZSTD_LEVEL).compress(packed)
+        if self.codec == self.CODEC_ZLIB:
+            return zlib.compress(packed, self.ZLIB_LEVEL)
+        return packed
+
+    def _decompress(self, payload: Union[bytes, memoryview], codec: int) -> bytes:
+        """Decompress a payload written with the given codec."""
+        if codec == self.CODEC_ZSTD:
+            if zstd is None:
+                raise ValueError("zstandard is required to read this cache file")
+            return zstd.ZstdDecompressor().decompress(payload)
+        if codec == self.CODEC_ZLIB:
+            return zlib.decompress(payload)
+        if codec == self.CODEC_NONE:
+            return payload
+        raise ValueError(f"Unknown cache codec: {codec}")
+
+    def save(self, program: CobolProgram, path: Union[Path, str]) -> bool:
         """
         Save program to a file.
 
+        The file is written to a temporary name and renamed into place,
+        so readers never observe a partially written cache file.
+
         Args:
             program: Program to save
             path: File path
@@ -95,17 +387,59 @@ class ASTSerializer:
         Returns:
             True if successful
         """
+        tmp_path = None
         try:
-            data = self.serialize(program)
-            path.write_bytes(data)
+            header, payload = self._encode(program)
+            # mkstemp gives every writer its own temp file, so concurrent
+            # saves of the same hash (from any thread) never share one
+            path = os.fspath(path)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path) or None,
+                prefix=os.path.basename(path) + ".",
+                suffix=".tmp",
+            )
+            try:
+                self._write_all(fd, header, payload)
+            finally:
+                os.close(fd)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
             return True
         except Exception:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
             return False
 
-    def load(self, path: Path) -> Optional[CobolProgram]:
+    @staticmethod
+    def _write_all(fd: int, header: bytes, payload: bytes) -> None:
+        """Write header and payload to fd without concatenating them."""
+        if not hasattr(os, "writev"):
+            # No vectored I/O on this platform (e.g. Windows)
+            header, payload = b"", header + payload
+
+        views = [memoryview(header), memoryview(payload)]
+        while views:
+            if hasattr(os, "writev"):
+                written = os.writev(fd, views)
+            else:
+                written = os.write(fd, views[0])
+            # Drop fully written buffers and trim a partially written one
+            while views and written >= len(views[0]):
+                written -= len(views[0])
+                views.pop(0)
+            if views and written:
+                views[0] = views[0][written:]
+
+    def load(self, path: Union[Path, str]) -> Optional[CobolProgram]:
         """
         Load program from a file.
 
+        Files of at least one page are memory-mapped and decoded straight
+        from the mapping, avoiding a full copy into a bytes object.
+
         Args:
             path: File path
 
@@ -113,12 +447,18 @@ class ASTSerializer:
             CobolProgram or None if failed
         """
         try:
-            data = path.read_bytes()
-            return self.deserialize(data)
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < mmap.PAGESIZE:
+                    return self.deserialize(f.read())
+
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return self.deserialize(view)
         except Exception:
             return None
 
-    def get_cache_size(self, path: Path) -> int:
+    def get_cache_size(self, path: Union[Path, str]) -> int:
         """
         Get size of a cache file in bytes.
 
@@ -129,6 +469,6 @@ class ASTSerializer:
             Size in bytes or 0 if not found
         """
         try:
-            return path.stat().st_size
+            return os.stat(path).st_size
         except Exception:
             return 0
@@ -5,15 +5,15 @@ CLI entry point for coqu.
 import argparse
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 from coqu.version import __version__
 from coqu.config import load_config
-from coqu.workspace import Workspace
-from coqu.cache import CacheManager
-from coqu.query import QueryEngine
-from coqu.repl import Repl
+
+# Workspace, query engine and REPL are imported inside the run_* functions:
+# they pull in the ANTLR runtime, which --help/--version don't need.
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -208,12 +208,12 @@ def run_coverage(args) -> int:
             print()
             print(result.uncovered_list())
 
-        if args.show_source and result.uncovered_lines:
+        if args.show_source and result.count("uncovered"):
             print()
             print("Uncovered source lines:")
             print("-" * 40)
-            for line_num in sorted(result.uncovered_lines):
-                if line_num <= len(source_lines):
+            for first, last in result.ranges("uncovered"):
+                for line_num in range(first, min(last, len(source_lines)) + 1):
                     print(f"{line_num:4d}: {source_lines[line_num - 1]}")
 
     # Return success if coverage is above threshold (e.g., any coverage)
@@ -231,6 +231,10 @@ def run_command(
     debug: bool,
 ) -> int:
     """Run a single command and exit."""
+    from coqu.cache import CacheManager
+    from coqu.query import QueryEngine
+    from coqu.workspace import Workspace
+
     # Setup
     cache_manager = CacheManager(cache_dir) if cache_enabled else None
 
@@ -240,15 +244,27 @@ def run_command(
         use_indexer_only=use_indexer_only,
     )
 
-    # Load files
-    for path in files:
-        if path.is_file():
+    # Load files on a thread pool: cache reads and parses are independent
+    # per file, and file I/O, decompression and msgpack decoding overlap
+    source_files = [path for path in files if path.is_file()]
+    if source_files:
+        with ThreadPoolExecutor(max_workers=min(8, len(source_files))) as pool:
+            futures = [pool.submit(workspace.load, path) for path in source_files]
+
+        for path, future in zip(source_files, futures):
             try:
-                workspace.load(path)
+                loaded = future.result()
             except Exception as e:
                 if debug:
                     print(f"Warning: Failed to load {path}: {e}", file=sys.stderr)
-        elif path.is_dir():
+                continue
+            # Loads finish in any order; re-insert to keep command-line order
+            workspace.programs.pop(loaded.name, None)
+            workspace.programs[loaded.name] = loaded
+
+    # Directories are still expanded serially
+    for path in files:
+        if path.is_dir():
             workspace.load_directory(path)
 
     if not workspace.programs:
@@ -279,6 +295,8 @@ def run_script(
     debug: bool,
 ) -> int:
     """Run a script file."""
+    from coqu.repl import Repl
+
     repl = Repl(
         cache_dir=cache_dir if cache_enabled else False,
         copybook_paths=copybook_paths,
@@ -303,6 +321,8 @@ def run_repl(
     history_file: Optional[Path],
 ) -> int:
     """Run interactive REPL."""
+    from coqu.repl import Repl
+
     repl = Repl(
         cache_dir=cache_dir if cache_enabled else False,
         copybook_paths=copybook_paths,
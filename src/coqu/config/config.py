@@ -14,6 +14,33 @@ else:
     import tomli as tomllib
 
 
+def _expand_path(value) -> Path:
+    """Convert a config value to a user-expanded Path."""
+    return Path(value).expanduser()
+
+
+# Config file keys by TOML table (None = top level): key -> (attribute, converter)
+_TABLE_FIELDS = {
+    None: {
+        "cobol_extensions": ("cobol_extensions", list),
+        "copybook_extensions": ("copybook_extensions", list),
+    },
+    "cache": {
+        "enabled": ("cache_enabled", bool),
+        "dir": ("cache_dir", _expand_path),
+        "max_size_mb": ("cache_max_size_mb", int),
+        "max_age_days": ("cache_max_age_days", int),
+    },
+    "parser": {
+        "use_indexer_only": ("use_indexer_only", bool),
+        "debug": ("debug_parser", bool),
+    },
+    "repl": {
+        "history_file": ("history_file", _expand_path),
+    },
+}
+
+
 @dataclass
 class Config:
     """
@@ -63,39 +90,18 @@ class Config:
         config = cls()
 
         # Copybook paths
-        if "copybook_paths" in data:
-            paths = data["copybook_paths"]
-            if isinstance(paths, list):
-                config.copybook_paths = [Path(p).expanduser() for p in paths]
-
-        # Cache settings
-        cache = data.get("cache", {})
-        if "enabled" in cache:
-            config.cache_enabled = bool(cache["enabled"])
-        if "dir" in cache:
-            config.cache_dir = Path(cache["dir"]).expanduser()
-        if "max_size_mb" in cache:
-            config.cache_max_size_mb = int(cache["max_size_mb"])
-        if "max_age_days" in cache:
-            config.cache_max_age_days = int(cache["max_age_days"])
-
-        # Parser settings
-        parser = data.get("parser", {})
-        if "use_indexer_only" in parser:
-            config.use_indexer_only = bool(parser["use_indexer_only"])
-        if "debug" in parser:
-            config.debug_parser = bool(parser["debug"])
-
-        # REPL settings
-        repl = data.get("repl", {})
-        if "history_file" in repl:
-            config.history_file = Path(repl["history_file"]).expanduser()
-
-        # File patterns
-        if "cobol_extensions" in data:
-            config.cobol_extensions = list(data["cobol_extensions"])
-        if "copybook_extensions" in data:
-            config.copybook_extensions = list(data["copybook_extensions"])
+        paths = data.get("copybook_paths")
+        if isinstance(paths, list):
+            config.copybook_paths = [_expand_path(p) for p in paths]
+
+        # Scalar settings, top level and per table
+        for table, fields in _TABLE_FIELDS.items():
+            values = data.get(table, {}) if table else data
+            for key, value in values.items():
+                field_spec = fields.get(key)
+                if field_spec:
+                    attr, convert = field_spec
+                    setattr(config, attr, convert(value))
 
         return config
 
@@ -1,4 +1,6 @@
 # coqu.parser - COBOL parsing module
+import importlib
+
 from coqu.parser.ast import (
     CobolProgram,
     Division,
@@ -8,10 +10,29 @@ from coqu.parser.ast import (
     CopybookRef,
     Statement,
 )
-from coqu.parser.cobol_parser import CobolParser
-from coqu.parser.indexer import StructuralIndexer, StructuralIndex
-from coqu.parser.preprocessor import Preprocessor
-from coqu.parser.chunk_analyzer import ChunkAnalyzer, ChunkAnalysis, analyze_chunk
+
+# Parser components are imported on first access (PEP 562) so that
+# importing coqu.parser, e.g. for the AST types, doesn't load ANTLR
+_LAZY_IMPORTS = {
+    "CobolParser": "coqu.parser.cobol_parser",
+    "StructuralIndexer": "coqu.parser.indexer",
+    "StructuralIndex": "coqu.parser.indexer",
+    "Preprocessor": "coqu.parser.preprocessor",
+    "ChunkAnalyzer": "coqu.parser.chunk_analyzer",
+    "ChunkAnalysis": "coqu.parser.chunk_analyzer",
+    "analyze_chunk": "coqu.parser.chunk_analyzer",
+    "analyze_chunks": "coqu.parser.chunk_analyzer",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "CobolProgram",
@@ -28,4 +49,5 @@ __all__ = [
     "ChunkAnalyzer",
     "ChunkAnalysis",
     "analyze_chunk",
+    "analyze_chunks",
 ]
@@ -3,18 +3,44 @@
 AST node definitions for COBOL programs.
 All nodes are dataclasses for easy serialization with MessagePack.
 """
+from array import array
 from dataclasses import dataclass, field
+from itertools import accumulate
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
+import sys
 
 
-@dataclass
-class SourceLocation:
-    """Source code location information."""
+def _upper_name(name: str) -> str:
+    """
+    Upper-cased copy of a node name for case-insensitive lookups.
+
+    COBOL names are usually upper case already, in which case the name
+    itself is shared; otherwise the upper-cased copy is interned.
+    """
+    upper = name.upper()
+    return name if upper == name else sys.intern(upper)
+
+
+def _intern_names(names: list[str]) -> list[str]:
+    """
+    Intern a list of loaded names.
+
+    Paragraph and data names recur across performs, calls, statement
+    targets and arguments; interning on load keeps one string per name.
+    """
+    return list(map(sys.intern, names))
+
+
+class SourceLocation(NamedTuple):
+    """
+    Source code location information.
+
+    Nodes store line_start/line_end inline; this is built on demand by
+    their location property.
+    """
     line_start: int
     line_end: int
-    col_start: int = 0
-    col_end: int = 0
 
     def __str__(self) -> str:
         if self.line_start == self.line_end:
@@ -22,7 +48,7 @@ class SourceLocation:
         return f"lines {self.line_start}-{self.line_end}"
 
 
-@dataclass
+@dataclass(slots=True)
 class CopybookRef:
     """Reference to a COPY statement."""
     name: str
@@ -51,12 +77,13 @@ class CopybookRef:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DataItem:
     """COBOL data item (variable) definition."""
     name: str
     level: int
-    location: SourceLocation
+    line_start: int
+    line_end: int
     pic: Optional[str] = None
     usage: Optional[str] = None
     value: Optional[str] = None
@@ -64,13 +91,21 @@ class DataItem:
     redefines: Optional[str] = None
     children: list["DataItem"] = field(default_factory=list)
     body: Optional[str] = None  # Full source text, lazy loaded
+    _name_upper: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._name_upper = _upper_name(self.name)
+
+    @property
+    def location(self) -> SourceLocation:
+        return SourceLocation(self.line_start, self.line_end)
 
     def to_dict(self) -> dict:
         return {
             "name": self.name,
             "level": self.level,
-            "line_start": self.location.line_start,
-            "line_end": self.location.line_end,
+            "line_start": self.line_start,
+            "line_end": self.line_end,
             "pic": self.pic,
             "usage": self.usage,
             "value": self.value,
@@ -82,12 +117,10 @@ class DataItem:
     @classmethod
     def from_dict(cls, data: dict) -> "DataItem":
         return cls(
-            name=data["name"],
+            name=sys.intern(data["name"]),
             level=data["level"],
-            location=SourceLocation(
-                line_start=data["line_start"],
-                line_end=data["line_end"],
-            ),
+            line_start=data["line_start"],
+            line_end=data["line_end"],
             pic=data.get("pic"),
             usage=data.get("usage"),
             value=data.get("value"),
@@ -97,52 +130,65 @@ class DataItem:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Statement:
     """COBOL statement (MOVE, CALL, PERFORM, etc.)."""
     type: str  # move, call, perform, if, evaluate, etc.
-    location: SourceLocation
+    line_start: int
+    line_end: int
     target: Optional[str] = None  # For CALL/PERFORM: target name
     arguments: list[str] = field(default_factory=list)
     body: Optional[str] = None  # Full source text
 
+    @property
+    def location(self) -> SourceLocation:
+        return SourceLocation(self.line_start, self.line_end)
+
     def to_dict(self) -> dict:
         return {
             "type": self.type,
-            "line_start": self.location.line_start,
-            "line_end": self.location.line_end,
+            "line_start": self.line_start,
+            "line_end": self.line_end,
             "target": self.target,
             "arguments": self.arguments,
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Statement":
+        target = data.get("target")
         return cls(
-            type=data["type"],
-            location=SourceLocation(
-                line_start=data["line_start"],
-                line_end=data["line_end"],
-            ),
-            target=data.get("target"),
-            arguments=data.get("arguments", []),
+            type=sys.intern(data["type"]),
+            line_start=data["line_start"],
+            line_end=data["line_end"],
+            target=sys.intern(target) if target is not None else None,
+            arguments=_intern_names(data.get("arguments", [])),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Paragraph:
     """COBOL paragraph in PROCEDURE DIVISION."""
     name: str
-    location: SourceLocation
+    line_start: int
+    line_end: int
     statements: list[Statement] = field(default_factory=list)
     body: Optional[str] = None  # Full source text, lazy loaded
     performs: list[str] = field(default_factory=list)  # Paragraphs called via PERFORM
     calls: list[str] = field(default_factory=list)  # Programs called via CALL
+    _name_upper: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._name_upper = _upper_name(self.name)
+
+    @property
+    def location(self) -> SourceLocation:
+        return SourceLocation(self.line_start, self.line_end)
 
     def to_dict(self) -> dict:
         return {
             "name": self.name,
-            "line_start": self.location.line_start,
-            "line_end": self.location.line_end,
+            "line_start": self.line_start,
+            "line_end": self.line_end,
             "statements": [s.to_dict() for s in self.statements],
             "performs": self.performs,
             "calls": self.calls,
@@ -151,31 +197,38 @@ class Paragraph:
     @classmethod
     def from_dict(cls, data: dict) -> "Paragraph":
         return cls(
-            name=data["name"],
-            location=SourceLocation(
-                line_start=data["line_start"],
-                line_end=data["line_end"],
-            ),
+            name=sys.intern(data["name"]),
+            line_start=data["line_start"],
+            line_end=data["line_end"],
             statements=[Statement.from_dict(s) for s in data.get("statements", [])],
-            performs=data.get("performs", []),
-            calls=data.get("calls", []),
+            performs=_intern_names(data.get("performs", [])),
+            calls=_intern_names(data.get("calls", [])),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Section:
     """COBOL section (in any division)."""
     name: str
-    location: SourceLocation
+    line_start: int
+    line_end: int
     paragraphs: list[Paragraph] = field(default_factory=list)
     data_items: list[DataItem] = field(default_factory=list)
     body: Optional[str] = None  # Full source text, lazy loaded
+    _name_upper: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._name_upper = _upper_name(self.name)
+
+    @property
+    def location(self) -> SourceLocation:
+        return SourceLocation(self.line_start, self.line_end)
 
     def to_dict(self) -> dict:
         return {
             "name": self.name,
-            "line_start": self.location.line_start,
-            "line_end": self.location.line_end,
+            "line_start": self.line_start,
+            "line_end": self.line_end,
             "paragraphs": [p.to_dict() for p in self.paragraphs],
             "data_items": [d.to_dict() for d in self.data_items],
         }
@@ -184,29 +237,36 @@ class Section:
     def from_dict(cls, data: dict) -> "Section":
         return cls(
             name=data["name"],
-            location=SourceLocation(
-                line_start=data["line_start"],
-                line_end=data["line_end"],
-            ),
+            line_start=data["line_start"],
+            line_end=data["line_end"],
             paragraphs=[Paragraph.from_dict(p) for p in data.get("paragraphs", [])],
             data_items=[DataItem.from_dict(d) for d in data.get("data_items", [])],
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Division:
     """COBOL division (IDENTIFICATION, ENVIRONMENT, DATA, PROCEDURE)."""
     name: str  # IDENTIFICATION, ENVIRONMENT, DATA, PROCEDURE
-    location: SourceLocation
+    line_start: int
+    line_end: int
     sections: list[Section] = field(default_factory=list)
     paragraphs: list[Paragraph] = field(default_factory=list)  # For PROCEDURE DIVISION
     body: Optional[str] = None  # Full source text, lazy loaded
+    _name_upper: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._name_upper = _upper_name(self.name)
+
+    @property
+    def location(self) -> SourceLocation:
+        return SourceLocation(self.line_start, self.line_end)
 
     def to_dict(self) -> dict:
         return {
             "name": self.name,
-            "line_start": self.location.line_start,
-            "line_end": self.location.line_end,
+            "line_start": self.line_start,
+            "line_end": self.line_end,
             "sections": [s.to_dict() for s in self.sections],
             "paragraphs": [p.to_dict() for p in self.paragraphs],
         }
@@ -215,16 +275,14 @@ class Division:
     def from_dict(cls, data: dict) -> "Division":
         return cls(
             name=data["name"],
-            location=SourceLocation(
-                line_start=data["line_start"],
-                line_end=data["line_end"],
-            ),
+            line_start=data["line_start"],
+            line_end=data["line_end"],
             sections=[Section.from_dict(s) for s in data.get("sections", [])],
             paragraphs=[Paragraph.from_dict(p) for p in data.get("paragraphs", [])],
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Comment:
     """COBOL comment line."""
     text: str
@@ -247,7 +305,7 @@ class Comment:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CobolProgram:
     """Complete COBOL program AST."""
     program_id: str
@@ -258,15 +316,48 @@ class CobolProgram:
     copybook_refs: list[CopybookRef] = field(default_factory=list)
     comments: list[Comment] = field(default_factory=list)
     source_lines: Optional[list[str]] = None  # Original source, for --body queries
+    source_text: Optional[str] = None  # The same source as one string
+
+    # Offset of each line in source_text (plus one past the end), built
+    # on first use so bodies can be sliced instead of joined from lines
+    _line_offsets: Optional[array] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+
+    # Lookup caches, filled on first use. The AST isn't modified once
+    # parsing has finished; call clear_lookup_cache() if it is.
+    _division_cache: dict[str, Optional[Division]] = field(
+        default_factory=dict, init=False, repr=False, compare=False,
+    )
+    _paragraph_cache: Optional[list[Paragraph]] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    _paragraph_index: Optional[dict[str, Paragraph]] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+
+    def clear_lookup_cache(self) -> None:
+        """Forget cached division/paragraph lookups after modifying the AST."""
+        self._division_cache.clear()
+        self._paragraph_cache = None
+        self._paragraph_index = None
 
     def get_division(self, name: str) -> Optional[Division]:
         """Get division by name (partial match supported)."""
         name_upper = name.upper()
+        try:
+            return self._division_cache[name_upper]
+        except KeyError:
+            pass
+
+        found = None
         for div in self.divisions:
             # Exact match or partial match (e.g., "PROCEDURE" matches "PROCEDURE DIVISION")
-            if div.name.upper() == name_upper or name_upper in div.name.upper():
-                return div
-        return None
+            if name_upper in div._name_upper:
+                found = div
+                break
+        self._division_cache[name_upper] = found
+        return found
 
     def get_all_sections(self) -> list[Section]:
         """Get all sections from all divisions."""
@@ -284,22 +375,25 @@ class CobolProgram:
 
     def get_all_paragraphs(self) -> list[Paragraph]:
         """Get all paragraphs from PROCEDURE DIVISION."""
-        proc_div = self.get_division("PROCEDURE")
-        if not proc_div:
-            return []
-
-        paragraphs = list(proc_div.paragraphs)
-        for section in proc_div.sections:
-            paragraphs.extend(section.paragraphs)
-        return paragraphs
+        if self._paragraph_cache is None:
+            paragraphs: list[Paragraph] = []
+            proc_div = self.get_division("PROCEDURE")
+            if proc_div:
+                paragraphs.extend(proc_div.paragraphs)
+                for section in proc_div.sections:
+                    paragraphs.extend(section.paragraphs)
+            self._paragraph_cache = paragraphs
+        return list(self._paragraph_cache)
 
     def get_paragraph(self, name: str) -> Optional[Paragraph]:
         """Get paragraph by name."""
-        name_upper = name.upper()
-        for para in self.get_all_paragraphs():
-            if para.name.upper() == name_upper:
-                return para
-        return None
+        if self._paragraph_index is None:
+            # First paragraph wins for duplicate names, as in a linear scan
+            index: dict[str, Paragraph] = {}
+            for para in self.get_all_paragraphs():
+                index.setdefault(para._name_upper, para)
+            self._paragraph_index = index
+        return self._paragraph_index.get(name.upper())
 
     def get_working_storage_items(self, level: Optional[int] = None) -> list[DataItem]:
         """Get WORKING-STORAGE data items."""
@@ -309,7 +403,7 @@ class CobolProgram:
 
         items: list[DataItem] = []
         for section in data_div.sections:
-            if "WORKING-STORAGE" in section.name.upper():
+            if "WORKING-STORAGE" in section._name_upper:
                 if level is not None:
                     items.extend([d for d in section.data_items if d.level == level])
                 else:
@@ -322,7 +416,7 @@ class CobolProgram:
             return ""
         start = location.line_start - 1
         end = location.line_end
-        return "\n".join(self.source_lines[start:end])
+        return self._join_lines(start, end)
 
     def get_chunk(self, line_start: int, line_end: int) -> str:
         """Extract a chunk of source code by line numbers."""
@@ -331,7 +425,31 @@ class CobolProgram:
         # Convert to 0-based index
         start = max(0, line_start - 1)
         end = min(len(self.source_lines), line_end)
-        return "\n".join(self.source_lines[start:end])
+        return self._join_lines(start, end)
+
+    def _join_lines(self, start: int, end: int) -> str:
+        """
+        Return "\\n".join(source_lines[start:end]).
+
+        With source_text available this is a single slice of it, located
+        through the line offsets, rather than a join of the lines.
+        """
+        if self.source_text is None or start < 0 or end < 0:
+            return "\n".join(self.source_lines[start:end])
+
+        offsets = self._line_offsets
+        if offsets is None:
+            offsets = array("q", accumulate(
+                (len(line) + 1 for line in self.source_lines), initial=0,
+            ))
+            self._line_offsets = offsets
+
+        count = len(offsets) - 1
+        end = min(end, count)
+        if start >= end:
+            return ""
+        # offsets[end] - 1 drops the newline ending the last line
+        return self.source_text[offsets[start]:offsets[end] - 1]
 
     def analyze_paragraph(self, para_name: str) -> Optional[dict]:
         """
@@ -346,20 +464,19 @@ class CobolProgram:
         Returns:
             Dict with performs, calls, data_refs or None if not found
         """
-        from coqu.parser.chunk_analyzer import ChunkAnalyzer
+        from coqu.parser.chunk_analyzer import analyze_chunk
 
         para = self.get_paragraph(para_name)
         if not para or not self.source_lines:
             return None
 
-        analyzer = ChunkAnalyzer()
-        chunk = self.get_chunk(para.location.line_start, para.location.line_end)
-        result = analyzer.analyze(chunk)
+        chunk = self.get_chunk(para.line_start, para.line_end)
+        result = analyze_chunk(chunk)
 
         return {
             "name": para.name,
-            "line_start": para.location.line_start,
-            "line_end": para.location.line_end,
+            "line_start": para.line_start,
+            "line_end": para.line_end,
             "performs": result.performs,
             "calls": result.calls,
             "data_refs": result.data_refs,
@@ -376,13 +493,14 @@ class CobolProgram:
         Returns:
             Dict with aggregated semantic info from all paragraphs
         """
-        from coqu.parser.chunk_analyzer import ChunkAnalyzer
+        from coqu.parser.chunk_analyzer import analyze_chunk
 
         # Find section
+        name_upper = section_name.upper()
         target_section = None
         for div in self.divisions:
             for section in div.sections:
-                if section_name.upper() in section.name.upper():
+                if name_upper in section._name_upper:
                     target_section = section
                     break
             if target_section:
@@ -391,17 +509,18 @@ class CobolProgram:
         if not target_section or not self.source_lines:
             return None
 
-        analyzer = ChunkAnalyzer()
         chunk = self.get_chunk(
-            target_section.location.line_start,
-            target_section.location.line_end,
+            target_section.line_start,
+            target_section.line_end,
+        )
+        result = analyze_chunk(
+            chunk, fields=frozenset({"performs", "calls", "data_refs"}),
         )
-        result = analyzer.analyze(chunk)
 
         return {
             "name": target_section.name,
-            "line_start": target_section.location.line_start,
-            "line_end": target_section.location.line_end,
+            "line_start": target_section.line_start,
+            "line_end": target_section.line_end,
             "performs": result.performs,
             "calls": result.calls,
             "data_refs": result.data_refs,
@@ -6,12 +6,16 @@ Instead of parsing entire files with ANTLR (slow for large files),
 this module extracts and analyzes small chunks on-demand using
 regex patterns for PERFORM, CALL, and other semantic information.
 """
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkAnalysis:
     """Result of analyzing a code chunk."""
     performs: list[str] = field(default_factory=list)  # PERFORM targets
@@ -72,20 +76,65 @@ class ChunkAnalyzer:
         re.IGNORECASE,
     )
 
-    # Data reference pattern (variable names in statements)
+    # Data reference pattern (variable names in statements): a hyphenated
+    # name ending in a letter or digit. Written without a repeated group
+    # inside the star - "(?:-[A-Z0-9]+)+" matches the same names but
+    # makes the engine retry every split of a long identifier.
     DATA_REF_PATTERN = re.compile(
-        r"\b([A-Z][A-Z0-9-]*(?:-[A-Z0-9]+)+)\b",
+        r"\b([A-Z][A-Z0-9-]*-[A-Z0-9]+)\b",
         re.IGNORECASE,
     )
 
+    # All statement patterns above as one alternation, so a chunk is
+    # scanned once instead of once per pattern. Only the verb is consumed
+    # and the rest is matched in a lookahead: as with separate passes, a
+    # match can't hide another one starting inside it (e.g. the MOVE
+    # after an inline PERFORM). The group that closes last names the
+    # statement kind (see _scan_statements).
+    STATEMENT_PATTERN = re.compile(
+        r"\b(?=[PCMG])(?:"
+        r"PERFORM(?=\s+(?:"
+        r"(?P<thru_start>[A-Z][A-Z0-9-]{0,29})\s+(?:THRU|THROUGH)\s+"
+        r"(?P<thru_end>[A-Z][A-Z0-9-]{0,29})\b"
+        r"|(?P<perform>[A-Z][A-Z0-9-]{0,29})\b))"
+        r"|CALL(?=\s+(?:"
+        r"['\"](?P<call_literal>[A-Z][A-Z0-9-]*)['\"]"
+        r"|(?P<call_identifier>[A-Z][A-Z0-9-]+)\b(?!\s*['\"])))"
+        r"|MOVE(?=\s+(?:CORRESPONDING\s+)?(?P<move_source>\S+)\s+TO\s+"
+        r"(?P<move_target>[A-Z][A-Z0-9-]*))"
+        r"|GO(?=\s+TO\s+(?P<goto>[A-Z][A-Z0-9-]{0,29})\b)"
+        r")",
+        re.IGNORECASE,
+    )
+
+    # Bound scanners for the hot path, saving a method lookup per call
+    STATEMENT_FINDITER = STATEMENT_PATTERN.finditer
+    DATA_REF_FINDALL = DATA_REF_PATTERN.findall
+
+    # ChunkAnalysis fields analyze() can fill in, and those that come
+    # from the statement scan
+    ALL_FIELDS = frozenset({"performs", "calls", "moves", "data_refs"})
+    _STATEMENT_FIELDS = frozenset({"performs", "calls", "moves"})
+
+    # Verbs STATEMENT_PATTERN can match, for a quick substring pre-check
+    STATEMENT_VERBS = ("PERFORM", "CALL", "MOVE", "GO")
+
+    # Keyword sets are frozen and their strings interned: matched names are
+    # interned too, so membership tests can succeed on identity
+
     # Keywords to exclude from PERFORM targets
-    PERFORM_KEYWORDS = {
+    PERFORM_KEYWORDS = frozenset(map(sys.intern, (
         "UNTIL", "VARYING", "TIMES", "WITH", "TEST", "BEFORE", "AFTER",
         "THRU", "THROUGH", "END-PERFORM",
-    }
+    )))
+
+    # Keywords to exclude from CALL identifier targets
+    CALL_KEYWORDS = frozenset(map(sys.intern, (
+        "USING", "BY", "REFERENCE", "CONTENT", "VALUE",
+    )))
 
     # Keywords to exclude from data references
-    COBOL_KEYWORDS = {
+    COBOL_KEYWORDS = frozenset(map(sys.intern, (
         "IDENTIFICATION", "DIVISION", "PROGRAM-ID", "ENVIRONMENT", "DATA",
         "PROCEDURE", "WORKING-STORAGE", "SECTION", "LINKAGE", "FILE",
         "MOVE", "TO", "FROM", "PERFORM", "CALL", "USING", "BY", "REFERENCE",
@@ -98,139 +147,192 @@ class ChunkAnalyzer:
         "HIGH-VALUES", "LOW-VALUES", "CORRESPONDING", "CORR", "NOT", "AND",
         "OR", "GREATER", "LESS", "EQUAL", "THAN", "PIC", "PICTURE", "OCCURS",
         "TIMES", "INDEXED", "REDEFINES", "FILLER", "COPY", "REPLACING",
-    }
+    )))
 
-    def analyze(self, chunk: str) -> ChunkAnalysis:
+    def analyze(
+        self,
+        chunk: str,
+        *,
+        fields: frozenset[str] = ALL_FIELDS,
+    ) -> ChunkAnalysis:
         """
         Analyze a code chunk for semantic information.
 
         Args:
             chunk: COBOL source code (typically a paragraph or section)
+            fields: ChunkAnalysis fields to fill in; the others are left
+                empty and their extraction is skipped
 
         Returns:
             ChunkAnalysis with extracted semantic information
         """
-        result = ChunkAnalysis()
-
-        # Normalize to uppercase for matching
-        chunk_upper = chunk.upper()
-
-        # Extract PERFORM targets
-        result.performs = self._extract_performs(chunk_upper)
-
-        # Extract CALL targets
-        result.calls = self._extract_calls(chunk_upper)
-
-        # Extract MOVE operations
-        result.moves = self._extract_moves(chunk_upper)
-
-        # Extract GO TO targets (add to performs for flow analysis)
-        gotos = self._extract_gotos(chunk_upper)
-        for goto in gotos:
-            if goto not in result.performs:
-                result.performs.append(goto)
-
-        # Extract data references
-        result.data_refs = self._extract_data_refs(chunk_upper)
-
-        return result
+        unknown = fields - self.ALL_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown analysis fields: {sorted(unknown)}")
+
+        performs: list[str] = []
+        calls: list[str] = []
+        moves: list[tuple[str, str]] = []
+        data_refs: list[str] = []
+
+        # Every data reference contains a hyphen, so chunks without one
+        # skip the data reference pass
+        refs = "data_refs" in fields and "-" in chunk
+        scan = not fields.isdisjoint(self._STATEMENT_FIELDS)
+        if not (scan or refs):
+            return ChunkAnalysis()
+
+        # The regexes scan one upper-cased copy of the chunk, so captured
+        # names come out upper case without a copy per match. Chunks
+        # without any statement verb (data definitions, comments) skip
+        # the statement scan: a few substring searches are several times
+        # cheaper than a regex scan that finds nothing.
+        upper = chunk.upper()
+        if scan:
+            scan = any(verb in upper for verb in self.STATEMENT_VERBS)
+
+        if scan:
+            # Match all statement verbs in one pass
+            found = self._scan_statements(upper)
+
+            if "performs" in fields:
+                # Extract PERFORM targets
+                performs = self._extract_performs(
+                    found["thru_end"], found["perform"]
+                )
+
+                # Extract GO TO targets (add to performs for flow analysis)
+                gotos = self._extract_gotos(found["goto"])
+                if gotos:
+                    performs = list(dict.fromkeys(performs + gotos))
+
+            if "calls" in fields:
+                # Extract CALL targets
+                calls = self._extract_calls(
+                    found["call_literal"], found["call_identifier"]
+                )
+
+            if "moves" in fields:
+                # Extract MOVE operations
+                moves = self._extract_moves(found["move_target"])
+
+        if refs:
+            # Extract data references - the most expensive pass
+            data_refs = self._extract_data_refs(upper)
+
+        # Build the result once from the finished lists, rather than
+        # filling in a default-constructed one
+        return ChunkAnalysis(
+            performs=performs,
+            calls=calls,
+            moves=moves,
+            data_refs=data_refs,
+        )
+
+    def _scan_statements(self, chunk: str) -> dict[str, list[re.Match]]:
+        """
+        Scan an upper-cased chunk once with STATEMENT_PATTERN.
 
-    def _extract_performs(self, chunk: str) -> list[str]:
-        """Extract PERFORM targets from chunk."""
-        performs = []
+        Returns:
+            Matches keyed by the name of their last group: thru_end,
+            perform, call_literal, call_identifier, move_target or goto
+        """
+        found = {
+            "thru_end": [], "perform": [], "call_literal": [],
+            "call_identifier": [], "move_target": [], "goto": [],
+        }
+        appenders = {name: matches.append for name, matches in found.items()}
+        for match in self.STATEMENT_FINDITER(chunk):
+            appenders[match.lastgroup](match)
+        return found
+
+    def _extract_performs(
+        self,
+        thru_matches: list[re.Match],
+        simple_matches: list[re.Match],
+    ) -> list[str]:
+        """Extract PERFORM targets from PERFORM THRU and PERFORM matches."""
+        # Dicts serve as insertion-ordered sets throughout the extractors
+        performs = {}
 
         # First check for PERFORM THRU patterns
         thru_targets = set()
-        for match in self.PERFORM_THRU.finditer(chunk):
-            start_para = match.group(1).upper()
-            end_para = match.group(2).upper()
+        for match in thru_matches:
+            start_para, end_para = match.group("thru_start", "thru_end")
             if start_para not in self.PERFORM_KEYWORDS:
-                performs.append(start_para)
+                performs[start_para] = None
                 thru_targets.add(start_para)
             if end_para not in self.PERFORM_KEYWORDS:
-                if end_para not in performs:
-                    performs.append(end_para)
+                performs[end_para] = None
                 thru_targets.add(end_para)
 
         # Then get simple PERFORM targets
-        for match in self.PERFORM_SIMPLE.finditer(chunk):
-            target = match.group(1).upper()
+        for match in simple_matches:
+            target = match.group("perform")
             # Skip if it's a keyword or already found in THRU
             if target in self.PERFORM_KEYWORDS:
                 continue
             if target in thru_targets:
                 continue
-            if target not in performs:
-                performs.append(target)
+            performs[target] = None
 
-        return performs
+        return list(performs)
 
-    def _extract_calls(self, chunk: str) -> list[str]:
-        """Extract CALL targets from chunk."""
-        calls = []
+    def _extract_calls(
+        self,
+        literal_matches: list[re.Match],
+        identifier_matches: list[re.Match],
+    ) -> list[str]:
+        """Extract CALL targets from literal and identifier CALL matches."""
+        calls = {}
 
         # Literal calls: CALL 'PROGRAM'
-        for match in self.CALL_LITERAL.finditer(chunk):
-            target = match.group(1).upper()
-            if target not in calls:
-                calls.append(target)
+        for match in literal_matches:
+            calls[match.group("call_literal")] = None
 
         # Identifier calls: CALL WS-PROGRAM-NAME
-        for match in self.CALL_IDENTIFIER.finditer(chunk):
-            target = match.group(1).upper()
+        for match in identifier_matches:
+            target = match.group("call_identifier")
             # Skip common keywords
-            if target in {"USING", "BY", "REFERENCE", "CONTENT", "VALUE"}:
+            if target in self.CALL_KEYWORDS:
                 continue
-            if target not in calls:
-                calls.append(target)
-
-        return calls
-
-    def _extract_moves(self, chunk: str) -> list[tuple[str, str]]:
-        """Extract MOVE source/target pairs from chunk."""
-        moves = []
+            calls[target] = None
 
-        for match in self.MOVE_PATTERN.finditer(chunk):
-            source = match.group(1).upper()
-            target = match.group(2).upper()
-            moves.append((source, target))
+        return list(calls)
 
-        return moves
+    def _extract_moves(self, move_matches: list[re.Match]) -> list[tuple[str, str]]:
+        """Extract MOVE source/target pairs from MOVE matches."""
+        # group() with two names already returns the (source, target) pair
+        return [match.group("move_source", "move_target") for match in move_matches]
 
-    def _extract_gotos(self, chunk: str) -> list[str]:
-        """Extract GO TO targets from chunk."""
-        gotos = []
+    def _extract_gotos(self, goto_matches: list[re.Match]) -> list[str]:
+        """Extract GO TO targets from GO TO matches."""
+        gotos = {}
 
-        for match in self.GOTO_PATTERN.finditer(chunk):
-            target = match.group(1).upper()
-            if target not in gotos:
-                gotos.append(target)
+        for match in goto_matches:
+            gotos[match.group("goto")] = None
 
-        return gotos
+        return list(gotos)
 
     def _extract_data_refs(self, chunk: str) -> list[str]:
-        """Extract referenced data item names from chunk."""
-        refs = []
+        """Extract referenced data item names from an upper-cased chunk."""
+        # Data items usually have hyphens (WS-CUSTOMER-ID), which the
+        # pattern requires, so paragraph-like names never match.
+        # Identifier names repeat across paragraphs; interning shares
+        # one string per name.
+        keywords = self.COBOL_KEYWORDS
+        names = map(sys.intern, self.DATA_REF_FINDALL(chunk))
 
-        for match in self.DATA_REF_PATTERN.finditer(chunk):
-            name = match.group(1).upper()
-            # Skip COBOL keywords
-            if name in self.COBOL_KEYWORDS:
-                continue
-            # Skip if looks like a paragraph name (no hyphens typically)
-            # Data items usually have hyphens: WS-CUSTOMER-ID
-            if '-' not in name:
-                continue
-            if name not in refs:
-                refs.append(name)
-
-        return refs
+        # Skip COBOL keywords
+        return list(dict.fromkeys(name for name in names if name not in keywords))
 
     def analyze_paragraph(
         self,
         source_lines: list[str],
         line_start: int,
         line_end: int,
+        *,
+        fields: frozenset[str] = ALL_FIELDS,
     ) -> ChunkAnalysis:
         """
         Analyze a paragraph given line range.
@@ -239,6 +341,7 @@ class ChunkAnalyzer:
             source_lines: Full source as list of lines
             line_start: Starting line (1-based)
             line_end: Ending line (1-based)
+            fields: ChunkAnalysis fields to fill in (see analyze())
 
         Returns:
             ChunkAnalysis for the paragraph
@@ -247,7 +350,7 @@ class ChunkAnalyzer:
         chunk_lines = source_lines[line_start - 1:line_end]
         chunk = "\n".join(chunk_lines)
 
-        return self.analyze(chunk)
+        return self.analyze(chunk, fields=fields)
 
     def get_chunk(
         self,
@@ -274,15 +377,60 @@ class ChunkAnalyzer:
 _analyzer = ChunkAnalyzer()
 
 
-def analyze_chunk(chunk: str) -> ChunkAnalysis:
+def analyze_chunk(
+    chunk: str,
+    *,
+    fields: frozenset[str] = ChunkAnalyzer.ALL_FIELDS,
+) -> ChunkAnalysis:
     """Convenience function to analyze a chunk."""
-    return _analyzer.analyze(chunk)
+    return _analyzer.analyze(chunk, fields=fields)
 
 
 def analyze_paragraph(
     source_lines: list[str],
     line_start: int,
     line_end: int,
+    *,
+    fields: frozenset[str] = ChunkAnalyzer.ALL_FIELDS,
 ) -> ChunkAnalysis:
     """Convenience function to analyze a paragraph."""
-    return _analyzer.analyze_paragraph(source_lines, line_start, line_end)
+    return _analyzer.analyze_paragraph(
+        source_lines, line_start, line_end, fields=fields,
+    )
+
+
+# Batches smaller than this are analyzed in-process: starting workers and
+# shipping chunks to them costs more than the analysis itself
+PARALLEL_MIN_CHUNKS = 64
+
+
+def analyze_chunks(
+    chunks: list[str],
+    *,
+    fields: frozenset[str] = ChunkAnalyzer.ALL_FIELDS,
+    max_workers: Optional[int] = None,
+) -> list[ChunkAnalysis]:
+    """
+    Analyze many independent chunks, spread over worker processes.
+
+    Chunk analysis is pure Python regex work that holds the GIL, so a
+    process pool is used rather than threads. Small batches, or
+    max_workers=1, run in the calling process.
+
+    Args:
+        chunks: COBOL source chunks (typically one per paragraph)
+        fields: ChunkAnalysis fields to fill in (see ChunkAnalyzer.analyze)
+        max_workers: Worker processes (defaults to the CPU count)
+
+    Returns:
+        ChunkAnalysis per chunk, in input order
+    """
+    analyze = partial(analyze_chunk, fields=fields)
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) < PARALLEL_MIN_CHUNKS:
+        return [analyze(chunk) for chunk in chunks]
+
+    # A few batches per worker keeps them busy without per-chunk IPC
+    chunksize = max(1, len(chunks) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(analyze, chunks, chunksize=chunksize))
@@ -3,12 +3,22 @@
 Main COBOL parser using ANTLR4 generated code.
 Provides high-level parsing API and AST extraction.
 """
+import bisect
+import dataclasses
 import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 
-from antlr4 import CommonTokenStream, InputStream
+from antlr4 import DFA, CommonTokenStream, InputStream, PredictionMode
 from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
 
 from coqu.parser.generated import (
     Cobol85Lexer,
@@ -24,7 +34,6 @@ from coqu.parser.ast import (
     Statement,
     Comment,
     CopybookRef,
-    SourceLocation,
 )
 from coqu.parser.preprocessor import Preprocessor
 from coqu.parser.indexer import StructuralIndexer, StructuralIndex
@@ -53,38 +62,46 @@ class CoquErrorListener(ErrorListener):
 class CobolASTVisitor(Cobol85Visitor):
     """Visitor to extract AST from ANTLR parse tree."""
 
+    # A visitor rather than a listener: in the Python runtime
+    # ParseTreeWalker is plain Python recursion too, and it dispatches an
+    # enter and an exit call per node, so a bare walk is no faster than a
+    # bare visit. Either is a small fraction of the parse itself.
+
+    # Data description entry: level number, then optionally the name and
+    # a PIC clause, all captured in one match from the start of the entry
+    DATA_ENTRY_PATTERN = re.compile(
+        r"(?P<level>\d+)"
+        r"(?:\s+(?P<name>[A-Z][A-Z0-9-]*))?"
+        r"(?:.*?PIC(?:TURE)?\s+(?:IS\s+)?(?P<pic>\S+))?",
+        re.IGNORECASE | re.DOTALL,
+    )
+
     def __init__(self, source_lines: list[str]):
         self.source_lines = source_lines
         self.divisions: list[Division] = []
         self.comments: list[Comment] = []
         self.current_division: Optional[Division] = None
         self.current_section: Optional[Section] = None
+        self._current_paragraph: Optional[Paragraph] = None
+
+    def _get_lines(self, ctx) -> tuple[int, int]:
+        """
+        Get (line_start, line_end) from parser context.
 
-    def _get_location(self, ctx) -> SourceLocation:
-        """Get source location from parser context."""
+        Called for every node kept in the AST, so only the two token
+        line numbers are read; nothing of the token text.
+        """
         start = ctx.start
         stop = ctx.stop or start
-        return SourceLocation(
-            line_start=start.line,
-            line_end=stop.line,
-            col_start=start.column,
-            col_end=stop.column + len(stop.text) if stop.text else stop.column,
-        )
-
-    def _get_text(self, ctx) -> str:
-        """Get original text from context."""
-        if ctx is None:
-            return ""
-        start = ctx.start.line - 1
-        stop = (ctx.stop.line if ctx.stop else ctx.start.line)
-        return "\n".join(self.source_lines[start:stop])
+        return start.line, stop.line
 
     def visitIdentificationDivision(self, ctx):
         """Visit IDENTIFICATION DIVISION."""
-        location = self._get_location(ctx)
+        line_start, line_end = self._get_lines(ctx)
         div = Division(
             name="IDENTIFICATION DIVISION",
-            location=location,
+            line_start=line_start,
+            line_end=line_end,
         )
         self.divisions.append(div)
         self.current_division = div
@@ -92,10 +109,11 @@ class CobolASTVisitor(Cobol85Visitor):
 
     def visitEnvironmentDivision(self, ctx):
         """Visit ENVIRONMENT DIVISION."""
-        location = self._get_location(ctx)
+        line_start, line_end = self._get_lines(ctx)
         div = Division(
             name="ENVIRONMENT DIVISION",
-            location=location,
+            line_start=line_start,
+            line_end=line_end,
         )
         self.divisions.append(div)
         self.current_division = div
@@ -103,10 +121,11 @@ class CobolASTVisitor(Cobol85Visitor):
 
     def visitDataDivision(self, ctx):
         """Visit DATA DIVISION."""
-        location = self._get_location(ctx)
+        line_start, line_end = self._get_lines(ctx)
         div = Division(
             name="DATA DIVISION",
-            location=location,
+            line_start=line_start,
+            line_end=line_end,
         )
         self.divisions.append(div)
         self.current_division = div
@@ -114,10 +133,11 @@ class CobolASTVisitor(Cobol85Visitor):
 
     def visitProcedureDivision(self, ctx):
         """Visit PROCEDURE DIVISION."""
-        location = self._get_location(ctx)
+        line_start, line_end = self._get_lines(ctx)
         div = Division(
             name="PROCEDURE DIVISION",
-            location=location,
+            line_start=line_start,
+            line_end=line_end,
         )
         self.divisions.append(div)
         self.current_division = div
@@ -126,10 +146,11 @@ class CobolASTVisitor(Cobol85Visitor):
     def visitWorkingStorageSection(self, ctx):
         """Visit WORKING-STORAGE SECTION."""
         if self.current_division:
-            location = self._get_location(ctx)
+            line_start, line_end = self._get_lines(ctx)
             section = Section(
                 name="WORKING-STORAGE SECTION",
-                location=location,
+                line_start=line_start,
+                line_end=line_end,
             )
             self.current_division.sections.append(section)
             self.current_section = section
@@ -138,10 +159,11 @@ class CobolASTVisitor(Cobol85Visitor):
     def visitFileSection(self, ctx):
         """Visit FILE SECTION."""
         if self.current_division:
-            location = self._get_location(ctx)
+            line_start, line_end = self._get_lines(ctx)
             section = Section(
                 name="FILE SECTION",
-                location=location,
+                line_start=line_start,
+                line_end=line_end,
             )
             self.current_division.sections.append(section)
             self.current_section = section
@@ -150,10 +172,11 @@ class CobolASTVisitor(Cobol85Visitor):
     def visitLinkageSection(self, ctx):
         """Visit LINKAGE SECTION."""
         if self.current_division:
-            location = self._get_location(ctx)
+            line_start, line_end = self._get_lines(ctx)
             section = Section(
                 name="LINKAGE SECTION",
-                location=location,
+                line_start=line_start,
+                line_end=line_end,
             )
             self.current_division.sections.append(section)
             self.current_section = section
@@ -162,10 +185,11 @@ class CobolASTVisitor(Cobol85Visitor):
     def visitLocalStorageSection(self, ctx):
         """Visit LOCAL-STORAGE SECTION."""
         if self.current_division:
-            location = self._get_location(ctx)
+            line_start, line_end = self._get_lines(ctx)
             section = Section(
                 name="LOCAL-STORAGE SECTION",
-                location=location,
+                line_start=line_start,
+                line_end=line_end,
             )
             self.current_division.sections.append(section)
             self.current_section = section
@@ -174,13 +198,14 @@ class CobolASTVisitor(Cobol85Visitor):
     def visitProcedureSection(self, ctx):
         """Visit PROCEDURE section."""
         if self.current_division:
-            location = self._get_location(ctx)
+            line_start, line_end = self._get_lines(ctx)
             # Get section name from header
             header = ctx.procedureSectionHeader()
             name = header.sectionName().getText().upper() if header else "UNKNOWN SECTION"
             section = Section(
                 name=f"{name} SECTION",
-                location=location,
+                line_start=line_start,
+                line_end=line_end,
             )
             self.current_division.sections.append(section)
             self.current_section = section
@@ -191,85 +216,67 @@ class CobolASTVisitor(Cobol85Visitor):
         if not self.current_section:
             return self.visitChildren(ctx)
 
-        location = self._get_location(ctx)
+        line_start, line_end = self._get_lines(ctx)
 
-        # Try to get level number and name
+        # Level number, name and PIC clause in one match; an entry
+        # without a leading level number keeps the defaults
         level = 0
         name = "FILLER"
-
-        # Get the text and parse it
-        text = ctx.getText()
-
-        # Extract level number (first thing in the entry)
-        import re
-        level_match = re.match(r"(\d+)", text)
-        if level_match:
-            level = int(level_match.group(1))
-
-        # Extract name (after level, before PIC or next keyword)
-        name_match = re.search(r"\d+\s+([A-Z][A-Z0-9-]*)", text, re.IGNORECASE)
-        if name_match:
-            name = name_match.group(1).upper()
-
-        # Extract PIC clause
         pic = None
-        pic_match = re.search(r"PIC(?:TURE)?\s+IS\s+(\S+)|PIC(?:TURE)?\s+(\S+)", text, re.IGNORECASE)
-        if pic_match:
-            pic = pic_match.group(1) or pic_match.group(2)
+
+        entry_match = self.DATA_ENTRY_PATTERN.match(ctx.getText())
+        if entry_match:
+            level_text, name_text, pic = entry_match.group("level", "name", "pic")
+            level = int(level_text)
+            if name_text:
+                name = name_text.upper()
 
         item = DataItem(
             name=name,
             level=level,
-            location=location,
+            line_start=line_start,
+            line_end=line_end,
             pic=pic,
         )
 
         self.current_section.data_items.append(item)
         return self.visitChildren(ctx)
 
-    def _extract_performs(self, ctx) -> list[str]:
-        """Extract PERFORM targets from paragraph."""
-        performs = []
-        text = ctx.getText().upper()
-
-        import re
-        # Pattern for PERFORM paragraph-name
-        for match in re.finditer(r"PERFORM\s+([A-Z][A-Z0-9-]*)", text):
-            target = match.group(1)
-            if target not in ("UNTIL", "VARYING", "TIMES", "WITH", "TEST"):
-                performs.append(target)
-
-        return performs
-
-    def _extract_calls(self, ctx) -> list[str]:
-        """Extract CALL targets from paragraph."""
-        calls = []
-        text = ctx.getText().upper()
-
-        import re
-        # Pattern for CALL 'program-name' or CALL identifier
-        for match in re.finditer(r"CALL\s+['\"]?([A-Z][A-Z0-9-]*)['\"]?", text):
-            calls.append(match.group(1))
+    def visitPerformProcedureStatement(self, ctx):
+        """Record PERFORM targets, including a THRU end, on the paragraph."""
+        if self._current_paragraph:
+            for proc_ctx in ctx.procedureName():
+                name_ctx = proc_ctx.paragraphName() or proc_ctx.sectionName()
+                self._current_paragraph.performs.append(name_ctx.getText().upper())
+        return self.visitChildren(ctx)
 
-        return calls
+    def visitCallStatement(self, ctx):
+        """Record the CALL target, a literal or identifier, on the paragraph."""
+        if self._current_paragraph:
+            target_ctx = ctx.literal() or ctx.identifier()
+            if target_ctx:
+                target = target_ctx.getText().strip("'\"").upper()
+                self._current_paragraph.calls.append(target)
+        return self.visitChildren(ctx)
 
     def visitStatement(self, ctx):
         """Visit a statement and record it."""
         if not ctx:
             return self.visitChildren(ctx)
 
-        location = self._get_location(ctx)
+        line_start, line_end = self._get_lines(ctx)
 
         # Determine statement type from the child context
         stmt_type = self._get_statement_type(ctx)
 
         stmt = Statement(
             type=stmt_type,
-            location=location,
+            line_start=line_start,
+            line_end=line_end,
         )
 
         # Add to current paragraph if we're tracking one
-        if hasattr(self, '_current_paragraph') and self._current_paragraph:
+        if self._current_paragraph:
             self._current_paragraph.statements.append(stmt)
 
         return self.visitChildren(ctx)
@@ -289,7 +296,7 @@ class CobolASTVisitor(Cobol85Visitor):
 
     def visitParagraph(self, ctx):
         """Visit paragraph in PROCEDURE DIVISION."""
-        location = self._get_location(ctx)
+        line_start, line_end = self._get_lines(ctx)
 
         # Get paragraph name
         name_ctx = ctx.paragraphName()
@@ -297,10 +304,11 @@ class CobolASTVisitor(Cobol85Visitor):
 
         para = Paragraph(
             name=name,
-            location=location,
+            line_start=line_start,
+            line_end=line_end,
         )
 
-        # Track current paragraph for statement collection
+        # Track current paragraph for statement, PERFORM and CALL collection
         self._current_paragraph = para
 
         # Visit children to collect statements
@@ -309,10 +317,6 @@ class CobolASTVisitor(Cobol85Visitor):
         # Clear current paragraph tracker
         self._current_paragraph = None
 
-        # Extract PERFORM and CALL targets
-        para.performs = self._extract_performs(ctx)
-        para.calls = self._extract_calls(ctx)
-
         # Add to current section or division
         if self.current_section and self.current_division and "PROCEDURE" in self.current_division.name:
             self.current_section.paragraphs.append(para)
@@ -332,10 +336,46 @@ class CobolParser:
     - Copybook preprocessing
     """
 
+    # PROGRAM-ID, or the first division header after IDENTIFICATION
+    # DIVISION: the search stops there instead of scanning the whole
+    # (copybook-expanded) source when there is no PROGRAM-ID. Headers on
+    # comment lines (indicator * or / in column 7, or after *>) don't stop it
+    PROGRAM_ID_PATTERN = re.compile(
+        r"PROGRAM-ID\s*[.\s]+([A-Z][A-Z0-9-]*)"
+        r"|^(?!.{6}[*/])[^\n*]*?\b(?:ENVIRONMENT|DATA|PROCEDURE)\s+DIVISION\b",
+        re.IGNORECASE | re.MULTILINE,
+    )
+
+    # Fast path for PROGRAM_ID_PATTERN: PROGRAM-ID is looked for with
+    # str.find in the upper-cased head of the source, then the name is
+    # matched right after it. Any of the division words before it, even
+    # in a comment, leaves the decision to PROGRAM_ID_PATTERN
+    PROGRAM_ID_HEAD = 4096
+    PROGRAM_ID_NAME_PATTERN = re.compile(r"\s*[.\s]+([A-Z][A-Z0-9-]*)")
+
+    # Default number of parse results kept for re-parses of unchanged sources
+    PROGRAM_CACHE_SIZE = 64
+
+    # Preprocessed (copybook-expanded) sources kept for the same
+    PREPROCESS_CACHE_SIZE = 128
+
+    # Sources remembered as failing the ANTLR parse (oldest forgotten first)
+    ANTLR_FAILURE_LIMIT = 256
+
+    # Batches smaller than this are parsed in-process by parse_files
+    PARALLEL_MIN_FILES = 4
+
+    # Sources larger than this (in MB of text) go straight to the indexer
+    ANTLR_MAX_SOURCE_MB = 8
+
     def __init__(
         self,
         copybook_paths: Optional[list[Path]] = None,
         use_indexer_only: bool = False,
+        program_cache_size: int = PROGRAM_CACHE_SIZE,
+        clear_dfa_after_parse: bool = False,
+        antlr_max_source_mb: Optional[float] = ANTLR_MAX_SOURCE_MB,
+        index_workers: Optional[int] = None,
     ):
         """
         Initialize parser.
@@ -343,11 +383,51 @@ class CobolParser:
         Args:
             copybook_paths: Paths to search for copybooks
             use_indexer_only: Only use fast indexer, skip full ANTLR parse
+            program_cache_size: Parse results kept in memory (0 disables)
+            clear_dfa_after_parse: Drop ANTLR's prediction caches after
+                each full parse, bounding memory in long batch runs at the
+                cost of re-warming them for every file
+            antlr_max_source_mb: Larger sources are only indexed: the
+                ANTLR runtime holds every token and the whole parse tree
+                in memory (None parses any size)
+            index_workers: Worker processes the indexer may split the
+                statement scans of very large sources across (None keeps
+                indexing in-process)
         """
         self.preprocessor = Preprocessor(copybook_paths)
         self.indexer = StructuralIndexer()
         self.use_indexer_only = use_indexer_only
         self.debug = False
+        self.clear_dfa_after_parse = clear_dfa_after_parse
+        self.antlr_max_source_mb = antlr_max_source_mb
+        self.index_workers = index_workers
+        self._programs: OrderedDict[tuple, CobolProgram] = OrderedDict()
+        self._programs_cap = program_cache_size
+        self._preprocessed: OrderedDict[tuple, tuple] = OrderedDict()
+        # Insertion-ordered, used as a FIFO-bounded set
+        self._antlr_failures: dict[tuple, None] = {}
+        # Guards the three caches above; a parser may be shared by threads
+        self._lock = threading.Lock()
+
+    def clear_program_cache(self) -> None:
+        """Forget cached parse and preprocessing results."""
+        with self._lock:
+            self._programs.clear()
+            self._preprocessed.clear()
+
+    @staticmethod
+    def clear_antlr_caches() -> None:
+        """
+        Drop the ANTLR lexer and parser prediction caches.
+
+        They are shared by all parser instances and grow with every
+        distinct input seen; the next parse starts cold.
+        """
+        for recognizer in (Cobol85Lexer, Cobol85Parser):
+            dfas = recognizer.decisionsToDFA
+            for i, dfa in enumerate(dfas):
+                dfas[i] = DFA(dfa.atnStartState, i)
+        Cobol85Parser.sharedContextCache.cache.clear()
 
     def add_copybook_path(self, path: Path) -> None:
         """Add copybook search path."""
@@ -363,14 +443,57 @@ class CobolParser:
         Returns:
             CobolProgram AST
         """
-        source = path.read_text()
-        return self.parse(source, path)
+        # Hash the raw bytes, as CacheManager.hash_source does, rather
+        # than re-encoding the decoded text; decode as read_text() would
+        data = path.read_bytes()
+        source_hash = hashlib.sha256(data, usedforsecurity=False).hexdigest()
+        source = io.TextIOWrapper(io.BytesIO(data)).read()
+        return self.parse(source, path, source_hash=source_hash)
+
+    def parse_files(
+        self,
+        paths: list[Path],
+        max_workers: Optional[int] = None,
+    ) -> list[CobolProgram]:
+        """
+        Parse many COBOL files, spread over worker processes.
+
+        Parsing holds the GIL, so a process pool is used rather than
+        threads. Each worker builds its own parser with this parser's
+        settings; its results don't go into this parser's cache. Small
+        batches, or max_workers=1, are parsed in the calling process.
+
+        Args:
+            paths: Paths to COBOL source files
+            max_workers: Worker processes (defaults to the CPU count)
+
+        Returns:
+            CobolProgram AST per path, in input order
+        """
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or len(paths) < self.PARALLEL_MIN_FILES:
+            return [self.parse_file(path) for path in paths]
+
+        settings = (
+            list(self.preprocessor.copybook_paths),
+            self.use_indexer_only,
+            self.clear_dfa_after_parse,
+            self.antlr_max_source_mb,
+            self.index_workers,
+        )
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(paths)),
+            initializer=_init_worker_parser,
+            initargs=settings,
+        ) as pool:
+            return list(pool.map(_parse_file_in_worker, paths))
 
     def parse(
         self,
         source: str,
         path: Optional[Path] = None,
         preprocess: bool = True,
+        source_hash: Optional[str] = None,
     ) -> CobolProgram:
         """
         Parse COBOL source code.
@@ -379,37 +502,122 @@ class CobolParser:
             source: COBOL source code
             path: Optional path for copybook resolution
             preprocess: Whether to preprocess (resolve copybooks)
+            source_hash: SHA256 of the source, if already known
 
         Returns:
             CobolProgram AST
         """
         # Compute source hash
-        source_hash = hashlib.sha256(source.encode()).hexdigest()
+        if source_hash is None:
+            source_hash = hashlib.sha256(
+                source.encode(), usedforsecurity=False
+            ).hexdigest()
 
-        # Preprocess
+        # Preprocess. With copybooks expanded, the parsed text differs
+        # from the file; its hash joins the source hash in the keys below
         copybook_refs: list[CopybookRef] = []
+        expanded_hash = None
         if preprocess:
-            result = self.preprocessor.preprocess(source, path)
-            source = result.source
-            copybook_refs = result.copybook_refs
+            source, copybook_refs, expanded_hash = self._preprocess(
+                source, path, source_hash,
+            )
+
+        # Re-parses of an unchanged source are served from the LRU
+        cache_key = None
+        if self._programs_cap > 0:
+            cache_key = (
+                source_hash, expanded_hash, str(path) if path else None,
+                preprocess, self.use_indexer_only, self.antlr_max_source_mb,
+            )
+            with self._lock:
+                cached = self._programs.get(cache_key)
+                if cached is not None:
+                    self._programs.move_to_end(cache_key)
+            if cached is not None:
+                # Shallow copy with its own lookup caches
+                return dataclasses.replace(cached)
 
         # Split into lines for body extraction
         source_lines = source.split("\n")
-        total_lines = len(source_lines)
 
         # Extract program ID from source
         program_id = self._extract_program_id(source)
 
-        if self.use_indexer_only:
-            # Fast path: use structural indexer only
-            return self._parse_with_indexer(
+        program = None
+        if not self.use_indexer_only and not self._too_large_for_antlr(source):
+            # Full ANTLR parse, unless this text is already known to fail
+            failure_key = (source_hash, expanded_hash)
+            with self._lock:
+                known_failure = failure_key in self._antlr_failures
+            if not known_failure:
+                program = self._parse_with_antlr(
+                    source, source_lines, path, source_hash, program_id, copybook_refs,
+                )
+                if self.clear_dfa_after_parse:
+                    self.clear_antlr_caches()
+                if program is None:
+                    with self._lock:
+                        self._antlr_failures[failure_key] = None
+                        if len(self._antlr_failures) > self.ANTLR_FAILURE_LIMIT:
+                            del self._antlr_failures[next(iter(self._antlr_failures))]
+
+        if program is None:
+            # Fast path, or fall back to the indexer on ANTLR parse errors
+            program = self._parse_with_indexer(
                 source, source_lines, path, source_hash, program_id, copybook_refs,
             )
 
-        # Full ANTLR parse
-        return self._parse_with_antlr(
-            source, source_lines, path, source_hash, program_id, copybook_refs,
+        if cache_key is not None:
+            with self._lock:
+                self._programs[cache_key] = program
+                if len(self._programs) > self._programs_cap:
+                    self._programs.popitem(last=False)
+        return program
+
+    def _preprocess(
+        self,
+        source: str,
+        path: Optional[Path],
+        source_hash: str,
+    ) -> tuple[str, list[CopybookRef], Optional[str]]:
+        """
+        Preprocess source, reusing the result for an unchanged source.
+
+        Returns:
+            Expanded source, its copybook refs and, if copybooks were
+            found, the hash of the expanded source
+        """
+        # Copybook contents are cached by the preprocessor for its
+        # lifetime, so only the lookup inputs need to be in the key
+        key = (
+            source_hash, str(path) if path else None,
+            tuple(self.preprocessor.copybook_paths),
         )
+        with self._lock:
+            cached = self._preprocessed.get(key)
+            if cached is not None:
+                self._preprocessed.move_to_end(key)
+        if cached is not None:
+            return cached
+
+        result = self.preprocessor.preprocess(source, path)
+        expanded_hash = None
+        if result.copybook_refs:
+            expanded_hash = hashlib.sha256(
+                result.source.encode(), usedforsecurity=False
+            ).hexdigest()
+
+        entry = (result.source, result.copybook_refs, expanded_hash)
+        with self._lock:
+            self._preprocessed[key] = entry
+            if len(self._preprocessed) > self.PREPROCESS_CACHE_SIZE:
+                self._preprocessed.popitem(last=False)
+        return entry
+
+    def _too_large_for_antlr(self, source: str) -> bool:
+        """Whether source exceeds antlr_max_source_mb."""
+        limit = self.antlr_max_source_mb
+        return limit is not None and len(source) > limit * 1024 * 1024
 
     def _parse_with_antlr(
         self,
@@ -419,8 +627,20 @@ class CobolParser:
         source_hash: str,
         program_id: str,
         copybook_refs: list[CopybookRef],
-    ) -> CobolProgram:
-        """Parse using full ANTLR parser."""
+    ) -> Optional[CobolProgram]:
+        """
+        Parse using full ANTLR parser.
+
+        Returns:
+            CobolProgram AST, or None if the source has parse errors
+        """
+        # A fresh lexer and parser per call is deliberate: the prediction
+        # DFA and context cache are class attributes of the generated
+        # Cobol85Lexer/Cobol85Parser, so they stay warm across calls and
+        # instances, while construction itself costs microseconds. Shared
+        # instances would only make concurrent parses unsafe. Batch runs
+        # that can't afford the caches' growth set clear_dfa_after_parse.
+
         # Create ANTLR input stream
         input_stream = InputStream(source)
 
@@ -436,20 +656,29 @@ class CobolParser:
         # Create parser
         parser = Cobol85Parser(stream)
         parser.removeErrorListeners()
-        parser.addErrorListener(error_listener)
 
-        # Parse
-        tree = parser.startRule()
+        # Two-stage parse: SLL prediction, bailing out at the first error,
+        # is much faster and succeeds on most valid input. Only if it
+        # fails is the input re-parsed with full LL prediction and the
+        # default error recovery and reporting.
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser._errHandler = BailErrorStrategy()
+        try:
+            tree = parser.startRule()
+        except ParseCancellationException:
+            stream.seek(0)
+            parser.reset()
+            parser._interp.predictionMode = PredictionMode.LL
+            parser._errHandler = DefaultErrorStrategy()
+            parser.addErrorListener(error_listener)
+            tree = parser.startRule()
 
         # Check for errors
         if error_listener.errors:
             if self.debug:
                 for err in error_listener.errors:
                     print(f"Parse error: {err}")
-            # Fall back to indexer on parse error
-            return self._parse_with_indexer(
-                source, source_lines, path, source_hash, program_id, copybook_refs,
-            )
+            return None
 
         # Extract AST using visitor
         visitor = CobolASTVisitor(source_lines)
@@ -465,6 +694,7 @@ class CobolParser:
             copybook_refs=copybook_refs,
             comments=visitor.comments,
             source_lines=source_lines,
+            source_text=source,
         )
 
         return program
@@ -479,35 +709,32 @@ class CobolParser:
         copybook_refs: list[CopybookRef],
     ) -> CobolProgram:
         """Parse using fast structural indexer."""
-        index = self.indexer.index(source)
+        index = self.indexer.index(source, max_workers=self.index_workers)
 
         # Convert index to AST
-        divisions: list[Division] = []
-
-        for div_entry in index.divisions:
-            div = Division(
+        divisions = [
+            Division(
                 name=div_entry.name,
-                location=SourceLocation(
-                    line_start=div_entry.line_start,
-                    line_end=div_entry.line_end,
-                ),
+                line_start=div_entry.line_start,
+                line_end=div_entry.line_end,
             )
-            divisions.append(div)
+            for div_entry in index.divisions
+        ]
 
         # Add sections to divisions
+        div_starts, divs_by_start = self._by_line_start(divisions)
         for sec_entry in index.sections:
             # Find containing division
-            for div in divisions:
-                if div.location.line_start <= sec_entry.line_start <= div.location.line_end:
-                    section = Section(
-                        name=sec_entry.name,
-                        location=SourceLocation(
-                            line_start=sec_entry.line_start,
-                            line_end=sec_entry.line_end,
-                        ),
-                    )
-                    div.sections.append(section)
-                    break
+            div = self._find_container(
+                div_starts, divs_by_start, sec_entry.line_start,
+            )
+            if div is not None:
+                section = Section(
+                    name=sec_entry.name,
+                    line_start=sec_entry.line_start,
+                    line_end=sec_entry.line_end,
+                )
+                div.sections.append(section)
 
         # Add paragraphs to PROCEDURE DIVISION
         proc_div = None
@@ -517,23 +744,20 @@ class CobolParser:
                 break
 
         if proc_div:
+            sec_starts, secs_by_start = self._by_line_start(proc_div.sections)
             for para_entry in index.paragraphs:
                 para = Paragraph(
                     name=para_entry.name,
-                    location=SourceLocation(
-                        line_start=para_entry.line_start,
-                        line_end=para_entry.line_end,
-                    ),
+                    line_start=para_entry.line_start,
+                    line_end=para_entry.line_end,
                 )
                 # Find containing section
-                added_to_section = False
-                for section in proc_div.sections:
-                    if section.location.line_start <= para_entry.line_start <= section.location.line_end:
-                        section.paragraphs.append(para)
-                        added_to_section = True
-                        break
-
-                if not added_to_section:
+                section = self._find_container(
+                    sec_starts, secs_by_start, para_entry.line_start,
+                )
+                if section is not None:
+                    section.paragraphs.append(para)
+                else:
                     proc_div.paragraphs.append(para)
 
         # Add data items from index
@@ -555,20 +779,20 @@ class CobolParser:
                 if not ws_section:
                     ws_section = Section(
                         name="WORKING-STORAGE SECTION",
-                        location=SourceLocation(line_start=0, line_end=0),
+                        line_start=0,
+                        line_end=0,
                     )
                     data_div.sections.append(ws_section)
 
-                for item_entry in index.data_items_01:
-                    item = DataItem(
+                ws_section.data_items.extend([
+                    DataItem(
                         name=item_entry.name,
                         level=1,
-                        location=SourceLocation(
-                            line_start=item_entry.line_start,
-                            line_end=item_entry.line_end,
-                        ),
+                        line_start=item_entry.line_start,
+                        line_end=item_entry.line_end,
                     )
-                    ws_section.data_items.append(item)
+                    for item_entry in index.data_items_01
+                ])
 
         program = CobolProgram(
             program_id=program_id,
@@ -579,22 +803,77 @@ class CobolParser:
             copybook_refs=copybook_refs,
             comments=[],
             source_lines=source_lines,
+            source_text=source,
         )
 
         return program
 
+    @staticmethod
+    def _by_line_start(nodes: list) -> tuple[list[int], list]:
+        """Nodes sorted by line_start, with their start lines for bisect."""
+        ordered = sorted(nodes, key=lambda node: node.line_start)
+        return [node.line_start for node in ordered], ordered
+
+    @staticmethod
+    def _find_container(starts: list[int], nodes: list, line: int):
+        """
+        Node spanning line, from the output of _by_line_start.
+
+        Index entries end where the next one starts, so only the last node
+        starting at or before the line can contain it.
+        """
+        i = bisect.bisect_right(starts, line) - 1
+        if i >= 0 and line <= nodes[i].line_end:
+            return nodes[i]
+        return None
+
     def _extract_program_id(self, source: str) -> str:
         """Extract PROGRAM-ID from source."""
-        import re
-        match = re.search(
-            r"PROGRAM-ID\s*[.\s]+([A-Z][A-Z0-9-]*)",
-            source,
-            re.IGNORECASE,
-        )
-        if match:
+        head = source[:self.PROGRAM_ID_HEAD].upper()
+        idx = head.find("PROGRAM-ID")
+        # Only trusted if no other division header can come before it;
+        # anything unusual takes the full search below
+        if idx >= 0 and not any(
+            head.find(word, 0, idx) >= 0
+            for word in ("ENVIRONMENT", "DATA", "PROCEDURE")
+        ):
+            match = self.PROGRAM_ID_NAME_PATTERN.match(
+                head, idx + len("PROGRAM-ID")
+            )
+            # A name running to the end of the head may be cut short
+            if match and match.end() < len(head):
+                return match.group(1)
+
+        match = self.PROGRAM_ID_PATTERN.search(source)
+        if match and match.group(1):
             return match.group(1).upper()
         return "UNKNOWN"
 
     def index_only(self, source: str) -> StructuralIndex:
         """Get structural index only (fast)."""
-        return self.indexer.index(source)
+        return self.indexer.index(source, max_workers=self.index_workers)
+
+
+# Parser of a parse_files worker process, built once by its initializer
+_worker_parser: Optional[CobolParser] = None
+
+
+def _init_worker_parser(
+    copybook_paths: list[Path],
+    use_indexer_only: bool,
+    clear_dfa_after_parse: bool,
+    antlr_max_source_mb: Optional[float],
+    index_workers: Optional[int],
+) -> None:
+    global _worker_parser
+    _worker_parser = CobolParser(
+        copybook_paths,
+        use_indexer_only=use_indexer_only,
+        clear_dfa_after_parse=clear_dfa_after_parse,
+        antlr_max_source_mb=antlr_max_source_mb,
+        index_workers=index_workers,
+    )
+
+
+def _parse_file_in_worker(path: Path) -> CobolProgram:
+    return _worker_parser.parse_file(path)
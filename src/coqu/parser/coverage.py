@@ -3,7 +3,15 @@
 Coverage analysis for COBOL parser.
 Compares parsed components against source to identify uncovered lines.
 """
+import hashlib
+import io
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from itertools import compress, count
+from operator import not_
 from pathlib import Path
 from typing import Optional
 
@@ -12,91 +20,222 @@ from coqu.parser.indexer import StructuralIndexer, StructuralIndex
 from coqu.parser.ast import CobolProgram
 
 
-@dataclass
+# Line categories tracked by CoverageResult, each in its own bitmap
+LINE_CATEGORIES = (
+    "covered",
+    "uncovered",
+    "comment",
+    "blank",
+    # Breakdown by component type
+    "division",
+    "section",
+    "paragraph",
+    "statement",
+    "data_item",
+    "id_entry",  # PROGRAM-ID, AUTHOR, etc.
+    "file_entry",  # SELECT, FD, SD
+    "copybook",  # COPY statements
+    "exec",  # EXEC SQL/CICS blocks
+)
+
+# The component categories; a line in any of them is covered
+COMPONENT_CATEGORIES = LINE_CATEGORIES[4:]
+
+# Comment lines: "*" in the indicator area (column 7), or as the first
+# non-blank character, which covers "*>" inline comments too
+COMMENT_LINE_PATTERN = re.compile(r".{6}\*|\s*\*")
+
+# Flips every byte of a 0/1 bitmap
+_INVERT = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+def _mark(bitmap: bytearray, start: int, end: int) -> None:
+    """Set lines start..end (inclusive) in a line bitmap."""
+    end = min(end, len(bitmap) - 1)
+    if start <= end:
+        bitmap[start:end + 1] = b"\x01" * (end - start + 1)
+
+
+def _line_set(category: str) -> property:
+    """Set view of one category's bitmap, built on access."""
+    def get(self) -> set[int]:
+        bitmap = getattr(self, category)
+        return set(compress(range(len(bitmap)), bitmap))
+
+    return property(get, doc=f"Line numbers in the {category} category.")
+
+
+@dataclass(slots=True)
 class CoverageResult:
-    """Result of coverage analysis."""
+    """
+    Result of coverage analysis.
+
+    Each line category is a bitmap: a bytearray indexed by line number
+    holding 1 for the lines in it. That is one byte per line rather than
+    a set entry and int object, and lets lines be marked a span at a time.
+    Bitmaps start out empty, meaning no lines, and are only allocated
+    when a line is marked (see bitmap()). The *_lines properties give
+    the categories as sets; each is a snapshot built on access, so
+    changing it doesn't change the result. Lines are marked through
+    bitmap().
+    """
     total_lines: int
-    covered_lines: set[int] = field(default_factory=set)
-    uncovered_lines: set[int] = field(default_factory=set)
-    comment_lines: set[int] = field(default_factory=set)
-    blank_lines: set[int] = field(default_factory=set)
+    covered: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    uncovered: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    comment: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    blank: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    division: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    section: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    paragraph: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    statement: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    data_item: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    id_entry: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    file_entry: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    copybook: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    exec: bytearray = field(default_factory=bytearray, init=False, repr=False)
+
+    covered_lines = _line_set("covered")
+    uncovered_lines = _line_set("uncovered")
+    comment_lines = _line_set("comment")
+    blank_lines = _line_set("blank")
+    division_lines = _line_set("division")
+    section_lines = _line_set("section")
+    paragraph_lines = _line_set("paragraph")
+    statement_lines = _line_set("statement")
+    data_item_lines = _line_set("data_item")
+    id_entry_lines = _line_set("id_entry")
+    file_entry_lines = _line_set("file_entry")
+    copybook_lines = _line_set("copybook")
+    exec_lines = _line_set("exec")
+
+    def bitmap(self, category: str) -> bytearray:
+        """Bitmap of a category for marking lines, allocated on first use."""
+        bitmap = getattr(self, category)
+        if not bitmap:
+            # Index 0 is unused: lines are numbered from 1
+            bitmap = bytearray(self.total_lines + 1)
+            setattr(self, category, bitmap)
+        return bitmap
+
+    def copy(self) -> "CoverageResult":
+        """Return an independent copy, bitmaps included."""
+        clone = CoverageResult(total_lines=self.total_lines)
+        for category in LINE_CATEGORIES:
+            setattr(clone, category, getattr(self, category).copy())
+        return clone
+
+    def count(self, category: str) -> int:
+        """Number of lines in a category."""
+        return getattr(self, category).count(1)
+
+    def ranges(self, category: str) -> list[tuple[int, int]]:
+        """
+        Runs of consecutive lines in a category.
 
-    # Breakdown by component type
-    division_lines: set[int] = field(default_factory=set)
-    section_lines: set[int] = field(default_factory=set)
-    paragraph_lines: set[int] = field(default_factory=set)
-    statement_lines: set[int] = field(default_factory=set)
-    data_item_lines: set[int] = field(default_factory=set)
-    id_entry_lines: set[int] = field(default_factory=set)  # PROGRAM-ID, AUTHOR, etc.
-    file_entry_lines: set[int] = field(default_factory=set)  # SELECT, FD, SD
-    copybook_lines: set[int] = field(default_factory=set)  # COPY statements
-    exec_lines: set[int] = field(default_factory=set)  # EXEC SQL/CICS blocks
+        Args:
+            category: One of LINE_CATEGORIES
+
+        Returns:
+            (first, last) line pairs, inclusive, in line order
+        """
+        bitmap = getattr(self, category)
+        find = bitmap.find
+        runs = []
+        start = find(1)
+        while start != -1:
+            end = find(0, start)
+            if end == -1:
+                end = len(bitmap)
+            runs.append((start, end - 1))
+            start = find(1, end)
+        return runs
+
+    def set_covered(self) -> None:
+        """Compute the covered bitmap: lines in any component category."""
+        covered = 0
+        for category in COMPONENT_CATEGORIES:
+            covered |= int.from_bytes(getattr(self, category), "little")
+        # Nothing covered (e.g. a failed parse) leaves the bitmap empty
+        self.covered = (
+            bytearray(covered.to_bytes(self.total_lines + 1, "little"))
+            if covered
+            else bytearray()
+        )
+
+    def set_uncovered(self, non_code: Optional[int] = None) -> None:
+        """
+        Compute the uncovered bitmap: code lines that aren't covered.
+
+        Args:
+            non_code: The comment and blank bitmaps OR-ed together as a
+                little-endian int, if the caller already has them so
+        """
+        # Union the excluded lines as one big int, then invert byte-wise;
+        # no all-lines mask needs building.
+        if non_code is None:
+            non_code = int.from_bytes(self.comment, "little")
+            non_code |= int.from_bytes(self.blank, "little")
+        excluded = non_code | int.from_bytes(self.covered, "little")
+        # Every line excluded (fully covered): skip the inversion and
+        # leave the bitmap empty. Each set line is one bit of the int;
+        # the unused line 0 doesn't count.
+        if excluded.bit_count() - (excluded & 1) == self.total_lines:
+            self.uncovered = bytearray()
+            return
+        size = self.total_lines + 1
+        uncovered = bytearray(excluded.to_bytes(size, "little").translate(_INVERT))
+        uncovered[0] = 0
+        self.uncovered = uncovered
 
     @property
     def code_lines(self) -> int:
         """Lines that are actual code (not comments or blank)."""
-        return self.total_lines - len(self.comment_lines) - len(self.blank_lines)
+        return self.total_lines - self.count("comment") - self.count("blank")
 
     @property
     def coverage_percent(self) -> float:
         """Coverage percentage of code lines."""
         if self.code_lines == 0:
             return 100.0
-        return (len(self.covered_lines) / self.code_lines) * 100
+        return (self.count("covered") / self.code_lines) * 100
 
     def summary(self) -> str:
         """Return a summary string."""
+        count = self.count
         lines = [
             f"Total lines: {self.total_lines}",
             f"Code lines: {self.code_lines}",
-            f"  - Comment lines: {len(self.comment_lines)}",
-            f"  - Blank lines: {len(self.blank_lines)}",
-            f"Covered lines: {len(self.covered_lines)}",
-            f"Uncovered lines: {len(self.uncovered_lines)}",
+            f"  - Comment lines: {count('comment')}",
+            f"  - Blank lines: {count('blank')}",
+            f"Covered lines: {count('covered')}",
+            f"Uncovered lines: {count('uncovered')}",
             f"Coverage: {self.coverage_percent:.1f}%",
             "",
             "Breakdown by component:",
-            f"  - Division headers: {len(self.division_lines)}",
-            f"  - Section headers: {len(self.section_lines)}",
-            f"  - Paragraph headers: {len(self.paragraph_lines)}",
-            f"  - Statements: {len(self.statement_lines)}",
-            f"  - Data items: {len(self.data_item_lines)}",
-            f"  - ID entries (PROGRAM-ID, etc.): {len(self.id_entry_lines)}",
-            f"  - File entries (SELECT, FD): {len(self.file_entry_lines)}",
-            f"  - Copybook refs: {len(self.copybook_lines)}",
-            f"  - EXEC SQL/CICS: {len(self.exec_lines)}",
+            f"  - Division headers: {count('division')}",
+            f"  - Section headers: {count('section')}",
+            f"  - Paragraph headers: {count('paragraph')}",
+            f"  - Statements: {count('statement')}",
+            f"  - Data items: {count('data_item')}",
+            f"  - ID entries (PROGRAM-ID, etc.): {count('id_entry')}",
+            f"  - File entries (SELECT, FD): {count('file_entry')}",
+            f"  - Copybook refs: {count('copybook')}",
+            f"  - EXEC SQL/CICS: {count('exec')}",
         ]
         return "\n".join(lines)
 
     def uncovered_list(self) -> str:
         """Return list of uncovered line numbers."""
-        if not self.uncovered_lines:
+        total = self.count("uncovered")
+        if not total:
             return "No uncovered lines."
 
-        sorted_lines = sorted(self.uncovered_lines)
-        # Group consecutive lines into ranges
-        ranges = []
-        start = sorted_lines[0]
-        end = start
-
-        for line in sorted_lines[1:]:
-            if line == end + 1:
-                end = line
-            else:
-                if start == end:
-                    ranges.append(str(start))
-                else:
-                    ranges.append(f"{start}-{end}")
-                start = line
-                end = line
-
-        # Add last range
-        if start == end:
-            ranges.append(str(start))
-        else:
-            ranges.append(f"{start}-{end}")
-
-        return f"Uncovered lines ({len(self.uncovered_lines)}): {', '.join(ranges)}"
+        # Consecutive lines are grouped into ranges
+        ranges = [
+            str(start) if start == end else f"{start}-{end}"
+            for start, end in self.ranges("uncovered")
+        ]
+        return f"Uncovered lines ({total}): {', '.join(ranges)}"
 
 
 class CoverageAnalyzer:
@@ -107,9 +246,33 @@ class CoverageAnalyzer:
     to identify lines not covered by any parsed component.
     """
 
-    def __init__(self):
-        self.parser = CobolParser()
+    # Results kept for re-runs on unchanged sources, per mode
+    RESULT_CACHE_SIZE = 64
+
+    # Batches smaller than this are analyzed in-process by analyze_files
+    PARALLEL_MIN_FILES = 4
+
+    def __init__(self, index_workers: Optional[int] = None):
+        """
+        Initialize analyzer.
+
+        Args:
+            index_workers: Worker processes the indexer may split the
+                statement scans of very large sources across (None keeps
+                indexing in-process)
+        """
+        self.parser = CobolParser(index_workers=index_workers)
         self.indexer = StructuralIndexer()
+        self.index_workers = index_workers
+        self._results: OrderedDict[tuple, CoverageResult] = OrderedDict()
+        # path -> (mtime_ns, size, source hash) as last read
+        self._file_hashes: dict[Path, tuple[int, int, str]] = {}
+
+    def clear_cache(self) -> None:
+        """Forget cached analysis results."""
+        self._results.clear()
+        self._file_hashes.clear()
+        self.parser.clear_program_cache()
 
     def _is_sequence_number_only(self, line: str) -> bool:
         """Check if line contains only a sequence number (mainframe format).
@@ -117,16 +280,15 @@ class CoverageAnalyzer:
         Mainframe COBOL uses columns 1-6 for sequence numbers. A line with
         only a sequence number and nothing in columns 7+ is effectively blank.
         """
-        if len(line) < 6:
-            return False
-        # Check if columns 1-6 are digits/spaces (sequence number area)
+        # Columns 1-6 must be digits/spaces (sequence number area), and
+        # columns 7+ blank or missing; isspace() tests the tail without
+        # building a stripped copy of it
         seq_area = line[:6]
-        if not seq_area.replace(' ', '').isdigit():
-            return False
-        # Check if columns 7+ are blank or don't exist
-        if len(line) <= 6:
-            return True
-        return line[6:].strip() == ''
+        return (
+            len(seq_area) == 6
+            and seq_area.replace(' ', '').isdigit()
+            and (len(line) == 6 or line[6:].isspace())
+        )
 
     def analyze_file(
         self,
@@ -143,201 +305,292 @@ class CoverageAnalyzer:
         Returns:
             Dict mapping mode name to CoverageResult
         """
-        source = path.read_text()
-        return self.analyze(source, mode)
+        # An unchanged mtime and size means the last hash still holds,
+        # so cached results are returned without reading the file
+        stat = path.stat()
+        known = self._file_hashes.get(path)
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            results = self._cached_results(known[2], mode)
+            if results is not None:
+                return results
+
+        # Hash the raw bytes and decode as read_text() would
+        data = path.read_bytes()
+        source_hash = hashlib.sha256(data, usedforsecurity=False).hexdigest()
+        self._file_hashes[path] = (stat.st_mtime_ns, stat.st_size, source_hash)
+        source = io.TextIOWrapper(io.BytesIO(data)).read()
+        return self.analyze(source, mode, source_hash=source_hash)
+
+    def analyze_files(
+        self,
+        paths: list[Path],
+        mode: str = "both",
+        max_workers: Optional[int] = None,
+    ) -> dict[Path, dict[str, CoverageResult]]:
+        """
+        Analyze coverage for many COBOL files, spread over worker processes.
+
+        Parsing and indexing hold the GIL, so a process pool is used
+        rather than threads. Worker results don't go into this
+        analyzer's cache. Small batches, or max_workers=1, are analyzed
+        in the calling process.
+
+        Args:
+            paths: Paths to COBOL source files
+            mode: "antlr", "indexer", or "both"
+            max_workers: Worker processes (defaults to the CPU count)
+
+        Returns:
+            Dict mapping each path to its mode-to-CoverageResult dict
+        """
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or len(paths) < self.PARALLEL_MIN_FILES:
+            return {path: self.analyze_file(path, mode) for path in paths}
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(paths)),
+            initializer=_init_worker_analyzer,
+            initargs=(self.index_workers,),
+        ) as pool:
+            results = pool.map(_analyze_file_in_worker, paths, [mode] * len(paths))
+            return dict(zip(paths, results))
 
     def analyze(
         self,
         source: str,
         mode: str = "both",
+        source_hash: Optional[str] = None,
     ) -> dict[str, CoverageResult]:
         """
         Analyze coverage for COBOL source.
 
+        Results are cached by source hash; callers get copies they are
+        free to modify.
+
         Args:
             source: COBOL source code
             mode: "antlr", "indexer", or "both"
+            source_hash: SHA-256 of the source, if already known
 
         Returns:
             Dict mapping mode name to CoverageResult
         """
+        if source_hash is None:
+            source_hash = hashlib.sha256(
+                source.encode(), usedforsecurity=False
+            ).hexdigest()
+        results = self._cached_results(source_hash, mode)
+        if results is not None:
+            return results
+
         results = {}
 
         # Identify comment and blank lines first
-        lines = source.split("\n")
-        comment_lines = set()
-        blank_lines = set()
-
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if not stripped:
-                blank_lines.add(i)
-            elif len(line) > 6 and line[6] == '*':
-                # Traditional COBOL comment (indicator in column 7)
-                comment_lines.add(i)
-            elif stripped.startswith('*>'):
-                # Inline comment
-                comment_lines.add(i)
-            elif stripped.startswith('*'):
-                # Free-format comment
-                comment_lines.add(i)
-            elif self._is_sequence_number_only(line):
-                # Mainframe format: line with only sequence number (columns 1-6)
-                blank_lines.add(i)
+        comment_lines, blank_lines = self._classify_lines(source)
+        total_lines = len(comment_lines) - 1
+
+        # Shared by both analyzers' uncovered-line computation
+        non_code = int.from_bytes(comment_lines, "little")
+        non_code |= int.from_bytes(blank_lines, "little")
 
         if mode in ("antlr", "both"):
-            result = self._analyze_antlr(source, lines, comment_lines, blank_lines)
+            result = self._analyze_antlr(
+                source, total_lines, comment_lines, blank_lines, non_code
+            )
             results["antlr"] = result
 
         if mode in ("indexer", "both"):
-            result = self._analyze_indexer(source, lines, comment_lines, blank_lines)
+            result = self._analyze_indexer(
+                source, total_lines, comment_lines, blank_lines, non_code
+            )
             results["indexer"] = result
 
+        for name, result in results.items():
+            self._results[(source_hash, name)] = result
+            if len(self._results) > self.RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return {name: result.copy() for name, result in results.items()}
+
+    def _classify_lines(self, source: str) -> tuple[bytearray, bytearray]:
+        """
+        Find the comment and blank lines of a source in one pre-scan.
+
+        The per-line strings it builds are dropped on return, before
+        the source is parsed or indexed.
+
+        Args:
+            source: COBOL source code
+
+        Returns:
+            (comment, blank) line bitmaps
+        """
+        lines = source.split("\n")
+        comment_lines = bytearray(len(lines) + 1)
+        blank_lines = bytearray(len(lines) + 1)
+
+        # Strip every line and mark the empty ones in bulk, at C speed;
+        # comments are marked the same way, by one compiled pattern
+        stripped_lines = list(map(str.strip, lines))
+        blank_lines[1:] = bytes(map(not_, stripped_lines))
+        comment_lines[1:] = bytes(map(bool, map(COMMENT_LINE_PATTERN.match, lines)))
+
+        # Mainframe format: line with only sequence number (columns 1-6).
+        # Only a non-blank line with at most six characters can be one.
+        for i, line, stripped in compress(
+            zip(count(1), lines, stripped_lines), stripped_lines
+        ):
+            if len(stripped) <= 6 and self._is_sequence_number_only(line):
+                blank_lines[i] = 1
+
+        return comment_lines, blank_lines
+
+    def _cached_results(
+        self,
+        source_hash: str,
+        mode: str,
+    ) -> Optional[dict[str, CoverageResult]]:
+        """Copies of the cached results for a mode, or None on a miss."""
+        names = [name for name in ("antlr", "indexer") if mode in (name, "both")]
+        results = {}
+        for name in names:
+            result = self._results.get((source_hash, name))
+            if result is None:
+                return None
+            self._results.move_to_end((source_hash, name))
+            results[name] = result.copy()
         return results
 
     def _analyze_antlr(
         self,
         source: str,
-        lines: list[str],
-        comment_lines: set[int],
-        blank_lines: set[int],
+        total_lines: int,
+        comment_lines: bytearray,
+        blank_lines: bytearray,
+        non_code: int,
     ) -> CoverageResult:
         """Analyze coverage using ANTLR parser."""
-        total_lines = len(lines)
-        result = CoverageResult(
-            total_lines=total_lines,
-            comment_lines=comment_lines.copy(),
-            blank_lines=blank_lines.copy(),
-        )
+        result = CoverageResult(total_lines=total_lines)
+        # Shared with the other mode's result: neither marks comment or
+        # blank lines, and callers only ever get copies (see analyze())
+        result.comment = comment_lines
+        result.blank = blank_lines
 
         try:
             program = self.parser.parse(source, preprocess=False)
         except Exception:
             # If parsing fails, return empty coverage
-            result.uncovered_lines = set(range(1, total_lines + 1)) - comment_lines - blank_lines
+            result.set_uncovered(non_code)
             return result
 
         # Collect covered lines from all components
         self._collect_from_program(program, result)
 
         # Calculate uncovered
-        all_lines = set(range(1, total_lines + 1))
-        code_lines = all_lines - comment_lines - blank_lines
-        result.uncovered_lines = code_lines - result.covered_lines
+        result.set_uncovered(non_code)
 
         return result
 
     def _analyze_indexer(
         self,
         source: str,
-        lines: list[str],
-        comment_lines: set[int],
-        blank_lines: set[int],
+        total_lines: int,
+        comment_lines: bytearray,
+        blank_lines: bytearray,
+        non_code: int,
     ) -> CoverageResult:
         """Analyze coverage using regex indexer."""
-        total_lines = len(lines)
-        result = CoverageResult(
-            total_lines=total_lines,
-            comment_lines=comment_lines.copy(),
-            blank_lines=blank_lines.copy(),
-        )
+        result = CoverageResult(total_lines=total_lines)
+        result.comment = comment_lines
+        result.blank = blank_lines
 
-        index = self.indexer.index(source)
+        index = self.indexer.index(source, max_workers=self.index_workers)
         self._collect_from_index(index, result)
 
         # Calculate uncovered
-        all_lines = set(range(1, total_lines + 1))
-        code_lines = all_lines - comment_lines - blank_lines
-        result.uncovered_lines = code_lines - result.covered_lines
+        result.set_uncovered(non_code)
 
         return result
 
     def _collect_from_program(self, program: CobolProgram, result: CoverageResult) -> None:
         """Collect covered lines from ANTLR-parsed program."""
+        # Each component is marked in its own category only; the covered
+        # bitmap is their union, taken once at the end. The bitmaps and
+        # the marker are bound to locals as the loops run per statement
+        # and data item.
+        mark = _mark
+        division_bm = result.bitmap("division")
+        section_bm = result.bitmap("section")
+        paragraph_bm = result.bitmap("paragraph")
+        statement_bm = result.bitmap("statement")
+        data_item_bm = result.bitmap("data_item")
+
         for div in program.divisions:
             # Division header line
-            result.division_lines.add(div.location.line_start)
-            result.covered_lines.add(div.location.line_start)
+            mark(division_bm, div.line_start, div.line_start)
 
             for section in div.sections:
                 # Section header line
-                result.section_lines.add(section.location.line_start)
-                result.covered_lines.add(section.location.line_start)
+                mark(section_bm, section.line_start, section.line_start)
 
                 # Data items in section
                 for item in section.data_items:
-                    for line in range(item.location.line_start, item.location.line_end + 1):
-                        result.data_item_lines.add(line)
-                        result.covered_lines.add(line)
+                    mark(data_item_bm, item.line_start, item.line_end)
 
                 # Paragraphs in section
                 for para in section.paragraphs:
-                    result.paragraph_lines.add(para.location.line_start)
-                    result.covered_lines.add(para.location.line_start)
+                    mark(paragraph_bm, para.line_start, para.line_start)
 
                     # Statements in paragraph
                     for stmt in para.statements:
-                        for line in range(stmt.location.line_start, stmt.location.line_end + 1):
-                            result.statement_lines.add(line)
-                            result.covered_lines.add(line)
+                        mark(statement_bm, stmt.line_start, stmt.line_end)
 
             # Top-level paragraphs in division
             for para in div.paragraphs:
-                result.paragraph_lines.add(para.location.line_start)
-                result.covered_lines.add(para.location.line_start)
+                mark(paragraph_bm, para.line_start, para.line_start)
 
                 for stmt in para.statements:
-                    for line in range(stmt.location.line_start, stmt.location.line_end + 1):
-                        result.statement_lines.add(line)
-                        result.covered_lines.add(line)
+                    mark(statement_bm, stmt.line_start, stmt.line_end)
+
+        result.set_covered()
 
     def _collect_from_index(self, index: StructuralIndex, result: CoverageResult) -> None:
         """Collect covered lines from indexed structure."""
-        # Divisions
-        for div in index.divisions:
-            result.division_lines.add(div.line_start)
-            result.covered_lines.add(div.line_start)
-
-        # Sections
-        for sec in index.sections:
-            result.section_lines.add(sec.line_start)
-            result.covered_lines.add(sec.line_start)
-
-        # Paragraphs
-        for para in index.paragraphs:
-            result.paragraph_lines.add(para.line_start)
-            result.covered_lines.add(para.line_start)
-
-        # Data items (all levels)
-        for item in index.data_items_all:
-            result.data_item_lines.add(item.line_start)
-            result.covered_lines.add(item.line_start)
-
-        # Statements
-        for stmt in index.statements:
-            result.statement_lines.add(stmt.line_start)
-            result.covered_lines.add(stmt.line_start)
-
-        # IDENTIFICATION DIVISION entries (PROGRAM-ID, AUTHOR, etc.)
-        for entry in index.id_division_entries:
-            result.id_entry_lines.add(entry.line_start)
-            result.covered_lines.add(entry.line_start)
-
-        # FILE-CONTROL entries (SELECT, FD, SD)
-        for entry in index.file_entries:
-            result.file_entry_lines.add(entry.line_start)
-            result.covered_lines.add(entry.line_start)
-
-        # Copybook references
-        for entry in index.copybooks:
-            result.copybook_lines.add(entry.line_start)
-            result.covered_lines.add(entry.line_start)
+        # As for the parsed program, covered is the union of the rest
+        mark = _mark
+
+        # Single-line entries, by the category they count towards:
+        # divisions, sections, paragraphs, data items (all levels),
+        # IDENTIFICATION DIVISION entries (PROGRAM-ID, AUTHOR, etc.),
+        # FILE-CONTROL entries (SELECT, FD, SD) and copybook references.
+        # Categories with no entries are left unallocated.
+        for entries, category in (
+            (index.divisions, "division"),
+            (index.sections, "section"),
+            (index.paragraphs, "paragraph"),
+            (index.data_items_all, "data_item"),
+            (index.id_division_entries, "id_entry"),
+            (index.file_entries, "file_entry"),
+            (index.copybooks, "copybook"),
+        ):
+            if not entries:
+                continue
+            bitmap = result.bitmap(category)
+            for entry in entries:
+                mark(bitmap, entry.line_start, entry.line_start)
+
+        # Statements, stored column-wise: mark their line starts directly
+        if index.statements:
+            bitmap = result.bitmap("statement")
+            for line in index.statements.line_starts:
+                mark(bitmap, line, line)
 
         # EXEC SQL/CICS blocks (multi-line)
-        for stmt in index.exec_statements:
-            for line in range(stmt.line_start, stmt.line_end + 1):
-                result.exec_lines.add(line)
-                result.covered_lines.add(line)
+        if index.exec_statements:
+            exec_bm = result.bitmap("exec")
+            for stmt in index.exec_statements:
+                mark(exec_bm, stmt.line_start, stmt.line_end)
+
+        result.set_covered()
 
 
 def analyze_coverage(
@@ -356,3 +609,16 @@ def analyze_coverage(
     """
     analyzer = CoverageAnalyzer()
     return analyzer.analyze_file(path, mode)
+
+
+# Analyzer of an analyze_files worker process, built once by its initializer
+_worker_analyzer: Optional[CoverageAnalyzer] = None
+
+
+def _init_worker_analyzer(index_workers: Optional[int]) -> None:
+    global _worker_analyzer
+    _worker_analyzer = CoverageAnalyzer(index_workers)
+
+
+def _analyze_file_in_worker(path: Path, mode: str) -> dict[str, CoverageResult]:
+    return _worker_analyzer.analyze_file(path, mode)
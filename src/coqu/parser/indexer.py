@@ -4,12 +4,20 @@ Fast regex-based structural indexer for large COBOL files.
 This provides quick navigation without full ANTLR parsing.
 """
 import bisect
+import mmap
 import re
+import string
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Optional
+from functools import partial
+from itertools import islice, repeat
+from operator import add, attrgetter, itemgetter
+from types import SimpleNamespace
+from typing import Optional, Union
 
 
-@dataclass
+@dataclass(slots=True)
 class IndexEntry:
     """Entry in the structural index."""
     name: str
@@ -21,7 +29,7 @@ class IndexEntry:
         return f"{self.type}: {self.name} (lines {self.line_start}-{self.line_end})"
 
 
-@dataclass
+@dataclass(slots=True)
 class StatementEntry:
     """Statement entry in the structural index."""
     type: str  # MOVE, CALL, PERFORM, IF, etc.
@@ -33,6 +41,41 @@ class StatementEntry:
         return f"{self.type} at line {self.line_start}"
 
 
+@dataclass(slots=True)
+class StatementTable:
+    """
+    Statement entries stored column-wise.
+
+    A large program has hundreds of thousands of statements; one list per
+    field, with line numbers in machine-int arrays, takes a fraction of
+    the memory of one object per statement. Indexing and iteration give
+    StatementEntry views built on demand; changing a view doesn't change
+    the table.
+    """
+    types: list[str] = field(default_factory=list)
+    line_starts: array = field(default_factory=lambda: array("l"))
+    line_ends: array = field(default_factory=lambda: array("l"))
+    paragraphs: list[str] = field(default_factory=list)
+
+    def append(self, entry: StatementEntry) -> None:
+        """Add an entry at the end."""
+        self.types.append(entry.type)
+        self.line_starts.append(entry.line_start)
+        self.line_ends.append(entry.line_end)
+        self.paragraphs.append(entry.paragraph)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, i: int) -> StatementEntry:
+        return StatementEntry(
+            self.types[i], self.line_starts[i], self.line_ends[i], self.paragraphs[i],
+        )
+
+    def __iter__(self):
+        return map(StatementEntry, self.types, self.line_starts, self.line_ends, self.paragraphs)
+
+
 @dataclass
 class StructuralIndex:
     """Fast structural index of a COBOL program."""
@@ -42,12 +85,23 @@ class StructuralIndex:
     copybooks: list[IndexEntry] = field(default_factory=list)
     data_items_01: list[IndexEntry] = field(default_factory=list)
     data_items_all: list[IndexEntry] = field(default_factory=list)  # All levels
-    statements: list[StatementEntry] = field(default_factory=list)
+    statements: StatementTable = field(default_factory=StatementTable)
     id_division_entries: list[IndexEntry] = field(default_factory=list)  # PROGRAM-ID, AUTHOR, etc.
     file_entries: list[IndexEntry] = field(default_factory=list)  # SELECT, FD, SD
     exec_statements: list[StatementEntry] = field(default_factory=list)  # EXEC SQL/CICS blocks
     total_lines: int = 0
 
+    # Name lookup per entry type, keyed by upper-cased name and filled on
+    # first use. The index isn't modified once built; call
+    # clear_lookup_cache() if it is.
+    _name_index: dict[str, dict[str, IndexEntry]] = field(
+        default_factory=dict, init=False, repr=False, compare=False,
+    )
+
+    def clear_lookup_cache(self) -> None:
+        """Forget cached name lookups after modifying the index."""
+        self._name_index.clear()
+
     def get_division_names(self) -> list[str]:
         """Get list of division names."""
         return [d.name for d in self.divisions]
@@ -62,19 +116,60 @@ class StructuralIndex:
 
     def get_entry(self, name: str, entry_type: str) -> Optional[IndexEntry]:
         """Get entry by name and type."""
-        name_upper = name.upper()
-        entries = {
-            "division": self.divisions,
-            "section": self.sections,
-            "paragraph": self.paragraphs,
-            "copybook": self.copybooks,
-            "data_item": self.data_items_01,
-        }.get(entry_type, [])
+        names = self._name_index.get(entry_type)
+        if names is None:
+            entries = {
+                "division": self.divisions,
+                "section": self.sections,
+                "paragraph": self.paragraphs,
+                "copybook": self.copybooks,
+                "data_item": self.data_items_01,
+            }.get(entry_type, [])
+            # First entry wins for duplicate names, as in a linear scan
+            names = {}
+            for entry in entries:
+                names.setdefault(entry.name.upper(), entry)
+            self._name_index[entry_type] = names
+        return names.get(name.upper())
+
+
+def _keyword_alternatives(keywords: dict[str, str]) -> str:
+    """Alternation of keywords, each in a group named after it ("_" for "-")."""
+    return "|".join(
+        f"(?P<{name.replace('-', '_')}>{keyword})"
+        for name, keyword in keywords.items()
+    )
 
-        for entry in entries:
-            if entry.name.upper() == name_upper:
-                return entry
-        return None
+
+def _keyword_pattern(lead: str, keywords: dict[str, str]) -> re.Pattern:
+    """Compile one pattern matching any of the keywords starting a line."""
+    return re.compile(
+        lead + "(?:" + _keyword_alternatives(keywords) + ")",
+        re.MULTILINE,
+    )
+
+
+# Upper-cases ASCII letters only, one character for one
+_ASCII_UPPER = str.maketrans(string.ascii_lowercase, string.ascii_uppercase)
+
+# Slice of a buffer source upper-cased at a time
+_UPPER_CHUNK = 1 << 20
+
+
+def _upper_buffer(buffer: Union[memoryview, mmap.mmap]) -> bytearray:
+    """
+    Upper-case a buffer, such as an mmap of a file.
+
+    The result is the only full-size copy made: the buffer is read a
+    slice at a time rather than first copied whole into bytes.
+    """
+    view = memoryview(buffer)
+    size = view.nbytes
+    upper = bytearray(size)
+    for start in range(0, size, _UPPER_CHUNK):
+        end = start + _UPPER_CHUNK
+        upper[start:end] = view[start:end].tobytes().upper()
+    return upper
 
 
 class StructuralIndexer:
@@ -94,6 +189,10 @@ class StructuralIndexer:
     # 4. Mixed: any combination
     #
     # The PREFIX is intentionally flexible to handle various source control outputs
+    #
+    # COBOL is case-insensitive. index() matches the patterns against the
+    # upper-cased source, so they're written in upper case and compiled
+    # without IGNORECASE, letting the regex engine compare literals as is
 
     # Prefix pattern matches:
     # - 6 digits (sequence numbers): "000100"
@@ -103,221 +202,286 @@ class StructuralIndexer:
     # - No prefix at all (code starts at column 1)
     # Key: version number is SHORT (1-6 chars with dots) followed by optional A/B and REQUIRED space(s)
     # The space after the prefix is mandatory - this distinguishes prefix from code
-    PREFIX = r"^(?:[\d.]{1,6}[A-B]?\s+|[\s]{6,8})?"
-
-    # Division pattern: "IDENTIFICATION DIVISION" or "ID DIVISION", etc.
-    DIVISION_PATTERN = re.compile(
-        PREFIX + r"\s*(IDENTIFICATION|ID|ENVIRONMENT|DATA|PROCEDURE)\s+DIVISION",
-        re.IGNORECASE | re.MULTILINE,
-    )
-
-    # Section pattern: "WORKING-STORAGE SECTION", "INPUT-OUTPUT SECTION", etc.
-    SECTION_PATTERN = re.compile(
-        PREFIX + r"\s*([A-Z0-9][A-Z0-9-]*)\s+SECTION\s*\.?",
-        re.IGNORECASE | re.MULTILINE,
+    #
+    # A line start is matched as the newline before it rather than a
+    # MULTILINE "^": index() scans the source with a newline prepended, and
+    # a literal lead lets the regex engine jump from newline to newline
+    # instead of trying the whole pattern at every character
+    PREFIX = r"\n(?:[\d.]{1,6}[A-B]?\s+|[\s]{6,8})?"
+
+    # PREFIX and the whitespace up to the code, as "PREFIX + \s*" (LEAD)
+    # and "PREFIX + \s+" (INDENTED_LEAD) but spelled so a whitespace run
+    # can be split only one way. Written plainly, each split is tried
+    # against the code pattern in turn before a line is given up; here a
+    # failed match backs off through the run one cheap (?=\S) at a time
+    LEAD = r"\n(?:[\d.]{1,6}[A-B]?\s)?\s*(?=\S)"
+    INDENTED_LEAD = r"\n(?:[\d.]{1,6}[A-B]?\s\s+|\s+)(?=\S)"
+
+    # Divisions, sections and COPY statements, found in one pass over the
+    # source; the named group that matched tells which it is:
+    # - division: "IDENTIFICATION DIVISION" or "ID DIVISION", etc.
+    # - section: "WORKING-STORAGE SECTION", "INPUT-OUTPUT SECTION", etc.
+    # - copybook: COPY statement, can appear anywhere in Area B
+    # Nothing is matched after SECTION, so the scan never runs into the
+    # next line and skips an entry starting there.
+    STRUCTURE_PATTERN = re.compile(
+        LEAD + r"(?:"
+        r"(?P<division>IDENTIFICATION|ID|ENVIRONMENT|DATA|PROCEDURE)\s+DIVISION"
+        r"|(?P<section>[A-Z0-9][A-Z0-9-]*)\s+SECTION"
+        r"|COPY\s+['\"]?(?P<copybook>[A-Z][A-Z0-9-]*)['\"]?"
+        r")",
     )
 
     # Paragraph pattern: paragraph name in Area A followed by period
     # Must be at column 8 (after 6-digit sequence + indicator)
     # Paragraph names start with letter or digit, contain letters, digits, hyphens
+    # The name is taken whole through a lookahead and back-reference, as
+    # re has no atomic groups: a shorter name can't be followed by the
+    # period, so retrying each one on every non-paragraph line is wasted
     PARAGRAPH_PATTERN = re.compile(
-        PREFIX + r"([A-Z0-9][A-Z0-9-]{0,29})\s*\.\s*$",
-        re.IGNORECASE | re.MULTILINE,
+        PREFIX + r"(?=([A-Z0-9][A-Z0-9-]{0,29}))\1\s*\.\s*$",
+        re.MULTILINE,
     )
 
-    # COPY statement - can appear anywhere in Area B
-    COPY_PATTERN = re.compile(
-        PREFIX + r"\s*COPY\s+['\"]?([A-Z][A-Z0-9-]*)['\"]?",
-        re.IGNORECASE | re.MULTILINE,
-    )
-
-    # Statement patterns for PROCEDURE DIVISION
-    # These match the beginning of common COBOL statements
-    STATEMENT_PATTERNS = {
-        "MOVE": re.compile(PREFIX + r"\s+MOVE\s+", re.IGNORECASE | re.MULTILINE),
-        "PERFORM": re.compile(PREFIX + r"\s+PERFORM\s+", re.IGNORECASE | re.MULTILINE),
-        "CALL": re.compile(PREFIX + r"\s+CALL\s+", re.IGNORECASE | re.MULTILINE),
-        "IF": re.compile(PREFIX + r"\s+IF\s+", re.IGNORECASE | re.MULTILINE),
-        "EVALUATE": re.compile(PREFIX + r"\s+EVALUATE\s+", re.IGNORECASE | re.MULTILINE),
-        "READ": re.compile(PREFIX + r"\s+READ\s+", re.IGNORECASE | re.MULTILINE),
-        "WRITE": re.compile(PREFIX + r"\s+WRITE\s+", re.IGNORECASE | re.MULTILINE),
-        "OPEN": re.compile(PREFIX + r"\s+OPEN\s+", re.IGNORECASE | re.MULTILINE),
-        "CLOSE": re.compile(PREFIX + r"\s+CLOSE\s+", re.IGNORECASE | re.MULTILINE),
-        "DISPLAY": re.compile(PREFIX + r"\s+DISPLAY\s+", re.IGNORECASE | re.MULTILINE),
-        "ACCEPT": re.compile(PREFIX + r"\s+ACCEPT\s+", re.IGNORECASE | re.MULTILINE),
-        "COMPUTE": re.compile(PREFIX + r"\s+COMPUTE\s+", re.IGNORECASE | re.MULTILINE),
-        "ADD": re.compile(PREFIX + r"\s+ADD\s+", re.IGNORECASE | re.MULTILINE),
-        "SUBTRACT": re.compile(PREFIX + r"\s+SUBTRACT\s+", re.IGNORECASE | re.MULTILINE),
-        "MULTIPLY": re.compile(PREFIX + r"\s+MULTIPLY\s+", re.IGNORECASE | re.MULTILINE),
-        "DIVIDE": re.compile(PREFIX + r"\s+DIVIDE\s+", re.IGNORECASE | re.MULTILINE),
-        "STRING": re.compile(PREFIX + r"\s+STRING\s+", re.IGNORECASE | re.MULTILINE),
-        "UNSTRING": re.compile(PREFIX + r"\s+UNSTRING\s+", re.IGNORECASE | re.MULTILINE),
-        "INSPECT": re.compile(PREFIX + r"\s+INSPECT\s+", re.IGNORECASE | re.MULTILINE),
-        "INITIALIZE": re.compile(PREFIX + r"\s+INITIALIZE\s+", re.IGNORECASE | re.MULTILINE),
-        "SET": re.compile(PREFIX + r"\s+SET\s+", re.IGNORECASE | re.MULTILINE),
-        "STOP": re.compile(PREFIX + r"\s+STOP\s+", re.IGNORECASE | re.MULTILINE),
-        "GO": re.compile(PREFIX + r"\s+GO\s+TO\s+", re.IGNORECASE | re.MULTILINE),
-        "EXIT": re.compile(PREFIX + r"\s+EXIT\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "CONTINUE": re.compile(PREFIX + r"\s+CONTINUE\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "RETURN": re.compile(PREFIX + r"\s+RETURN\s+", re.IGNORECASE | re.MULTILINE),
-        "SEARCH": re.compile(PREFIX + r"\s+SEARCH\s+", re.IGNORECASE | re.MULTILINE),
-        "SORT": re.compile(PREFIX + r"\s+SORT\s+", re.IGNORECASE | re.MULTILINE),
-        "MERGE": re.compile(PREFIX + r"\s+MERGE\s+", re.IGNORECASE | re.MULTILINE),
-        "START": re.compile(PREFIX + r"\s+START\s+", re.IGNORECASE | re.MULTILINE),
-        "DELETE": re.compile(PREFIX + r"\s+DELETE\s+", re.IGNORECASE | re.MULTILINE),
-        "REWRITE": re.compile(PREFIX + r"\s+REWRITE\s+", re.IGNORECASE | re.MULTILINE),
+    # Statement keywords for PROCEDURE DIVISION
+    # These match the beginning of common COBOL statements. What must
+    # follow a keyword is only looked ahead at, so a match never runs
+    # into the next line and hides a statement starting there.
+    STATEMENT_KEYWORDS = {
+        "MOVE": r"MOVE(?=\s)",
+        "PERFORM": r"PERFORM(?=\s)",
+        "CALL": r"CALL(?=\s)",
+        "IF": r"IF(?=\s)",
+        "EVALUATE": r"EVALUATE(?=\s)",
+        "READ": r"READ(?=\s)",
+        "WRITE": r"WRITE(?=\s)",
+        "OPEN": r"OPEN(?=\s)",
+        "CLOSE": r"CLOSE(?=\s)",
+        "DISPLAY": r"DISPLAY(?=\s)",
+        "ACCEPT": r"ACCEPT(?=\s)",
+        "COMPUTE": r"COMPUTE(?=\s)",
+        "ADD": r"ADD(?=\s)",
+        "SUBTRACT": r"SUBTRACT(?=\s)",
+        "MULTIPLY": r"MULTIPLY(?=\s)",
+        "DIVIDE": r"DIVIDE(?=\s)",
+        "STRING": r"STRING(?=\s)",
+        "UNSTRING": r"UNSTRING(?=\s)",
+        "INSPECT": r"INSPECT(?=\s)",
+        "INITIALIZE": r"INITIALIZE(?=\s)",
+        "SET": r"SET(?=\s)",
+        "STOP": r"STOP(?=\s)",
+        "GO": r"GO\s+TO(?=\s)",
+        "EXIT": r"EXIT",
+        "CONTINUE": r"CONTINUE",
+        "RETURN": r"RETURN(?=\s)",
+        "SEARCH": r"SEARCH(?=\s)",
+        "SORT": r"SORT(?=\s)",
+        "MERGE": r"MERGE(?=\s)",
+        "START": r"START(?=\s)",
+        "DELETE": r"DELETE(?=\s)",
+        "REWRITE": r"REWRITE(?=\s)",
     }
 
-    # Level 01 data items
-    LEVEL_01_PATTERN = re.compile(
-        PREFIX + r"\s*01\s+([A-Z][A-Z0-9-]*)",
-        re.IGNORECASE | re.MULTILINE,
-    )
-
-    # All data item levels (01-49, 66, 77, 88)
+    # All data item levels (01-49, 66, 77, 88); level-01 items are
+    # picked out of the same scan
     DATA_ITEM_PATTERN = re.compile(
-        PREFIX + r"\s*(0[1-9]|[1-4][0-9]|66|77|88)\s+([A-Z][A-Z0-9-]*|FILLER)",
-        re.IGNORECASE | re.MULTILINE,
+        LEAD + r"(0[1-9]|[1-4][0-9]|66|77|88)\s+([A-Z][A-Z0-9-]*|FILLER)",
     )
 
-    # IDENTIFICATION DIVISION content
-    PROGRAM_ID_PATTERN = re.compile(
-        PREFIX + r"\s*PROGRAM-ID\s*[.\s]+([A-Z][A-Z0-9-]*)",
-        re.IGNORECASE | re.MULTILINE,
-    )
-    AUTHOR_PATTERN = re.compile(
-        PREFIX + r"\s*AUTHOR\s*[.\s]+",
-        re.IGNORECASE | re.MULTILINE,
-    )
-    DATE_WRITTEN_PATTERN = re.compile(
-        PREFIX + r"\s*DATE-WRITTEN\s*[.\s]+",
-        re.IGNORECASE | re.MULTILINE,
-    )
-    DATE_COMPILED_PATTERN = re.compile(
-        PREFIX + r"\s*DATE-COMPILED\s*[.\s]+",
-        re.IGNORECASE | re.MULTILINE,
+    # IDENTIFICATION DIVISION content, found in one pass; what follows
+    # each keyword is only looked at, as for statements, so a match
+    # never runs into the next line and hides an entry starting there
+    ID_ENTRY_KEYWORDS = {
+        "PROGRAM-ID": r"PROGRAM-ID(?=[.\s]+[A-Z])",
+        "AUTHOR": r"AUTHOR(?=[.\s])",
+        "DATE-WRITTEN": r"DATE-WRITTEN(?=[.\s])",
+        "DATE-COMPILED": r"DATE-COMPILED(?=[.\s])",
+    }
+    ID_ENTRY_PATTERN = re.compile(
+        LEAD + r"(?:" + _keyword_alternatives(ID_ENTRY_KEYWORDS) + r")",
     )
 
-    # FILE-CONTROL patterns
-    FILE_CONTROL_PATTERN = re.compile(
-        PREFIX + r"\s*FILE-CONTROL\s*\.?",
-        re.IGNORECASE | re.MULTILINE,
-    )
-    SELECT_PATTERN = re.compile(
-        PREFIX + r"\s*SELECT\s+([A-Z][A-Z0-9-]*)",
-        re.IGNORECASE | re.MULTILINE,
-    )
-    FD_PATTERN = re.compile(
-        PREFIX + r"\s*FD\s+([A-Z][A-Z0-9-]*)",
-        re.IGNORECASE | re.MULTILINE,
-    )
-    SD_PATTERN = re.compile(
-        PREFIX + r"\s*SD\s+([A-Z][A-Z0-9-]*)",
-        re.IGNORECASE | re.MULTILINE,
-    )
+    # FILE-CONTROL paragraph and file entries (SELECT, FD, SD); the
+    # file name is captured in a lookahead, so, as for statements, a
+    # match ends with its keyword
+    FILE_ENTRY_KEYWORDS = {
+        "FILE-CONTROL": r"FILE-CONTROL",
+        "SELECT": r"SELECT(?=\s+([A-Z][A-Z0-9-]*))",
+        "FD": r"FD(?=\s+([A-Z][A-Z0-9-]*))",
+        "SD": r"SD(?=\s+([A-Z][A-Z0-9-]*))",
+    }
 
     # SELECT clause continuations
-    SELECT_CLAUSE_PATTERNS = {
-        "ORGANIZATION": re.compile(PREFIX + r"\s+ORGANIZATION\s+", re.IGNORECASE | re.MULTILINE),
-        "ACCESS": re.compile(PREFIX + r"\s+ACCESS\s+MODE\s+", re.IGNORECASE | re.MULTILINE),
-        "RECORD-KEY": re.compile(PREFIX + r"\s+RECORD\s+KEY\s+", re.IGNORECASE | re.MULTILINE),
-        "ALTERNATE-KEY": re.compile(PREFIX + r"\s+ALTERNATE\s+RECORD\s+KEY\s+", re.IGNORECASE | re.MULTILINE),
-        "FILE-STATUS": re.compile(PREFIX + r"\s+FILE\s+STATUS\s+", re.IGNORECASE | re.MULTILINE),
-        "ASSIGN": re.compile(PREFIX + r"\s+ASSIGN\s+", re.IGNORECASE | re.MULTILINE),
-        "RELATIVE-KEY": re.compile(PREFIX + r"\s+RELATIVE\s+KEY\s+", re.IGNORECASE | re.MULTILINE),
+    SELECT_CLAUSE_KEYWORDS = {
+        "ORGANIZATION": r"ORGANIZATION(?=\s)",
+        "ACCESS": r"ACCESS\s+MODE(?=\s)",
+        "RECORD-KEY": r"RECORD\s+KEY(?=\s)",
+        "ALTERNATE-KEY": r"ALTERNATE\s+RECORD\s+KEY(?=\s)",
+        "FILE-STATUS": r"FILE\s+STATUS(?=\s)",
+        "ASSIGN": r"ASSIGN(?=\s)",
+        "RELATIVE-KEY": r"RELATIVE\s+KEY(?=\s)",
     }
 
+    # Both of the above in one pass; entries may follow the prefix
+    # directly, clauses are indented past it
+    FILE_CONTROL_PATTERN = re.compile(
+        r"(?:" + LEAD + r"(?:" + _keyword_alternatives(FILE_ENTRY_KEYWORDS) + r")"
+        r"|" + INDENTED_LEAD + r"(?:" + _keyword_alternatives(SELECT_CLAUSE_KEYWORDS) + r"))",
+    )
+
     # Statement terminators and continuations
-    END_STATEMENT_PATTERNS = {
-        "END-IF": re.compile(PREFIX + r"\s+END-IF\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-READ": re.compile(PREFIX + r"\s+END-READ\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-WRITE": re.compile(PREFIX + r"\s+END-WRITE\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-PERFORM": re.compile(PREFIX + r"\s+END-PERFORM\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-EVALUATE": re.compile(PREFIX + r"\s+END-EVALUATE\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-CALL": re.compile(PREFIX + r"\s+END-CALL\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-SEARCH": re.compile(PREFIX + r"\s+END-SEARCH\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-STRING": re.compile(PREFIX + r"\s+END-STRING\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-UNSTRING": re.compile(PREFIX + r"\s+END-UNSTRING\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-COMPUTE": re.compile(PREFIX + r"\s+END-COMPUTE\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-ADD": re.compile(PREFIX + r"\s+END-ADD\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-SUBTRACT": re.compile(PREFIX + r"\s+END-SUBTRACT\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-MULTIPLY": re.compile(PREFIX + r"\s+END-MULTIPLY\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "END-DIVIDE": re.compile(PREFIX + r"\s+END-DIVIDE\s*\.?", re.IGNORECASE | re.MULTILINE),
-        "AT-END": re.compile(PREFIX + r"\s+AT\s+END\s+", re.IGNORECASE | re.MULTILINE),
-        "NOT-AT-END": re.compile(PREFIX + r"\s+NOT\s+AT\s+END\s+", re.IGNORECASE | re.MULTILINE),
-        "INVALID-KEY": re.compile(PREFIX + r"\s+INVALID\s+KEY\s+", re.IGNORECASE | re.MULTILINE),
-        "NOT-INVALID-KEY": re.compile(PREFIX + r"\s+NOT\s+INVALID\s+KEY\s+", re.IGNORECASE | re.MULTILINE),
-        "WHEN": re.compile(PREFIX + r"\s+WHEN\s+", re.IGNORECASE | re.MULTILINE),
-        "ELSE": re.compile(PREFIX + r"\s+ELSE\s*$", re.IGNORECASE | re.MULTILINE),
-        "THEN": re.compile(PREFIX + r"\s+THEN\s*$", re.IGNORECASE | re.MULTILINE),
+    END_STATEMENT_KEYWORDS = {
+        "END-IF": r"END-IF",
+        "END-READ": r"END-READ",
+        "END-WRITE": r"END-WRITE",
+        "END-PERFORM": r"END-PERFORM",
+        "END-EVALUATE": r"END-EVALUATE",
+        "END-CALL": r"END-CALL",
+        "END-SEARCH": r"END-SEARCH",
+        "END-STRING": r"END-STRING",
+        "END-UNSTRING": r"END-UNSTRING",
+        "END-COMPUTE": r"END-COMPUTE",
+        "END-ADD": r"END-ADD",
+        "END-SUBTRACT": r"END-SUBTRACT",
+        "END-MULTIPLY": r"END-MULTIPLY",
+        "END-DIVIDE": r"END-DIVIDE",
+        "AT-END": r"AT\s+END(?=\s)",
+        "NOT-AT-END": r"NOT\s+AT\s+END(?=\s)",
+        "INVALID-KEY": r"INVALID\s+KEY(?=\s)",
+        "NOT-INVALID-KEY": r"NOT\s+INVALID\s+KEY(?=\s)",
+        "WHEN": r"WHEN(?=\s)",
+        "ELSE": r"ELSE(?=\s*$)",
+        "THEN": r"THEN(?=\s*$)",
     }
 
+    # Each keyword set is scanned for in one pass; the named group that
+    # matched is the keyword's name, with "_" for "-"
+    STATEMENT_PATTERN = _keyword_pattern(INDENTED_LEAD, STATEMENT_KEYWORDS)
+    END_STATEMENT_PATTERN = _keyword_pattern(INDENTED_LEAD, END_STATEMENT_KEYWORDS)
+
+    # Line breaks, for the line offset index
+    NEWLINE_PATTERN = re.compile(r"\n")
+
     # EXEC SQL/CICS blocks (multi-line)
     EXEC_PATTERN = re.compile(
-        r"^\d{0,6}\s+(EXEC\s+(?:SQL|CICS).*?END-EXEC)",
-        re.IGNORECASE | re.MULTILINE | re.DOTALL
+        r"\n\d{0,6}\s+(EXEC\s+(?:SQL|CICS).*?END-EXEC)",
+        re.DOTALL
     )
 
-    def index(self, source: str) -> StructuralIndex:
+    # Sources shorter than this scan their statements in-process: starting
+    # workers and shipping the source to them costs more than the scan
+    PARALLEL_MIN_LINES = 100_000
+
+    def index(
+        self,
+        source: Union[str, bytes, memoryview, mmap.mmap],
+        max_workers: Optional[int] = None,
+    ) -> StructuralIndex:
         """
         Create structural index from COBOL source.
 
+        The source may also be raw bytes, such as an mmap of a file, in
+        which case it's scanned with no decoding. Line numbers don't
+        depend on the encoding; only the ASCII names are decoded. As for
+        text, the scans run on an upper-cased copy of the source; a
+        buffer is upper-cased straight into it, not copied beforehand.
+
+        With max_workers above 1, the statement scans of large sources,
+        the bulk of the work, are split across that many worker processes
+        at paragraph boundaries. Otherwise, and for small sources, they
+        run in the calling process.
+
         Args:
-            source: COBOL source code as string
+            source: COBOL source code as string or bytes
+            max_workers: Worker processes for the statement scans (None
+                scans in-process)
 
         Returns:
             StructuralIndex with divisions, sections, paragraphs, etc.
         """
+        # Bytes sources are scanned with the bytes twins of the patterns;
+        # literals are encoded to match and captured names decoded
+        upper_cased = False
+        if isinstance(source, str):
+            patterns, encode, decode = self, str, str
+        else:
+            patterns, encode, decode = _BYTES_PATTERNS, str.encode, bytes.decode
+            if not isinstance(source, bytes):
+                # Newlines are at the same offsets in the upper-cased
+                # copy, so it stands in for the buffer from here on
+                source, upper_cased = _upper_buffer(source), True
+        newline = encode("\n")
+
         # Normalize line endings (Windows CRLF -> LF)
-        if "\r" in source:
-            source = source.replace("\r\n", "\n").replace("\r", "\n")
+        if encode("\r") in source:
+            source = source.replace(encode("\r\n"), newline).replace(encode("\r"), newline)
 
         index = StructuralIndex()
 
+        # The patterns are matched against the upper-cased source, whose
+        # offsets must be those of the source. A few non-ASCII letters
+        # upper-case to more than one character (ß to SS); if any occur,
+        # only ASCII letters are upper-cased. (bytes.upper() only ever
+        # touches ASCII letters.)
+        #
+        # Scans for a fixed keyword are skipped when the keyword doesn't
+        # occur anywhere in the source; a substring search is far
+        # cheaper than a regex pass that can't match.
+        if upper_cased:
+            upper_source = source
+        else:
+            upper_source = source.upper()
+            if len(upper_source) != len(source):
+                upper_source = source.translate(_ASCII_UPPER)
+
+        # The patterns match a line start as the newline before it, so scan
+        # with one prepended for the first line. A match's start() is then
+        # its line's offset in source; group offsets are one past theirs
+        text = newline + upper_source
+
         # Build line offset index for O(1) line number lookup
-        # This is the key optimization - build once, use many times
-        line_offsets = [0]
-        pos = 0
-        while True:
-            pos = source.find("\n", pos)
-            if pos == -1:
-                break
-            pos += 1
-            line_offsets.append(pos)
+        # This is the key optimization - build once, use many times.
+        # Each line after the first starts where a newline match ends;
+        # collecting those in C beats a find() call per line
+        line_offsets = [0, *map(re.Match.end, patterns.NEWLINE_PATTERN.finditer(source))]
         index.total_lines = len(line_offsets)
 
-        def get_line_num(char_pos: int) -> int:
-            """Binary search for line number - O(log n) instead of O(n)."""
-            return bisect.bisect_right(line_offsets, char_pos)
+        # Binary search for line number - O(log n) instead of O(n). A
+        # partial stays a C call, so it can be mapped over many offsets
+        # without a Python frame per offset
+        get_line_num = partial(bisect.bisect_right, line_offsets)
 
         def get_line_num_skip_newline(char_pos: int) -> int:
             """Get line number, skipping past any leading newline character."""
             # If position is at a newline, move to next character
-            if char_pos < len(source) and source[char_pos] == '\n':
+            if source.startswith(newline, char_pos):
                 char_pos += 1
             return bisect.bisect_right(line_offsets, char_pos)
 
-        # Index divisions (typically only 4, fast)
-        for match in self.DIVISION_PATTERN.finditer(source):
-            # Use capture group position for accurate line number
-            line_num = get_line_num(match.start(1))
-            div_name = match.group(1).upper()
-            index.divisions.append(IndexEntry(
-                name=f"{div_name} DIVISION",
-                type="division",
-                line_start=line_num,
-            ))
-
-        # Index sections
-        for match in self.SECTION_PATTERN.finditer(source):
+        # Index divisions, sections and COPY statements in one scan
+        for match in patterns.STRUCTURE_PATTERN.finditer(text):
+            kind = match.lastgroup
             # Use capture group position for accurate line number
-            line_num = get_line_num(match.start(1))
-            section_name = match.group(1).upper()
-            index.sections.append(IndexEntry(
-                name=f"{section_name} SECTION",
-                type="section",
-                line_start=line_num,
-            ))
+            line_num = get_line_num(match.start(kind) - 1)
+            name = decode(match.group(kind))
+            if kind == "division":
+                index.divisions.append(IndexEntry(
+                    name=f"{name} DIVISION",
+                    type="division",
+                    line_start=line_num,
+                ))
+            elif kind == "section":
+                index.sections.append(IndexEntry(
+                    name=f"{name} SECTION",
+                    type="section",
+                    line_start=line_num,
+                ))
+            else:
+                index.copybooks.append(IndexEntry(
+                    name=name,
+                    type="copybook",
+                    line_start=line_num,
+                ))
 
         # Index paragraphs (only in PROCEDURE DIVISION)
         proc_div_start = 0
@@ -331,10 +495,10 @@ class StructuralIndexer:
                 break
 
         if proc_div_start > 0:
-            # Search only in PROCEDURE DIVISION portion
-            proc_source = source[proc_div_offset:]
-            for match in self.PARAGRAPH_PATTERN.finditer(proc_source):
-                para_name = match.group(1).upper()
+            # Search only in PROCEDURE DIVISION portion; text[proc_div_offset]
+            # is the newline ending the line before it
+            for match in patterns.PARAGRAPH_PATTERN.finditer(text, proc_div_offset):
+                para_name = decode(match.group(1))
 
                 # Skip if it looks like a section
                 if "SECTION" in para_name:
@@ -345,176 +509,149 @@ class StructuralIndexer:
                     continue
 
                 # Calculate actual line number using capture group position
-                line_num = get_line_num(proc_div_offset + match.start(1))
+                line_num = get_line_num(match.start(1) - 1)
                 index.paragraphs.append(IndexEntry(
                     name=para_name,
                     type="paragraph",
                     line_start=line_num,
                 ))
 
-        # Index COPY statements
-        for match in self.COPY_PATTERN.finditer(source):
-            # Use capture group position
-            line_num = get_line_num(match.start(1))
-            copybook_name = match.group(1).upper()
-            index.copybooks.append(IndexEntry(
-                name=copybook_name,
-                type="copybook",
-                line_start=line_num,
-            ))
-
-        # Index level-01 data items
-        for match in self.LEVEL_01_PATTERN.finditer(source):
-            # Use capture group position
-            line_num = get_line_num(match.start(1))
-            item_name = match.group(1).upper()
-            index.data_items_01.append(IndexEntry(
-                name=item_name,
-                type="data_item",
-                line_start=line_num,
-            ))
-
-        # Index ALL data items (all levels: 01-49, 66, 77, 88)
-        for match in self.DATA_ITEM_PATTERN.finditer(source):
+        # Index ALL data items (all levels: 01-49, 66, 77, 88), and the
+        # level-01 ones by name too
+        for match in patterns.DATA_ITEM_PATTERN.finditer(text):
             # Use capture group position
-            line_num = get_line_num(match.start(1))
-            level = match.group(1)
-            item_name = match.group(2).upper()
+            line_num = get_line_num(match.start(1) - 1)
+            level = decode(match.group(1))
+            item_name = decode(match.group(2))
             index.data_items_all.append(IndexEntry(
                 name=f"{level} {item_name}",
                 type="data_item",
                 line_start=line_num,
             ))
+            if level == "01":
+                # Placed on the name's line, which may follow the level's
+                index.data_items_01.append(IndexEntry(
+                    name=item_name,
+                    type="data_item",
+                    line_start=get_line_num(match.start(2) - 1),
+                ))
 
-        # Index IDENTIFICATION DIVISION entries
-        for pattern, entry_type in [
-            (self.PROGRAM_ID_PATTERN, "PROGRAM-ID"),
-            (self.AUTHOR_PATTERN, "AUTHOR"),
-            (self.DATE_WRITTEN_PATTERN, "DATE-WRITTEN"),
-            (self.DATE_COMPILED_PATTERN, "DATE-COMPILED"),
-        ]:
-            for match in pattern.finditer(source):
-                # Use skip_newline to handle MULTILINE ^ edge cases
+        # Index IDENTIFICATION DIVISION entries, collected by kind and
+        # listed in ID_ENTRY_KEYWORDS order
+        found_ids: dict[str, list[IndexEntry]] = {name: [] for name in self.ID_ENTRY_KEYWORDS}
+        if any(encode(name) in upper_source for name in found_ids):
+            for match in patterns.ID_ENTRY_PATTERN.finditer(text):
+                # Use skip_newline to handle lines continued past a blank one
                 line_num = get_line_num_skip_newline(match.start())
-                index.id_division_entries.append(IndexEntry(
+                entry_type = match.lastgroup.replace("_", "-")
+                found_ids[entry_type].append(IndexEntry(
                     name=entry_type,
                     type="id_entry",
                     line_start=line_num,
                 ))
-
-        # Index FILE-CONTROL paragraph
-        for match in self.FILE_CONTROL_PATTERN.finditer(source):
-            line_num = get_line_num_skip_newline(match.start())
-            index.file_entries.append(IndexEntry(
-                name="FILE-CONTROL",
-                type="file_entry",
-                line_start=line_num,
-            ))
-
-        # Index FILE-CONTROL entries (SELECT, FD, SD)
-        for pattern, entry_type in [
-            (self.SELECT_PATTERN, "SELECT"),
-            (self.FD_PATTERN, "FD"),
-            (self.SD_PATTERN, "SD"),
-        ]:
-            for match in pattern.finditer(source):
-                # Use skip_newline to handle MULTILINE ^ edge cases
+        for entries in found_ids.values():
+            index.id_division_entries.extend(entries)
+
+        # Index the FILE-CONTROL paragraph, its entries (SELECT, FD, SD)
+        # and SELECT clause continuations (ORGANIZATION, ACCESS MODE,
+        # etc.), collected by kind and listed in that order
+        found: dict[str, list[IndexEntry]] = {
+            name: [] for name in (*self.FILE_ENTRY_KEYWORDS, *self.SELECT_CLAUSE_KEYWORDS)
+        }
+        # Keyword prefilter on each kind's first word (FILE, SELECT, ...)
+        if any(encode(name.split("-")[0]) in upper_source for name in found):
+            for match in patterns.FILE_CONTROL_PATTERN.finditer(text):
+                # Use skip_newline to handle lines continued past a blank one
                 line_num = get_line_num_skip_newline(match.start())
-                name = match.group(1).upper() if match.lastindex else entry_type
-                index.file_entries.append(IndexEntry(
-                    name=f"{entry_type} {name}",
-                    type="file_entry",
-                    line_start=line_num,
-                ))
-
-        # Index SELECT clause continuations (ORGANIZATION, ACCESS MODE, etc.)
-        for clause_type, pattern in self.SELECT_CLAUSE_PATTERNS.items():
-            for match in pattern.finditer(source):
-                line_num = get_line_num_skip_newline(match.start())
-                index.file_entries.append(IndexEntry(
-                    name=clause_type,
-                    type="file_clause",
+                kind = match.lastgroup.replace("_", "-")
+                if kind == "FILE-CONTROL":
+                    name = kind
+                    entry_type = "file_entry"
+                elif kind in self.FILE_ENTRY_KEYWORDS:
+                    # The file name is the group right after the kind's
+                    name = f"{kind} {decode(match.group(match.lastindex + 1))}"
+                    entry_type = "file_entry"
+                else:
+                    name = kind
+                    entry_type = "file_clause"
+                found[kind].append(IndexEntry(
+                    name=name,
+                    type=entry_type,
                     line_start=line_num,
                 ))
+        for entries in found.values():
+            index.file_entries.extend(entries)
 
         # Post-process: calculate line_end for each entry
         self._calculate_line_ends(index)
 
+        # Sorted paragraph starts for containment lookup: the containing
+        # paragraph is the last one starting at or before a line
+        para_starts = sorted(
+            [(p.line_start, p.name) for p in index.paragraphs],
+            key=lambda x: x[0]
+        )
+        para_lines = [line for line, _ in para_starts]
+        # Indexed by the number of paragraphs starting at or before a line
+        para_names = ["", *(name for _, name in para_starts)]
+        para_count = partial(bisect.bisect_right, para_lines)
+
+        def get_containing_para(line_num: int) -> str:
+            """Binary search for the containing paragraph name."""
+            return para_names[para_count(line_num)]
+
         # Index statements (only in PROCEDURE DIVISION)
         if proc_div_start > 0:
-            proc_source = source[proc_div_offset:]
-            # Build sorted list of paragraph starts for containment lookup
-            para_starts = sorted(
-                [(p.line_start, p.name) for p in index.paragraphs],
-                key=lambda x: x[0]
+            workers = max_workers or 1
+            if workers <= 1 or index.total_lines < self.PARALLEL_MIN_LINES:
+                found_statements = _scan_statements(text, proc_div_offset, len(text))
+            else:
+                found_statements = self._scan_statements_parallel(
+                    text, proc_div_offset, line_offsets, para_lines, workers,
+                )
+
+            # Main statements, then statement terminators and continuations
+            # (END-IF, AT END, etc.)
+            starts = [start for matches in found_statements for start, _, _ in matches]
+            kinds = [kind for matches in found_statements for _, _, kind in matches]
+
+            # Line numbers of all matches at once, mapped in C. As in
+            # get_line_num_skip_newline, a match starting on a blank line
+            # belongs to the line after it
+            starts = map(add, starts, map(source.startswith, repeat(newline), starts))
+            rows = sorted(zip(map(get_line_num, starts), kinds), key=itemgetter(0))
+
+            # Statements are single-line entries, filled in column by column
+            line_nums = array("l", map(itemgetter(0), rows))
+            index.statements = StatementTable(
+                types=list(map(itemgetter(1), rows)),
+                line_starts=line_nums,
+                line_ends=array("l", line_nums),
+                paragraphs=list(map(para_names.__getitem__, map(para_count, line_nums))),
             )
 
-            # Index main statements
-            for stmt_type, pattern in self.STATEMENT_PATTERNS.items():
-                for match in pattern.finditer(proc_source):
-                    line_num = get_line_num_skip_newline(proc_div_offset + match.start())
-
-                    # Find containing paragraph
-                    containing_para = ""
-                    for para_line, para_name in reversed(para_starts):
-                        if para_line <= line_num:
-                            containing_para = para_name
-                            break
-
-                    index.statements.append(StatementEntry(
-                        type=stmt_type,
-                        line_start=line_num,
-                        line_end=line_num,
-                        paragraph=containing_para,
-                    ))
-
-            # Index statement terminators and continuations (END-IF, AT END, etc.)
-            for stmt_type, pattern in self.END_STATEMENT_PATTERNS.items():
-                for match in pattern.finditer(proc_source):
-                    line_num = get_line_num_skip_newline(proc_div_offset + match.start())
-
-                    # Find containing paragraph
-                    containing_para = ""
-                    for para_line, para_name in reversed(para_starts):
-                        if para_line <= line_num:
-                            containing_para = para_name
-                            break
-
-                    index.statements.append(StatementEntry(
-                        type=stmt_type,
-                        line_start=line_num,
-                        line_end=line_num,
-                        paragraph=containing_para,
-                    ))
-
-            # Sort statements by line number
-            index.statements.sort(key=lambda s: s.line_start)
-
         # Index EXEC SQL/CICS blocks (multi-line) - search entire source
         # These can appear in DATA DIVISION (EXEC SQL INCLUDE) or PROCEDURE DIVISION
-        for match in self.EXEC_PATTERN.finditer(source):
+        if encode("EXEC") not in upper_source:
+            matches = ()
+        else:
+            matches = patterns.EXEC_PATTERN.finditer(text)
+        for match in matches:
             exec_text = match.group(1)
-            start_pos = match.start(1)
-            end_pos = match.end(1)
+            start_pos = match.start(1) - 1
+            end_pos = match.end(1) - 1
             line_start = get_line_num_skip_newline(start_pos)
             line_end = bisect.bisect_right(line_offsets, end_pos - 1)
 
             # Determine EXEC type (SQL or CICS)
-            exec_type = "EXEC-SQL" if "SQL" in exec_text.upper()[:15] else "EXEC-CICS"
-
-            # Find containing paragraph (if in PROCEDURE DIVISION)
-            containing_para = ""
-            for para in index.paragraphs:
-                if para.line_start <= line_start:
-                    containing_para = para.name
-                else:
-                    break
+            exec_type = "EXEC-SQL" if encode("SQL") in exec_text[:15] else "EXEC-CICS"
 
             index.exec_statements.append(StatementEntry(
                 type=exec_type,
                 line_start=line_start,
                 line_end=line_end,
-                paragraph=containing_para,
+                # Containing paragraph (if in PROCEDURE DIVISION)
+                paragraph=get_containing_para(line_start),
             ))
 
         # Sort EXEC statements by line number
@@ -522,48 +659,78 @@ class StructuralIndexer:
 
         return index
 
+    def _scan_statements_parallel(
+        self,
+        text: Union[str, bytes],
+        start: int,
+        line_offsets: list[int],
+        para_lines: list[int],
+        workers: int,
+    ) -> tuple[list[tuple[int, int, str]], list[tuple[int, int, str]]]:
+        """
+        Scan the PROCEDURE DIVISION for statements in worker processes.
+
+        The division is cut at paragraph starts into a few regions per
+        worker, each scanned like _scan_statements. A match may run from
+        one region over blank lines into the next, so matches starting
+        inside the previous one are dropped when the regions are joined.
+        """
+        # Region bounds: the newline in text leading each chosen paragraph
+        first_line = bisect.bisect_right(line_offsets, start)
+        region_lines = max(1, (len(line_offsets) - first_line) // (4 * workers))
+        bounds = [start]
+        next_line = first_line + region_lines
+        for line in para_lines:
+            if line >= next_line:
+                bounds.append(line_offsets[line - 1])
+                next_line = line + region_lines
+        bounds.append(len(text))
+        regions = list(zip(bounds, bounds[1:]))
+        if len(regions) == 1:
+            return _scan_statements(text, start, len(text))
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(regions)),
+            initializer=_init_worker_text,
+            initargs=(text,),
+        ) as pool:
+            results = list(pool.map(_scan_statements_in_worker, regions))
+
+        joined = ([], [])
+        for i, matches in enumerate(joined):
+            last_end = -1
+            for result in results:
+                for match in result[i]:
+                    if match[0] >= last_end:
+                        matches.append(match)
+                        last_end = match[1]
+        return joined
+
     def _calculate_line_ends(self, index: StructuralIndex) -> None:
         """Calculate line_end for each entry based on next entry start."""
         total = index.total_lines
 
         # Sort divisions by line and calculate ends
         if index.divisions:
-            sorted_divs = sorted(index.divisions, key=lambda x: x.line_start)
-            for i, div in enumerate(sorted_divs):
-                if i + 1 < len(sorted_divs):
-                    div.line_end = sorted_divs[i + 1].line_start - 1
-                else:
-                    div.line_end = total
+            self._chain_line_ends(index.divisions).line_end = total
 
         # Sort sections by line and calculate ends
         if index.sections:
-            sorted_secs = sorted(index.sections, key=lambda x: x.line_start)
-            for i, sec in enumerate(sorted_secs):
-                if i + 1 < len(sorted_secs):
-                    sec.line_end = sorted_secs[i + 1].line_start - 1
-                else:
-                    # Find the end of containing division
-                    for div in index.divisions:
-                        if div.line_start <= sec.line_start <= div.line_end:
-                            sec.line_end = div.line_end
-                            break
-                    else:
-                        sec.line_end = total
+            last = self._chain_line_ends(index.sections)
+            # Find the end of containing division
+            last.line_end = next(
+                (div.line_end for div in index.divisions
+                 if div.line_start <= last.line_start <= div.line_end),
+                total,
+            )
 
         # Sort paragraphs by line and calculate ends
         if index.paragraphs:
-            sorted_paras = sorted(index.paragraphs, key=lambda x: x.line_start)
-            for i, para in enumerate(sorted_paras):
-                if i + 1 < len(sorted_paras):
-                    para.line_end = sorted_paras[i + 1].line_start - 1
-                else:
-                    # Find the end of PROCEDURE DIVISION
-                    for div in index.divisions:
-                        if "PROCEDURE" in div.name:
-                            para.line_end = div.line_end
-                            break
-                    else:
-                        para.line_end = total
+            # Find the end of PROCEDURE DIVISION
+            self._chain_line_ends(index.paragraphs).line_end = next(
+                (div.line_end for div in index.divisions if "PROCEDURE" in div.name),
+                total,
+            )
 
         # Copybooks and data items are single-line entries for now
         for entry in index.copybooks:
@@ -572,8 +739,71 @@ class StructuralIndexer:
         for entry in index.data_items_01:
             entry.line_end = entry.line_start
 
+    @staticmethod
+    def _chain_line_ends(entries: list[IndexEntry]) -> IndexEntry:
+        """
+        End each entry on the line before the next one starts, in line order.
+
+        Returns the last entry, whose line_end is left to the caller.
+        """
+        ordered = sorted(entries, key=attrgetter("line_start"))
+        for entry, following in zip(ordered, islice(ordered, 1, None)):
+            entry.line_end = following.line_start - 1
+        return ordered[-1]
+
+
+def _bytes_pattern(pattern: re.Pattern) -> re.Pattern:
+    """Compile a pattern again for scanning bytes; its source is ASCII."""
+    return re.compile(pattern.pattern.encode("ascii"), pattern.flags & ~re.UNICODE)
+
+
+# The scan patterns compiled for bytes sources, under the same names. In
+# bytes patterns \s and \d are ASCII only, which COBOL source is
+_BYTES_PATTERNS = SimpleNamespace(**{
+    name: _bytes_pattern(value)
+    for name, value in vars(StructuralIndexer).items()
+    if name.endswith("_PATTERN")
+})
+
 
 def index_source(source: str) -> StructuralIndex:
     """Convenience function to index COBOL source."""
     indexer = StructuralIndexer()
     return indexer.index(source)
+
+
+def _scan_statements(
+    text: Union[str, bytes], start: int, end: int,
+) -> tuple[list[tuple[int, int, str]], list[tuple[int, int, str]]]:
+    """
+    Find the statements and statement terminators starting in text[start:end].
+
+    Returns (start, end, type) per match, one list per pattern. A match
+    may run past end; its start is what places it in the range.
+    """
+    patterns = StructuralIndexer if isinstance(text, str) else _BYTES_PATTERNS
+    found = ([], [])
+    for pattern, matches in zip(
+        (patterns.STATEMENT_PATTERN, patterns.END_STATEMENT_PATTERN),
+        found,
+    ):
+        for match in pattern.finditer(text, start):
+            if match.start() >= end:
+                break
+            matches.append((match.start(), match.end(), match.lastgroup.replace("_", "-")))
+    return found
+
+
+# Text scanned by a statement-scan worker process, set by its initializer
+_worker_text: Union[str, bytes] = ""
+
+
+def _init_worker_text(text: str) -> None:
+    """Process pool initializer: keep the text to scan for this worker."""
+    global _worker_text
+    _worker_text = text
+
+
+def _scan_statements_in_worker(region: tuple[int, int]) -> tuple[list, list]:
+    """Process pool task: scan one region of the worker's text."""
+    return _scan_statements(_worker_text, *region)
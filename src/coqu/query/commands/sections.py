@@ -43,8 +43,8 @@ class SectionsCommand(Command):
                 sections.append({
                     "name": section.name,
                     "division": div.name,
-                    "line_start": section.location.line_start,
-                    "line_end": section.location.line_end,
+                    "line_start": section.line_start,
+                    "line_end": section.line_end,
                 })
 
         return QueryResult(items=sections)
@@ -98,8 +98,8 @@ class SectionCommand(Command):
         result = {
             "name": target_section.name,
             "division": parent_division.name,
-            "line_start": target_section.location.line_start,
-            "line_end": target_section.location.line_end,
+            "line_start": target_section.line_start,
+            "line_end": target_section.line_end,
             "paragraphs": [p.name for p in target_section.paragraphs],
             "data_items": [d.name for d in target_section.data_items],
         }
@@ -142,8 +142,8 @@ class ProcedureSectionsCommand(Command):
         for section in sections:
             items.append({
                 "name": section.name,
-                "line_start": section.location.line_start,
-                "line_end": section.location.line_end,
+                "line_start": section.line_start,
+                "line_end": section.line_end,
                 "paragraph_count": len(section.paragraphs),
             })
 
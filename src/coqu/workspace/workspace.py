@@ -90,46 +90,65 @@ class Workspace:
             spinner = Spinner(f"Loading {path.name}").start()
 
         try:
-            # Read source for hash calculation
-            source = path.read_text()
-            import hashlib
-            source_hash = hashlib.sha256(source.encode()).hexdigest()
-
-            # Try cache first
+            # Hash the file bytes for the cache key (no need to decode)
+            source_hash = None
             program: Optional[CobolProgram] = None
-            from_cache = False
-
-            if self.cache_manager and not force_reparse:
-                program = self.cache_manager.get(source_hash)
-                if program:
-                    from_cache = True
-
-            # Parse if not cached
-            parse_time_ms = 0.0
-            if not program:
-                start = time.perf_counter()
-                program = self._parser.parse_file(path)
-                parse_time_ms = (time.perf_counter() - start) * 1000
-
-                # Cache the result
-                if self.cache_manager:
-                    self.cache_manager.put(source_hash, program)
-
-            # Create loaded program
-            loaded = LoadedProgram(
-                name=name,
-                path=path,
-                program=program,
-                from_cache=from_cache,
-                parse_time_ms=parse_time_ms,
-            )
-
-            self.programs[name] = loaded
-            return loaded
+            if self.cache_manager:
+                source_hash = self.cache_manager.hash_source(path)
+
+                # Try cache first
+                if not force_reparse:
+                    program = self.cache_manager.get(source_hash)
+
+            return self._add_program(path, name, source_hash, program)
         finally:
             if spinner:
                 spinner.stop()
 
+    def _add_program(
+        self,
+        path: Path,
+        name: str,
+        source_hash: Optional[str],
+        program: Optional[CobolProgram],
+    ) -> LoadedProgram:
+        """
+        Register a program, parsing and caching it if it wasn't cached.
+
+        Args:
+            path: Resolved path to COBOL source file
+            name: Program name (upper-cased filename stem)
+            source_hash: Cache key, or None without a cache manager
+            program: Cached program, or None to parse the file
+
+        Returns:
+            LoadedProgram instance
+        """
+        from_cache = program is not None
+
+        # Parse if not cached
+        parse_time_ms = 0.0
+        if not from_cache:
+            start = time.perf_counter()
+            program = self._parser.parse_file(path)
+            parse_time_ms = (time.perf_counter() - start) * 1000
+
+            # Cache the result
+            if self.cache_manager:
+                self.cache_manager.put(source_hash, program)
+
+        # Create loaded program
+        loaded = LoadedProgram(
+            name=name,
+            path=path,
+            program=program,
+            from_cache=from_cache,
+            parse_time_ms=parse_time_ms,
+        )
+
+        self.programs[name] = loaded
+        return loaded
+
     def load_directory(
         self,
         directory: Path,
@@ -154,13 +173,36 @@ class Workspace:
         else:
             files = directory.glob(pattern)
 
-        for path in files:
-            if path.is_file():
+        paths = [path.resolve() for path in files if path.is_file()]
+
+        # Look up the whole directory in the cache in one batch
+        hashes: dict[Path, str] = {}
+        cached: dict[str, CobolProgram] = {}
+        if self.cache_manager:
+            for path in paths:
                 try:
-                    prog = self.load(path)
-                    loaded.append(prog)
-                except Exception:
-                    pass  # Skip files that fail to parse
+                    hashes[path] = self.cache_manager.hash_source(path)
+                except OSError:
+                    pass  # Unreadable, skipped below
+            cached = self.cache_manager.get_many(hashes.values())
+
+        for path in paths:
+            name = path.stem.upper()
+            existing = self.programs.get(name)
+            if existing is not None and existing.path == path:
+                loaded.append(existing)
+                continue
+
+            source_hash = hashes.get(path)
+            if self.cache_manager and source_hash is None:
+                continue
+            try:
+                prog = self._add_program(
+                    path, name, source_hash, cached.get(source_hash)
+                )
+                loaded.append(prog)
+            except Exception:
+                pass  # Skip files that fail to parse
 
         return loaded
 
@@ -2,11 +2,15 @@
 """
 Tests for the COBOL parser.
 """
+import mmap
+import tempfile
+
 import pytest
 from pathlib import Path
 
 from coqu.parser import CobolParser, StructuralIndexer
 from coqu.parser.ast import CobolProgram
+from coqu.parser.coverage import CoverageAnalyzer, CoverageResult, _mark
 
 
 # Fixture paths
@@ -52,6 +56,18 @@ class TestStructuralIndexer:
         assert "1000-INIT-PARA" in para_names
         assert "2100-VALIDATE" in para_names
 
+    def test_get_entry(self):
+        """Test entries are looked up by type and case-insensitive name."""
+        source = SAMPLE_CBL.read_text()
+        index = StructuralIndexer().index(source)
+
+        para = index.get_entry("1000-init-para", "paragraph")
+        assert para is not None
+        assert para.name == "1000-INIT-PARA"
+        assert index.get_entry("1000-INIT-PARA", "section") is None
+        assert index.get_entry("NO-SUCH-PARA", "paragraph") is None
+        assert index.get_entry("1000-INIT-PARA", "unknown") is None
+
     def test_index_copybooks(self):
         """Test that indexer finds COPY statements."""
         source = SAMPLE_CBL.read_text()
@@ -71,6 +87,126 @@ class TestStructuralIndexer:
         assert "WS-VARIABLES" in item_names
         assert "WS-CONSTANTS" in item_names
 
+        # Entries are created per item and statement; no __dict__ each
+        assert not hasattr(index.data_items_01[0], "__dict__")
+
+    def test_index_consecutive_sections(self):
+        """Test a section header right after another one is found."""
+        source = (
+            "       PROCEDURE DIVISION.\n"
+            "       A-SECTION SECTION\n"
+            "       B-SECTION SECTION.\n"
+            "       COPY PROCS.\n"
+        )
+        index = StructuralIndexer().index(source)
+
+        assert index.get_section_names() == ["A-SECTION SECTION", "B-SECTION SECTION"]
+        assert [c.line_start for c in index.copybooks] == [4]
+
+    def test_index_statements(self):
+        """Test statements and terminators are found on every line."""
+        source = (
+            "       PROCEDURE DIVISION.\n"
+            "       MAIN-PARA.\n"
+            "           IF X > 1\n"
+            "               MOVE\n"
+            "               MOVE 2 TO Y\n"
+            "           ELSE\n"
+            "               CONTINUE\n"
+            "           END-IF\n"
+            "           GO TO MAIN-PARA.\n"
+        )
+        index = StructuralIndexer().index(source)
+
+        assert [(s.type, s.line_start) for s in index.statements] == [
+            ("IF", 3),
+            ("MOVE", 4),
+            ("MOVE", 5),
+            ("ELSE", 6),
+            ("CONTINUE", 7),
+            ("END-IF", 8),
+            ("GO", 9),
+        ]
+        assert {s.paragraph for s in index.statements} == {"MAIN-PARA"}
+
+    def test_index_id_entries(self):
+        """Test IDENTIFICATION DIVISION entries on consecutive lines are all found."""
+        source = (
+            "       IDENTIFICATION DIVISION.\n"
+            "       PROGRAM-ID. TESTPROG.\n"
+            "       AUTHOR.\n"
+            "       DATE-WRITTEN.\n"
+            "       DATE-COMPILED.\n"
+        )
+        index = StructuralIndexer().index(source)
+
+        assert [(e.name, e.line_start) for e in index.id_division_entries] == [
+            ("PROGRAM-ID", 2),
+            ("AUTHOR", 3),
+            ("DATE-WRITTEN", 4),
+            ("DATE-COMPILED", 5),
+        ]
+
+    def test_index_file_entries(self):
+        """Test FILE-CONTROL entries and SELECT clauses are found."""
+        source = (
+            "       FILE-CONTROL.\n"
+            "           SELECT CUST-FILE\n"
+            "               ASSIGN TO CUSTDD\n"
+            "               FILE STATUS IS WS-FS.\n"
+            "       FD  CUST-FILE.\n"
+        )
+        index = StructuralIndexer().index(source)
+
+        assert [(e.name, e.type, e.line_start) for e in index.file_entries] == [
+            ("FILE-CONTROL", "file_entry", 1),
+            ("SELECT CUST-FILE", "file_entry", 2),
+            ("FD CUST-FILE", "file_entry", 5),
+            ("FILE-STATUS", "file_clause", 4),
+            ("ASSIGN", "file_clause", 3),
+        ]
+
+    def test_index_lowercase_source(self):
+        """Test lowercase and mixed-case source is indexed as upper case."""
+        source = (
+            "       procedure division.\n"
+            "       main-para.\n"
+            "           Move 1 to ws-a.\n"
+            "           stop run.\n"
+        )
+        index = StructuralIndexer().index(source)
+
+        assert index.get_division_names() == ["PROCEDURE DIVISION"]
+        assert index.get_paragraph_names() == ["MAIN-PARA"]
+        assert [(s.type, s.line_start) for s in index.statements] == [
+            ("MOVE", 3), ("STOP", 4),
+        ]
+
+    def test_index_bytes_source(self):
+        """Test bytes and mmap sources index like the decoded text."""
+        expected = StructuralIndexer().index(SAMPLE_CBL.read_text())
+
+        with open(SAMPLE_CBL, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            index = StructuralIndexer().index(mm)
+
+        assert index == expected
+
+        # Other buffers too, upper-cased and with CRLF line endings
+        source = SAMPLE_CBL.read_text().lower().replace("\n", "\r\n")
+        index = StructuralIndexer().index(memoryview(source.encode()))
+        assert index == StructuralIndexer().index(source)
+
+    def test_index_statements_parallel(self):
+        """Test statements scanned in worker processes match an in-process scan."""
+        source = SAMPLE_CBL.read_text()
+        indexer = StructuralIndexer()
+        indexer.PARALLEL_MIN_LINES = 0
+
+        serial = indexer.index(source, max_workers=1)
+        parallel = indexer.index(source, max_workers=2)
+
+        assert parallel.statements == serial.statements
+
 
 class TestMainframeFormat:
     """Tests for mainframe-format COBOL with sequence numbers."""
@@ -141,6 +277,108 @@ class TestCobolParser:
         assert program.lines > 0
         assert len(program.divisions) == 4
 
+        # The hash is the cache key for the file
+        from coqu.cache import CacheManager
+        assert program.source_hash == CacheManager.hash_source(SAMPLE_CBL)
+
+    def test_parse_cache(self):
+        """Test re-parsing an unchanged source reuses the earlier result."""
+        parser = CobolParser(use_indexer_only=True)
+        first = parser.parse_file(SAMPLE_CBL)
+        second = parser.parse_file(SAMPLE_CBL)
+
+        assert second is not first
+        assert second.divisions is first.divisions
+        assert second.to_dict() == first.to_dict()
+
+        parser.clear_program_cache()
+        assert parser.parse_file(SAMPLE_CBL).divisions is not first.divisions
+
+        # The copybook expansion is reused even when the program isn't
+        uncached = CobolParser(
+            copybook_paths=[FIXTURES_DIR], use_indexer_only=True, program_cache_size=0,
+        )
+        refs = uncached.parse_file(SAMPLE_CBL).copybook_refs
+        assert uncached.parse_file(SAMPLE_CBL).copybook_refs is refs
+        uncached.add_copybook_path(FIXTURES_DIR.parent)
+        assert uncached.parse_file(SAMPLE_CBL).copybook_refs is not refs
+
+        uncached = CobolParser(use_indexer_only=True, program_cache_size=0)
+        assert (
+            uncached.parse_file(SAMPLE_CBL).divisions
+            is not uncached.parse_file(SAMPLE_CBL).divisions
+        )
+
+    def test_parse_files(self):
+        """Test batch parsing matches per-file parsing, in order."""
+        parser = CobolParser(copybook_paths=[FIXTURES_DIR], use_indexer_only=True)
+        paths = [SAMPLE_CBL, CALLER_CBL, MAINFRAME_CBL, SAMPLE_CBL]
+        expected = [parser.parse_file(path).to_dict() for path in paths]
+
+        for workers in (1, 2):
+            programs = parser.parse_files(paths, max_workers=workers)
+            assert [p.to_dict() for p in programs] == expected
+        assert parser.parse_files([]) == []
+
+    def test_antlr_failure_remembered(self):
+        """Test a source that fails the ANTLR parse isn't retried."""
+        parser = CobolParser(program_cache_size=0)
+        first = parser.parse_file(SAMPLE_CBL)
+        assert len(parser._antlr_failures) == 1
+
+        # Served by the indexer without another ANTLR attempt
+        second = parser.parse_file(SAMPLE_CBL)
+        assert len(parser._antlr_failures) == 1
+        assert second.to_dict() == first.to_dict()
+
+    def test_clear_antlr_caches(self):
+        """Test the shared ANTLR prediction caches can be dropped."""
+        from coqu.parser.generated import Cobol85Lexer, Cobol85Parser
+
+        parser = CobolParser(program_cache_size=0, clear_dfa_after_parse=True)
+        parser.parse_file(CALLER_CBL)
+
+        for recognizer in (Cobol85Lexer, Cobol85Parser):
+            assert not any(dfa._states for dfa in recognizer.decisionsToDFA)
+        assert not Cobol85Parser.sharedContextCache.cache
+
+        # Parsing still works from cold caches
+        program = CobolParser(program_cache_size=0).parse_file(CALLER_CBL)
+        assert program.program_id == "CALLER"
+
+    def test_antlr_performs_and_calls(self):
+        """Test PERFORM and CALL targets come from the parse tree."""
+        source = (
+            "       IDENTIFICATION DIVISION.\n"
+            "       PROGRAM-ID. PC.\n"
+            "       PROCEDURE DIVISION.\n"
+            "       MAIN-PARA.\n"
+            "           PERFORM INIT-PARA\n"
+            "           PERFORM PROC-A THRU PROC-EXIT\n"
+            "           PERFORM 3 TIMES\n"
+            "               CALL 'SUBPROG1'\n"
+            "           END-PERFORM\n"
+            "           CALL WS-PROG\n"
+            "           STOP RUN.\n"
+        )
+        parser = CobolParser(program_cache_size=0)
+        program = parser.parse(source)
+        assert not parser._antlr_failures
+
+        para = program.get_paragraph("MAIN-PARA")
+        assert para.performs == ["INIT-PARA", "PROC-A", "PROC-EXIT"]
+        assert para.calls == ["SUBPROG1", "WS-PROG"]
+
+    def test_large_source_skips_antlr(self):
+        """Test sources over the size limit are only indexed."""
+        parser = CobolParser(program_cache_size=0, antlr_max_source_mb=0.001)
+        program = parser.parse_file(SAMPLE_CBL)
+
+        # No ANTLR attempt, so nothing remembered as failing it
+        assert not parser._antlr_failures
+        assert program.program_id == "SAMPLE"
+        assert len(program.divisions) == 4
+
     def test_parse_with_copybook_path(self):
         """Test parsing with copybook resolution."""
         parser = CobolParser(
@@ -170,6 +408,33 @@ class TestCobolParser:
         program = parser.parse_file(CALLER_CBL)
         assert program.program_id == "CALLER"
 
+        # Only the IDENTIFICATION DIVISION is searched
+        program = parser.parse(
+            "       DATA DIVISION.\n"
+            "       PROCEDURE DIVISION.\n"
+            "           DISPLAY 'PROGRAM-ID. BOGUS'.\n"
+        )
+        assert program.program_id == "UNKNOWN"
+
+        # Found past the fast-path head of the source, in any case
+        program = parser.parse(
+            "      *" + "-" * 4096 + "\n"
+            "       identification division.\n"
+            "       program-id. late-id.\n"
+        )
+        assert program.program_id == "LATE-ID"
+
+        # Division headers in comment banners don't end the search
+        program = parser.parse(
+            "      *****************************************\n"
+            "      * PROCEDURE DIVISION CHANGES: SEE BELOW\n"
+            "      /    ENVIRONMENT DIVISION NOTES\n"
+            "       *> DATA DIVISION LAYOUT IS IN THE COPYBOOK\n"
+            "       IDENTIFICATION DIVISION.\n"
+            "       PROGRAM-ID. BANNER.\n"
+        )
+        assert program.program_id == "BANNER"
+
     def test_get_division(self):
         """Test getting divisions by name."""
         parser = CobolParser(use_indexer_only=True)
@@ -204,6 +469,23 @@ class TestCobolParser:
         assert para is not None
         assert para.name == "2100-VALIDATE"
 
+    def test_paragraph_lookup_cache(self):
+        """Test cached paragraph lookups and clearing the cache."""
+        from coqu.parser.ast import Paragraph
+
+        parser = CobolParser(use_indexer_only=True)
+        program = parser.parse_file(SAMPLE_CBL)
+
+        para = program.get_paragraph("2100-validate")
+        assert program.get_paragraph("2100-VALIDATE") is para
+        assert program.get_paragraph("NO-SUCH-PARA") is None
+
+        # Modifying the AST requires clearing the lookup cache
+        proc_div = program.get_division("PROCEDURE")
+        proc_div.paragraphs.append(Paragraph("NEW-PARA", 1, 1))
+        program.clear_lookup_cache()
+        assert program.get_paragraph("NEW-PARA") is not None
+
     def test_get_working_storage_items(self):
         """Test getting WORKING-STORAGE items."""
         parser = CobolParser(use_indexer_only=True)
@@ -411,6 +693,11 @@ class TestChunkAnalyzer:
         assert ("SPACES", "WS-OUTPUT") in result.moves
         assert ("'Y'", "WS-FLAG") in result.moves
 
+        # Lower-case source comes back upper-cased
+        result = analyzer.analyze("           move ws-in to ws-out.")
+        assert result.moves == [("WS-IN", "WS-OUT")]
+        assert result.data_refs == ["WS-IN", "WS-OUT"]
+
     def test_extract_gotos(self):
         """Test GO TO extraction from chunk."""
         from coqu.parser.chunk_analyzer import ChunkAnalyzer
@@ -428,6 +715,64 @@ class TestChunkAnalyzer:
         # GO TO targets should be in performs list
         assert "ERROR-EXIT" in result.performs
 
+    def test_statements_after_inline_perform(self):
+        """Test statements nested in an inline PERFORM are still found."""
+        from coqu.parser.chunk_analyzer import ChunkAnalyzer
+
+        analyzer = ChunkAnalyzer()
+
+        chunk = """
+       LOOP-PARA.
+           PERFORM
+               MOVE WS-IN TO WS-OUT
+               CALL 'LOGGER'
+           END-PERFORM.
+"""
+        result = analyzer.analyze(chunk)
+
+        assert ("WS-IN", "WS-OUT") in result.moves
+        assert "LOGGER" in result.calls
+
+    def test_analyze_selected_fields(self):
+        """Test restricting analysis to selected fields."""
+        from coqu.parser.chunk_analyzer import ChunkAnalyzer
+
+        analyzer = ChunkAnalyzer()
+
+        chunk = """
+       MAIN-PARA.
+           PERFORM INIT-PARA.
+           CALL 'SUBPROG1' USING WS-DATA.
+           MOVE WS-IN TO WS-OUT.
+"""
+        result = analyzer.analyze(chunk, fields=frozenset({"performs", "calls"}))
+
+        assert result.performs == ["INIT-PARA"]
+        assert result.calls == ["SUBPROG1"]
+        assert result.moves == []
+        assert result.data_refs == []
+
+        with pytest.raises(ValueError):
+            analyzer.analyze(chunk, fields=frozenset({"bogus"}))
+
+    def test_analyze_chunks_batch(self):
+        """Test batch analysis matches per-chunk analysis, in order."""
+        from coqu.parser.chunk_analyzer import (
+            PARALLEL_MIN_CHUNKS,
+            analyze_chunk,
+            analyze_chunks,
+        )
+
+        chunks = [
+            f"           PERFORM PARA-{i}.\n           CALL 'PROG{i}'.\n"
+            for i in range(PARALLEL_MIN_CHUNKS)
+        ]
+        expected = [analyze_chunk(chunk) for chunk in chunks]
+
+        assert analyze_chunks(chunks, max_workers=1) == expected
+        assert analyze_chunks(chunks, max_workers=2) == expected
+        assert analyze_chunks([]) == []
+
     def test_program_analyze_paragraph(self):
         """Test analyze_paragraph method on CobolProgram."""
         parser = CobolParser(use_indexer_only=True)
@@ -478,3 +823,182 @@ class TestASTSerialization:
         assert restored.program_id == program.program_id
         assert restored.lines == program.lines
         assert len(restored.divisions) == len(program.divisions)
+
+    def test_nodes_use_slots(self):
+        """Test AST nodes carry no per-instance __dict__."""
+        from coqu.parser.ast import SourceLocation, Statement
+
+        stmt = Statement("move", 1, 2)
+        assert not hasattr(stmt, "__dict__")
+        assert stmt.location == SourceLocation(1, 2)
+        assert str(stmt.location) == "lines 1-2"
+
+
+class TestCoverage:
+    """Tests for parser coverage analysis."""
+
+    def test_line_categories(self):
+        """Test the line sets, counts and reports of both modes."""
+        results = CoverageAnalyzer().analyze_file(SAMPLE_CBL)
+        antlr, indexer = results["antlr"], results["indexer"]
+
+        # Line classification is shared by both modes
+        for result in (antlr, indexer):
+            assert result.total_lines == 90
+            assert result.comment_lines == {4, 5, 6}
+            assert result.blank_lines == {
+                14, 23, 34, 38, 40, 45, 47, 54, 60, 65, 75, 80, 84, 90,
+            }
+            assert result.division_lines == {1, 7, 15, 46}
+            assert result.section_lines == {8, 16, 24, 41, 48, 55, 66, 85}
+            assert result.paragraph_lines == {49, 56, 61, 67, 76, 81, 86}
+            assert result.exec_lines == set()
+
+        # The sample fails the ANTLR parse, so this mode gets the parser's
+        # indexer fallback, which keeps no statements
+        assert antlr.statement_lines == set()
+        assert antlr.data_item_lines == {18, 25, 35, 42}
+        assert antlr.count("covered") == 23
+        assert antlr.count("uncovered") == 50
+        assert antlr.uncovered_list() == (
+            "Uncovered lines (50): 2-3, 9-13, 17, 19-22, 26-33, 36-37, 39, "
+            "43-44, 50-53, 57-59, 62-64, 68-74, 77-79, 82-83, 87-89"
+        )
+
+        assert indexer.id_entry_lines == {2, 3}
+        assert indexer.file_entry_lines == {9, 10, 11, 12, 13, 17}
+        assert indexer.copybook_lines == {39}
+        assert indexer.count("statement") == 25
+        assert indexer.count("data_item") == 20
+        assert indexer.uncovered_lines == set()
+        assert indexer.uncovered_list() == "No uncovered lines."
+
+        # Covered is the union of the components; uncovered the rest
+        # of the code lines
+        for result in (antlr, indexer):
+            components = set().union(*(
+                getattr(result, f"{category}_lines")
+                for category in (
+                    "division", "section", "paragraph", "statement",
+                    "data_item", "id_entry", "file_entry", "copybook", "exec",
+                )
+            ))
+            assert result.covered_lines == components
+            code = set(range(1, 91)) - result.comment_lines - result.blank_lines
+            assert result.uncovered_lines == code - components
+            assert result.code_lines == 73
+
+        assert indexer.summary().splitlines()[:7] == [
+            "Total lines: 90",
+            "Code lines: 73",
+            "  - Comment lines: 3",
+            "  - Blank lines: 14",
+            "Covered lines: 73",
+            "Uncovered lines: 0",
+            "Coverage: 100.0%",
+        ]
+        assert "  - Statements: 25" in indexer.summary()
+        assert "Coverage: 31.5%" in antlr.summary()
+
+        # The sets are snapshots; lines are marked through bitmap()
+        indexer.covered_lines.add(4)
+        assert 4 not in indexer.covered_lines
+        indexer.bitmap("covered")[4] = 1
+        assert 4 in indexer.covered_lines
+
+    def test_ranges(self):
+        """Test runs of consecutive lines, at the edges of the bitmap."""
+        result = CoverageResult(total_lines=10)
+
+        # Nothing marked: the bitmap isn't even allocated
+        assert result.ranges("uncovered") == []
+        assert result.uncovered_list() == "No uncovered lines."
+
+        # A single line, a run, and a run reaching the last line (marks
+        # past it are clipped)
+        bitmap = result.bitmap("uncovered")
+        _mark(bitmap, 2, 2)
+        _mark(bitmap, 4, 6)
+        _mark(bitmap, 9, 12)
+        assert len(bitmap) == 11
+        assert result.ranges("uncovered") == [(2, 2), (4, 6), (9, 10)]
+        assert result.uncovered_list() == "Uncovered lines (6): 2, 4-6, 9-10"
+
+        # The last line alone
+        result = CoverageResult(total_lines=10)
+        _mark(result.bitmap("uncovered"), 10, 10)
+        assert result.ranges("uncovered") == [(10, 10)]
+        assert result.uncovered_list() == "Uncovered lines (1): 10"
+
+        # Every line
+        result = CoverageResult(total_lines=3)
+        _mark(result.bitmap("uncovered"), 1, 3)
+        assert result.ranges("uncovered") == [(1, 3)]
+        assert result.uncovered_list() == "Uncovered lines (3): 1-3"
+
+    def test_analyze_files(self):
+        """Test batch analysis matches per-file analysis, in order."""
+        analyzer = CoverageAnalyzer()
+        paths = [MAINFRAME_CBL, SAMPLE_CBL, CALLER_CBL, SAMPLE_CBL]
+        assert len(paths) >= analyzer.PARALLEL_MIN_FILES
+        expected = [CoverageAnalyzer().analyze_file(path) for path in paths]
+
+        for workers in (1, 2):
+            results = analyzer.analyze_files(paths, max_workers=workers)
+            assert list(results) == list(dict.fromkeys(paths))
+            assert [results[path] for path in paths] == expected
+
+        results = analyzer.analyze_files(paths, mode="indexer", max_workers=2)
+        assert all(list(result) == ["indexer"] for result in results.values())
+        assert analyzer.analyze_files([]) == {}
+
+    def test_result_cache(self):
+        """Test cached results are copies, completed and refreshed as needed."""
+        analyzer = CoverageAnalyzer()
+        antlr_runs = []
+        analyze_antlr = analyzer._analyze_antlr
+
+        def counting_analyze_antlr(*args):
+            antlr_runs.append(1)
+            return analyze_antlr(*args)
+
+        analyzer._analyze_antlr = counting_analyze_antlr
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "prog.cbl"
+            path.write_text(SAMPLE_CBL.read_text())
+
+            # An indexer-only hit doesn't satisfy "both": ANTLR still runs
+            indexer_only = analyzer.analyze_file(path, mode="indexer")
+            assert list(indexer_only) == ["indexer"]
+            assert not antlr_runs
+            first = analyzer.analyze_file(path)
+            assert set(first) == {"antlr", "indexer"}
+            assert len(antlr_runs) == 1
+            assert first["indexer"] == indexer_only["indexer"]
+
+            # Both modes' bitmaps, shared ones included, can be changed
+            # without reaching the cache, whether fresh or served from it
+            second = first
+            for _ in range(2):
+                second["indexer"].bitmap("comment")[1] = 1
+                second["indexer"].bitmap("covered")[4] = 1
+                second["antlr"].bitmap("uncovered")[1] = 1
+                second = analyzer.analyze_file(path)
+                assert len(antlr_runs) == 1
+                for result in second.values():
+                    assert 1 not in result.comment_lines
+                    assert 4 not in result.covered_lines
+                assert 1 not in second["antlr"].uncovered_lines
+
+            # A rewritten file is analyzed again
+            path.write_text(CALLER_CBL.read_text())
+            third = analyzer.analyze_file(path)
+            assert len(antlr_runs) == 2
+            assert third == CoverageAnalyzer().analyze_file(CALLER_CBL)
+            assert third["indexer"].total_lines != second["indexer"].total_lines
+
+        analyzer.clear_cache()
+        assert not analyzer._results
+        assert not analyzer._file_hashes
+
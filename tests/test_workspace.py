@@ -210,6 +210,22 @@ class TestCacheManager:
             # Verify empty
             assert cache.get(program.source_hash) is None
 
+    def test_clear_keeps_foreign_files(self):
+        """Test clearing a shared directory only removes cache files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = CacheManager(Path(tmpdir))
+
+            from coqu.parser import CobolParser
+            parser = CobolParser(use_indexer_only=True)
+            program = parser.parse_file(SAMPLE_CBL)
+            cache.put(program.source_hash, program)
+            other = Path(tmpdir) / "notes.txt"
+            other.write_text("keep me")
+
+            assert cache.clear() == 1
+            assert other.exists()
+            assert cache.get_stats()["file_count"] == 0
+
     def test_cache_stats(self):
         """Test cache statistics."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -222,6 +238,296 @@ class TestCacheManager:
             assert stats["misses"] == 1
             assert stats["hits"] == 0
 
+    def test_size_stats_persisted(self):
+        """Test file count/size are tracked and reloaded from the sidecar."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = CacheManager(Path(tmpdir))
+
+            from coqu.parser import CobolParser
+            parser = CobolParser(use_indexer_only=True)
+            program = parser.parse_file(SAMPLE_CBL)
+            cache.put(program.source_hash, program)
+
+            stats = cache.get_stats()
+            size = cache._get_cache_path(program.source_hash).stat().st_size
+            assert stats["file_count"] == 1
+            assert stats["total_size_bytes"] == size
+
+            cache.flush_stats()
+            reopened = CacheManager(Path(tmpdir))
+            assert reopened.get_stats()["file_count"] == 1
+            assert reopened.get_stats()["total_size_bytes"] == size
+
+            reopened.remove(program.source_hash)
+            assert reopened.get_stats()["file_count"] == 0
+            assert reopened.get_stats()["total_size_bytes"] == 0
+
+    def test_hash_source(self):
+        """Test source hashing and workspace cache hits keyed by it."""
+        import hashlib
+
+        expected = hashlib.sha256(SAMPLE_CBL.read_bytes()).hexdigest()
+        assert CacheManager.hash_source(SAMPLE_CBL) == expected
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = CacheManager(Path(tmpdir))
+            Workspace(cache_manager=cache, use_indexer_only=True).load(SAMPLE_CBL)
+
+            workspace = Workspace(cache_manager=cache, use_indexer_only=True)
+            prog = workspace.load(SAMPLE_CBL)
+            assert prog.from_cache
+
+    def test_memory_cache(self):
+        """Test repeated gets are served from the in-memory LRU."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = CacheManager(Path(tmpdir), memory_cache_size=1)
+
+            from coqu.parser import CobolParser
+            parser = CobolParser(use_indexer_only=True)
+            sample = parser.parse_file(SAMPLE_CBL)
+            caller = parser.parse_file(CALLER_CBL)
+            cache.put(sample.source_hash, sample)
+            cache.put(caller.source_hash, caller)
+
+            first = cache.get(sample.source_hash)
+            assert cache.get(sample.source_hash) is first
+
+            # Loading another program evicts the least recently used one
+            cache.get(caller.source_hash)
+            assert cache.get(sample.source_hash) is not first
+
+            # remove() drops the in-memory copy as well
+            cache.remove(sample.source_hash)
+            assert cache.get(sample.source_hash) is None
+
+    def test_get_many(self):
+        """Test batch lookup of cached programs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = CacheManager(Path(tmpdir), memory_cache_size=0)
+
+            from coqu.parser import CobolParser
+            parser = CobolParser(use_indexer_only=True)
+            sample = parser.parse_file(SAMPLE_CBL)
+            caller = parser.parse_file(CALLER_CBL)
+            cache.put(sample.source_hash, sample)
+            cache.put(caller.source_hash, caller)
+
+            found = cache.get_many(
+                [sample.source_hash, caller.source_hash, "ab" + "0" * 62]
+            )
+            assert set(found) == {sample.source_hash, caller.source_hash}
+            assert found[caller.source_hash].program_id == caller.program_id
+
+            stats = cache.get_stats()
+            assert stats["hits"] == 2
+            assert stats["misses"] == 1
+
+    def test_load_directory_from_cache(self):
+        """Test load_directory reuses cached programs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = CacheManager(Path(tmpdir))
+            Workspace(cache_manager=cache, use_indexer_only=True).load_directory(
+                FIXTURES_DIR, "*.cbl"
+            )
+
+            workspace = Workspace(cache_manager=cache, use_indexer_only=True)
+            programs = workspace.load_directory(FIXTURES_DIR, "*.cbl")
+            assert len(programs) >= 2
+            assert all(prog.from_cache for prog in programs)
+
+    def test_cleanup_by_size(self):
+        """Test size-based cleanup removes the oldest files first."""
+        import os
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = CacheManager(Path(tmpdir))
+
+            # Three ~0.6 MB files with increasing modification times
+            for i, name in enumerate(["aa01", "bb02", "cc03"]):
+                path = cache._get_cache_path(name)
+                path.parent.mkdir(exist_ok=True)
+                path.write_bytes(b"\0" * 600_000)
+                os.utime(path, (1000 + i, 1000 + i))
+
+            count = cache.cleanup_by_size(max_size_mb=1)
+            assert count == 2
+            remaining = [item["hash"] for item in cache.list_cached()]
+            assert remaining == ["cc03"]
+
+    def test_cleanup_by_size_prefers_recent_access(self):
+        """Test size-based cleanup keeps recently read files."""
+        import os
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = CacheManager(Path(tmpdir))
+
+            for i, name in enumerate(["aa01", "bb02", "cc03"]):
+                path = cache._get_cache_path(name)
+                path.parent.mkdir(exist_ok=True)
+                path.write_bytes(b"\0" * 600_000)
+                os.utime(path, (1000 + i, 1000 + i))
+
+            # The oldest file was read most recently; the access index
+            # survives a restart
+            cache._touch("aa01")
+            cache.flush_stats()
+            cache = CacheManager(Path(tmpdir))
+
+            count = cache.cleanup_by_size(max_size_mb=1)
+            assert count == 2
+            remaining = [item["hash"] for item in cache.list_cached()]
+            assert remaining == ["aa01"]
+
+    def test_migrate_flat_layout(self):
+        """Test cache files from the flat layout are moved into shards."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            from coqu.cache import ASTSerializer
+            from coqu.parser import CobolParser
+            parser = CobolParser(use_indexer_only=True)
+            program = parser.parse_file(SAMPLE_CBL)
+
+            flat = Path(tmpdir) / f"{program.source_hash}{CacheManager.EXTENSION}"
+            ASTSerializer().save(program, flat)
+
+            cache = CacheManager(Path(tmpdir))
+            assert not flat.exists()
+            assert cache._get_cache_path(program.source_hash).exists()
+            assert cache.get(program.source_hash) is not None
+            assert cache.get_stats()["file_count"] == 1
+
+
+class TestASTSerializer:
+    """Tests for the ASTSerializer class."""
+
+    def test_round_trip_compressed(self):
+        """Test serialized programs are compressed and restore intact."""
+        import msgpack
+        from coqu.cache import ASTSerializer
+        from coqu.parser import CobolParser
+
+        parser = CobolParser(use_indexer_only=True)
+        program = parser.parse_file(SAMPLE_CBL)
+        serializer = ASTSerializer()
+
+        data = serializer.serialize(program)
+        raw = msgpack.packb({"version": 1, "data": program.to_dict()})
+        assert len(data) < len(raw)
+
+        restored = serializer.deserialize(data)
+        assert restored is not None
+        assert restored.to_dict() == program.to_dict()
+
+    def test_round_trip_all_node_types(self):
+        """Test every AST node type survives serialization."""
+        from coqu.cache import ASTSerializer
+        from coqu.parser.ast import (
+            CobolProgram, Division, Section, Paragraph, DataItem,
+            Statement, Comment, CopybookRef,
+        )
+
+        child = DataItem("WS-CHILD", 5, 4, 4, pic="X(10)")
+        item = DataItem(
+            "WS-REC", 1, 3, 4, children=[child], occurs=2,
+        )
+        stmt = Statement(
+            "CALL", 8, 8, target="SUBPROG", arguments=["WS-REC"],
+        )
+        para = Paragraph(
+            "MAIN-PARA", 7, 9, statements=[stmt],
+            performs=["OTHER-PARA"], calls=["SUBPROG"],
+        )
+        program = CobolProgram(
+            program_id="ALLNODES",
+            source_path=Path("/tmp/allnodes.cbl"),
+            source_hash="abc",
+            lines=9,
+            divisions=[
+                Division("DATA DIVISION", 1, 5, sections=[
+                    Section("WORKING-STORAGE SECTION", 2, 5,
+                            data_items=[item]),
+                ]),
+                Division("PROCEDURE DIVISION", 6, 9,
+                         paragraphs=[para]),
+            ],
+            copybook_refs=[CopybookRef("DATEUTIL", 5, status="resolved")],
+            comments=[Comment("* note", 6, is_inline=True)],
+        )
+
+        serializer = ASTSerializer()
+        restored = serializer.deserialize(serializer.serialize(program))
+        assert restored is not None
+        assert restored.to_dict() == program.to_dict()
+        assert isinstance(restored.divisions[1].paragraphs[0].statements[0], Statement)
+
+    def test_deserialize_interns_names(self):
+        """Test loaded names are shared with the PERFORM lists naming them."""
+        from coqu.cache import ASTSerializer
+        from coqu.parser.ast import CobolProgram, Division, Paragraph
+
+        program = CobolProgram(
+            program_id="INTERN",
+            source_path=None,
+            source_hash="abc",
+            lines=4,
+            divisions=[
+                Division("PROCEDURE DIVISION", 1, 4, paragraphs=[
+                    Paragraph("MAIN-PARA", 2, 3, performs=["WORK-PARA"]),
+                    Paragraph("WORK-PARA", 4, 4),
+                ]),
+            ],
+        )
+
+        for restored in (
+            ASTSerializer().deserialize(ASTSerializer().serialize(program)),
+            CobolProgram.from_dict(program.to_dict()),
+        ):
+            main, work = restored.divisions[0].paragraphs
+            assert main.performs[0] is work.name
+
+    def test_read_version_1(self):
+        """Test uncompressed version 1 cache files are still readable."""
+        import msgpack
+        from coqu.cache import ASTSerializer
+        from coqu.parser import CobolParser
+
+        parser = CobolParser(use_indexer_only=True)
+        program = parser.parse_file(SAMPLE_CBL)
+
+        legacy = ASTSerializer.MAGIC + msgpack.packb(
+            {"version": 1, "data": program.to_dict()}, use_bin_type=True
+        )
+        restored = ASTSerializer().deserialize(legacy)
+        assert restored is not None
+        assert restored.program_id == program.program_id
+
+    def test_load_memory_mapped(self):
+        """Test loading a cache file larger than a page via mmap."""
+        import mmap
+        from coqu.cache import ASTSerializer
+        from coqu.parser import CobolParser
+
+        source = (
+            "       IDENTIFICATION DIVISION.\n"
+            "       PROGRAM-ID. BIGPROG.\n"
+            "       PROCEDURE DIVISION.\n"
+        ) + "".join(
+            f"       P{i:05d}.\n           DISPLAY 'X'.\n" for i in range(2000)
+        )
+        parser = CobolParser(use_indexer_only=True)
+        program = parser.parse(source)
+
+        serializer = ASTSerializer()
+        serializer.codec = ASTSerializer.CODEC_NONE
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "big.coqu"
+            assert serializer.save(program, path)
+            assert path.stat().st_size >= mmap.PAGESIZE
+
+            restored = serializer.load(path)
+            assert restored is not None
+            assert restored.program_id == "BIGPROG"
+            assert len(restored.get_all_paragraphs()) == 2000
+
 
 class TestLoadedProgram:
     """Tests for the LoadedProgram class."""